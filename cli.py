@@ -0,0 +1,270 @@
+"""Command line AudioEverything tanpa GUI: index, rescan, search, export, stats, serve
+
+Setiap baris stdout adalah satu object JSON (JSONL) dengan key "type"
+("progress", "file", "export", "error", "stats", "summary"); log dari library
+dialihkan ke stderr. Tidak meng-import PyQt5, jadi bisa dijalankan di server
+tanpa display.
+
+Contoh:
+    python cli.py index /mnt/sfx /mnt/music
+    python cli.py rescan
+    python cli.py search "door slam" --limit 20
+    python cli.py search "rain lufs:-30..-18" | python cli.py export /tmp/rain --mode hardlink
+    python cli.py stats
+    python cli.py serve --port 8765
+"""
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+from pathlib import Path
+from dataclasses import asdict
+from typing import List, Dict, Any, Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from media_index import (
+    CancelToken, AudioDatabase, MediaScanner,
+    EXPORT_MODES, unique_output_path, transfer_file,
+)
+from query_service import QueryService, SERVICE_HOST, SERVICE_PORT, SERVICE_READERS
+
+DEFAULT_DB_PATH = "media_index.db"
+CLI_EXPORT_WORKERS = 4
+# Jarak minimal antar record progress (detik)
+PROGRESS_INTERVAL = 0.5
+
+# stdout asli; print() dari library dialihkan ke stderr selama command berjalan
+_OUT = sys.stdout
+
+
+def emit(record: Dict[str, Any]):
+    """Tulis satu record JSONL ke stdout"""
+    _OUT.write(json.dumps(record, ensure_ascii=False) + "\n")
+    _OUT.flush()
+
+
+def _progress_reporter(enabled: bool):
+    last_emit = [0.0]
+    
+    def on_progress(percent: int, total: int, message: str):
+        now = time.monotonic()
+        if enabled and (now - last_emit[0] >= PROGRESS_INTERVAL or percent >= 100):
+            last_emit[0] = now
+            emit({"type": "progress", "percent": percent, "total": total, "message": message})
+    
+    return on_progress
+
+
+def _existing_paths(paths: List[str]) -> List[str]:
+    """Absolute path yang ada; path yang tidak ada dilaporkan sebagai error"""
+    result = []
+    for path in paths:
+        if os.path.exists(path):
+            result.append(os.path.abspath(path))
+        else:
+            emit({"type": "error", "path": path, "message": "path not found"})
+    return result
+
+
+# ============================================================================
+# COMMANDS
+# ============================================================================
+
+def cmd_index(args, database: AudioDatabase) -> int:
+    paths = _existing_paths(args.paths)
+    start = time.perf_counter()
+    scanner = MediaScanner(paths, database, _progress_reporter(args.progress),
+                           hash_duplicates=not args.no_hash)
+    files = scanner.scan() if paths else []
+    emit({"type": "summary", "command": "index", "indexed": len(files),
+          "files_in_index": database.get_file_count(),
+          "seconds": round(time.perf_counter() - start, 3)})
+    return 0 if len(paths) == len(args.paths) else 1
+
+
+def cmd_rescan(args, database: AudioDatabase) -> int:
+    start = time.perf_counter()
+    scanner = MediaScanner([os.path.abspath(path) for path in args.paths], database,
+                           _progress_reporter(args.progress), hash_duplicates=not args.no_hash)
+    counts = scanner.refresh()
+    emit({"type": "summary", "command": "rescan", **counts,
+          "files_in_index": database.get_file_count(),
+          "seconds": round(time.perf_counter() - start, 3)})
+    return 0
+
+
+def cmd_search(args, database: AudioDatabase) -> int:
+    if args.duplicates:
+        files = database.get_duplicate_files()[:args.limit]
+    else:
+        files = database.search_files(args.query, limit=args.limit)
+    for media_file in files:
+        emit({"type": "file", **asdict(media_file)})
+    emit({"type": "summary", "command": "search", "query": args.query, "count": len(files)})
+    return 0
+
+
+def _read_source_paths(lines: Iterable[str]) -> List[str]:
+    """Path dari stdin: satu path per baris, atau record "file" dari `cli.py search`"""
+    paths = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                emit({"type": "error", "message": f"invalid JSON input: {line[:80]}"})
+                continue
+            if record.get("type", "file") == "file" and record.get("path"):
+                paths.append(record["path"])
+        else:
+            paths.append(line)
+    return paths
+
+
+def cmd_export(args, database: AudioDatabase) -> int:
+    if args.query is not None:
+        sources = [f.path for f in database.search_files(args.query, limit=args.limit)]
+    elif args.sources:
+        sources = args.sources
+    else:
+        sources = _read_source_paths(sys.stdin)
+    
+    dest = os.path.abspath(args.dest)
+    os.makedirs(dest, exist_ok=True)
+    try:
+        reserved = {name.lower() for name in os.listdir(dest)}
+    except OSError:
+        reserved = set()
+    jobs = []
+    for path in dict.fromkeys(sources):
+        source = Path(path)
+        jobs.append((path, unique_output_path(dest, source.stem, source.suffix[1:], reserved)))
+    
+    cancel_token = CancelToken()
+    link_errors = []
+    
+    def export_one(source_path: str, output_path: str) -> Dict[str, Any]:
+        record = {"type": "export", "source": source_path, "output": output_path}
+        try:
+            method = transfer_file(source_path, output_path, args.mode,
+                                   cancel_token=cancel_token, link_error_callback=link_errors.append)
+            record.update(status="Done" if method else "Cancelled", method=method)
+        except Exception as e:
+            record.update(status="Failed", message=str(e))
+        return record
+    
+    start = time.perf_counter()
+    counts = {"Done": 0, "Failed": 0, "Cancelled": 0}
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [executor.submit(export_one, source, output) for source, output in jobs]
+        try:
+            for future in as_completed(futures):
+                record = future.result()
+                counts[record["status"]] += 1
+                emit(record)
+        except KeyboardInterrupt:
+            cancel_token.cancel()
+            raise
+    if link_errors:
+        print(f"✗ {EXPORT_MODES[args.mode]} not possible ({link_errors[0]}), fell back to copy")
+    
+    emit({"type": "summary", "command": "export", "dest": dest,
+          "mode": args.mode, "exported": counts["Done"], "failed": counts["Failed"],
+          "cancelled": counts["Cancelled"], "link_fallbacks": len(link_errors),
+          "seconds": round(time.perf_counter() - start, 3)})
+    return 0 if counts["Done"] == len(jobs) else 1
+
+
+def cmd_serve(args, database: AudioDatabase) -> int:
+    service = QueryService(database, readers=args.readers)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.socket,
+                                  ready_callback=lambda address: emit({"type": "listening", "address": address})))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    emit({"type": "summary", "command": "serve",
+          "requests": sum(h.count for h in service.metrics.values())})
+    return 0
+
+
+def cmd_stats(args, database: AudioDatabase) -> int:
+    stats = database.get_stats()
+    emit({"type": "stats", "database": os.path.abspath(database.db_path), **stats,
+          "analysis": database.get_analysis_counts()})
+    return 0 if stats else 1
+
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="AudioEverything headless index tools (JSONL output)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH,
+                        help=f"index database (default: {DEFAULT_DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    index = commands.add_parser("index", help="scan files/folders into the index")
+    index.add_argument("paths", nargs="+")
+    index.add_argument("--no-hash", action="store_true", help="skip duplicate content hashing")
+    index.add_argument("--progress", action="store_true", help="emit progress records")
+    index.set_defaults(func=cmd_index)
+    
+    rescan = commands.add_parser("rescan", help="re-check indexed files: update changed, drop deleted")
+    rescan.add_argument("paths", nargs="*", help="only files under these folders (default: all)")
+    rescan.add_argument("--no-hash", action="store_true", help="skip duplicate content hashing")
+    rescan.add_argument("--progress", action="store_true", help="emit progress records")
+    rescan.set_defaults(func=cmd_rescan)
+    
+    search = commands.add_parser("search", help="search the index (same syntax as the search box)")
+    search.add_argument("query", nargs="?", default="")
+    search.add_argument("--limit", type=int, default=100)
+    search.add_argument("--duplicates", action="store_true", help="list duplicate files instead")
+    search.set_defaults(func=cmd_search)
+    
+    export = commands.add_parser("export", help="copy/link files to a folder")
+    export.add_argument("dest")
+    export.add_argument("sources", nargs="*",
+                        help="files to export (default: paths or search records from stdin)")
+    export.add_argument("--query", help="export the results of this search")
+    export.add_argument("--limit", type=int, default=100, help="result limit for --query")
+    export.add_argument("--mode", choices=list(EXPORT_MODES), default="copy")
+    export.add_argument("--workers", type=int, default=CLI_EXPORT_WORKERS)
+    export.set_defaults(func=cmd_export)
+    
+    serve = commands.add_parser("serve", help="run the local HTTP/JSON query service")
+    serve.add_argument("--host", default=SERVICE_HOST)
+    serve.add_argument("--port", type=int, default=SERVICE_PORT)
+    serve.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    serve.add_argument("--readers", type=int, default=SERVICE_READERS,
+                       help="read-only database connections (concurrent queries)")
+    serve.set_defaults(func=cmd_serve)
+    
+    stats = commands.add_parser("stats", help="index summary")
+    stats.set_defaults(func=cmd_stats)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            database = AudioDatabase(args.db)
+            return args.func(args, database)
+        except KeyboardInterrupt:
+            emit({"type": "error", "message": "interrupted"})
+            return 130
+        except Exception as e:
+            emit({"type": "error", "message": str(e)})
+            return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,45 +1,103 @@
 import sys
 import os
-import sqlite3
 from pathlib import Path
 import time
-import wave
+_STARTUP_T0 = time.perf_counter()
 import struct
 import traceback
-from typing import List, Tuple, Optional, Dict, Any, Union
+from typing import List, Tuple, Optional, Dict, Any, Callable, Iterator
 from dataclasses import dataclass
 from datetime import timedelta
 import tempfile
-import random
+import threading
+import subprocess
+import re
+import hashlib
+import json
+import shutil
+from collections import OrderedDict, deque
+import importlib.util
 
 import tinytag
-from rapidfuzz import fuzz, process
 
-# Untuk audio dari video - PERBAIKAN IMPORT MOVIEPY
-MOVIEPY_AVAILABLE = False
+# Database, scanner, hash dan copy file tanpa Qt (dipakai juga oleh cli.py)
+from media_index import (
+    CancelToken, MediaFile, LoudnessResult, SilenceMarkers, AudioDatabase, MediaScanner,
+    file_content_hash, EXPORT_MODES, unique_output_path, transfer_file,
+)
+
+def module_available(name: str) -> bool:
+    """Cek apakah module terinstall tanpa meng-import-nya"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Untuk audio dari video. moviepy.editor berat (imageio, ffmpeg probing),
+# jadi baru di-import saat pertama kali dipakai lewat get_moviepy()
+MOVIEPY_AVAILABLE = module_available("moviepy")
 mp = None
 
-try:
-    # Coba import moviepy
-    import moviepy.editor as mp_import
-    mp = mp_import
-    MOVIEPY_AVAILABLE = True
-    print("✓ MoviePy successfully imported")
-except ImportError as e:
-    print(f"✗ MoviePy import error: {e}")
-    print("To install MoviePy, run: pip install moviepy")
-    print("Or install with: pip install moviepy imageio[ffmpeg]")
-except Exception as e:
-    print(f"✗ Unexpected error importing MoviePy: {e}")
-    MOVIEPY_AVAILABLE = False
-
-# Coba import pydub sebagai alternatif
-try:
-    from pydub import AudioSegment
-    from pydub.playback import play
-    PYDUB_AVAILABLE = True
-except:
-    PYDUB_AVAILABLE = False
+
+def get_moviepy():
+    """Import moviepy.editor saat pertama dibutuhkan, None jika tidak tersedia"""
+    global mp, MOVIEPY_AVAILABLE
+    if mp is None and MOVIEPY_AVAILABLE:
+        try:
+            import moviepy.editor as mp_import
+            mp = mp_import
+            print("✓ MoviePy successfully imported")
+        except Exception as e:
+            print(f"✗ MoviePy import error: {e}")
+            print("Or install with: pip install moviepy imageio[ffmpeg]")
+            MOVIEPY_AVAILABLE = False
+    return mp
+
+
+# pydub sebagai alternatif (hanya dicek, belum dipakai)
+PYDUB_AVAILABLE = module_available("pydub")
+
+# ffmpeg binary (bundled dengan imageio-ffmpeg) untuk decode audio lewat pipe
+_FFMPEG_EXE = None
+_FFMPEG_CHECKED = False
+_FFMPEG_LOCK = threading.Lock()
+
+
+def get_ffmpeg_exe() -> Optional[str]:
+    """Cari ffmpeg binary: imageio-ffmpeg dulu, lalu ffmpeg di PATH"""
+    global _FFMPEG_EXE, _FFMPEG_CHECKED
+    if _FFMPEG_CHECKED:
+        return _FFMPEG_EXE
+    # Dipanggil dari beberapa worker thread sekaligus
+    with _FFMPEG_LOCK:
+        if not _FFMPEG_CHECKED:
+            try:
+                import imageio_ffmpeg
+                _FFMPEG_EXE = imageio_ffmpeg.get_ffmpeg_exe()
+            except Exception:
+                _FFMPEG_EXE = shutil.which("ffmpeg")
+            if _FFMPEG_EXE:
+                print(f"✓ ffmpeg found: {_FFMPEG_EXE}")
+            else:
+                print("✗ ffmpeg not found, install with: pip install imageio-ffmpeg")
+            _FFMPEG_CHECKED = True
+    return _FFMPEG_EXE
+
+
+def audio_extraction_available() -> bool:
+    """Extract audio dari video bisa lewat ffmpeg atau MoviePy"""
+    return get_ffmpeg_exe() is not None or MOVIEPY_AVAILABLE
+
+
+def popen_ffmpeg(args: List[str], **kwargs) -> subprocess.Popen:
+    """Jalankan ffmpeg tanpa console window (Windows)"""
+    if sys.platform == "win32":
+        kwargs.setdefault("creationflags", subprocess.CREATE_NO_WINDOW)
+    kwargs.setdefault("stdin", subprocess.DEVNULL)
+    kwargs.setdefault("stderr", subprocess.DEVNULL)
+    return subprocess.Popen([get_ffmpeg_exe(), "-hide_banner", "-nostdin"] + args, **kwargs)
+
 
 # Untuk histogram audio
 import numpy as np
@@ -67,296 +125,6 @@ from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtMultimedia import *
 
-import qdarkstyle
-
-
-# ============================================================================
-# DATABASE MODEL - DIPERBAIKI
-# ============================================================================
-
-@dataclass
-class MediaFile:
-    """Data class untuk menyimpan informasi file media"""
-    path: str
-    filename: str
-    extension: str
-    is_video: bool
-    duration: float
-    size: int
-    last_modified: float
-    title: str = ""
-    artist: str = ""
-    album: str = ""
-    genre: str = ""
-    bitrate: int = 0
-    sample_rate: int = 0
-    channels: int = 0
-
-
-class AudioDatabase:
-    """Database untuk menyimpan index file audio/video"""
-    
-    def __init__(self, db_path: str = "media_index.db"):
-        self.db_path = db_path
-        self._init_database()
-    
-    def _init_database(self):
-        """Initialize database tables dengan error handling"""
-        try:
-            # First, backup old database if exists
-            if os.path.exists(self.db_path):
-                backup_path = self.db_path + ".backup"
-                try:
-                    import shutil
-                    shutil.copy2(self.db_path, backup_path)
-                    print(f"Backed up old database to: {backup_path}")
-                except:
-                    pass
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Drop and recreate table untuk memastikan schema benar
-                cursor.execute('DROP TABLE IF EXISTS media_files')
-                
-                # Create table dengan schema yang lengkap
-                cursor.execute('''
-                    CREATE TABLE media_files (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        path TEXT UNIQUE NOT NULL,
-                        filename TEXT NOT NULL,
-                        extension TEXT NOT NULL,
-                        is_video INTEGER NOT NULL,
-                        duration REAL NOT NULL,
-                        size INTEGER NOT NULL,
-                        last_modified REAL NOT NULL,
-                        title TEXT,
-                        artist TEXT,
-                        album TEXT,
-                        genre TEXT,
-                        bitrate INTEGER,
-                        sample_rate INTEGER,
-                        channels INTEGER,
-                        indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Create indexes
-                cursor.execute('CREATE INDEX idx_filename ON media_files(filename)')
-                cursor.execute('CREATE INDEX idx_extension ON media_files(extension)')
-                cursor.execute('CREATE INDEX idx_is_video ON media_files(is_video)')
-                cursor.execute('CREATE INDEX idx_title ON media_files(title)')
-                cursor.execute('CREATE INDEX idx_artist ON media_files(artist)')
-                
-                conn.commit()
-                print("Database initialized successfully with correct schema")
-                
-        except Exception as e:
-            print(f"Error initializing database: {e}")
-            # Jika error, hapus database dan buat ulang
-            try:
-                if os.path.exists(self.db_path):
-                    os.remove(self.db_path)
-                self._init_database()
-            except Exception as e2:
-                print(f"Failed to recreate database: {e2}")
-    
-    def add_media_file(self, media_file: MediaFile):
-        """Add atau update media file di database"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT OR REPLACE INTO media_files 
-                    (path, filename, extension, is_video, duration, size, last_modified,
-                     title, artist, album, genre, bitrate, sample_rate, channels)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    media_file.path,
-                    media_file.filename,
-                    media_file.extension,
-                    1 if media_file.is_video else 0,
-                    media_file.duration,
-                    media_file.size,
-                    media_file.last_modified,
-                    media_file.title,
-                    media_file.artist,
-                    media_file.album,
-                    media_file.genre,
-                    media_file.bitrate,
-                    media_file.sample_rate,
-                    media_file.channels
-                ))
-                
-                conn.commit()
-                return True
-        except Exception as e:
-            print(f"Error adding media file to database: {e}")
-            return False
-    
-    def get_all_files(self) -> List[MediaFile]:
-        """Get semua files dari database"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute('SELECT * FROM media_files ORDER BY filename')
-                rows = cursor.fetchall()
-                
-                return [self._row_to_media_file(row) for row in rows]
-        except Exception as e:
-            print(f"Error getting all files from database: {e}")
-            return []
-    
-    def search_files(self, query: str, limit: int = 100) -> List[MediaFile]:
-        """Search files dengan fuzzy matching"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                if query:
-                    # Search di multiple fields
-                    search_term = f'%{query}%'
-                    cursor.execute('''
-                        SELECT * FROM media_files 
-                        WHERE LOWER(filename) LIKE LOWER(?)
-                           OR LOWER(title) LIKE LOWER(?)
-                           OR LOWER(artist) LIKE LOWER(?)
-                           OR LOWER(album) LIKE LOWER(?)
-                        ORDER BY filename
-                        LIMIT ?
-                    ''', (search_term, search_term, search_term, search_term, limit))
-                else:
-                    cursor.execute('SELECT * FROM media_files ORDER BY filename LIMIT ?', (limit,))
-                
-                rows = cursor.fetchall()
-                files = [self._row_to_media_file(row) for row in rows]
-                
-                # Fuzzy matching dengan RapidFuzz jika ada query
-                if query and files:
-                    try:
-                        choices = [f"{f.filename} {f.title} {f.artist} {f.album}" for f in files]
-                        results = process.extract(query, choices, limit=limit, scorer=fuzz.partial_ratio)
-                        
-                        # Sort berdasarkan similarity score
-                        scored_files = []
-                        for file, score in zip(files, [r[1] for r in results]):
-                            if score > 30:  # Lower threshold
-                                scored_files.append((file, score))
-                        
-                        scored_files.sort(key=lambda x: x[1], reverse=True)
-                        files = [f for f, _ in scored_files]
-                    except Exception as e:
-                        print(f"Fuzzy search error (non-critical): {e}")
-                        # Tetap gunakan hasil SQL jika fuzzy search gagal
-                
-                return files
-        except Exception as e:
-            print(f"Error searching files: {e}")
-            return []
-    
-    def delete_file(self, file_path: str):
-        """Delete file dari database"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM media_files WHERE path = ?', (file_path,))
-                conn.commit()
-                return True
-        except Exception as e:
-            print(f"Error deleting file from database: {e}")
-            return False
-    
-    def clear_all(self):
-        """Clear semua data dari database"""
-        try:
-            # Step 1: Delete all records
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM media_files')
-                conn.commit()
-            
-            # Step 2: VACUUM di connection terpisah
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('VACUUM')
-                conn.commit()
-            
-            print("Database cleared and vacuumed successfully")
-            return True
-        except Exception as e:
-            print(f"Error clearing database: {e}")
-            # Fallback: recreate database
-            try:
-                if os.path.exists(self.db_path):
-                    os.remove(self.db_path)
-                self._init_database()
-                return True
-            except Exception as e2:
-                print(f"Failed to recreate database: {e2}")
-                return False
-    
-    def get_file_count(self) -> int:
-        """Get total file count"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT COUNT(*) FROM media_files')
-                result = cursor.fetchone()
-                return result[0] if result else 0
-        except Exception as e:
-            print(f"Error getting file count: {e}")
-            return 0
-    
-    def _row_to_media_file(self, row) -> MediaFile:
-        """Convert database row ke MediaFile object"""
-        try:
-            # Safe extraction dari row dengan default values
-            def get_value(key, default):
-                if key in row.keys():
-                    val = row[key]
-                    return val if val is not None else default
-                return default
-            
-            return MediaFile(
-                path=get_value('path', ''),
-                filename=get_value('filename', ''),
-                extension=get_value('extension', ''),
-                is_video=bool(get_value('is_video', 0)),
-                duration=float(get_value('duration', 0.0)),
-                size=int(get_value('size', 0)),
-                last_modified=float(get_value('last_modified', 0.0)),
-                title=str(get_value('title', '')),
-                artist=str(get_value('artist', '')),
-                album=str(get_value('album', '')),
-                genre=str(get_value('genre', '')),
-                bitrate=int(get_value('bitrate', 0)),
-                sample_rate=int(get_value('sample_rate', 0)),
-                channels=int(get_value('channels', 0))
-            )
-        except Exception as e:
-            print(f"Error converting row to MediaFile: {e}")
-            # Return minimal valid MediaFile
-            return MediaFile(
-                path='',
-                filename='',
-                extension='',
-                is_video=False,
-                duration=0.0,
-                size=0,
-                last_modified=0.0,
-                title='',
-                artist='',
-                album='',
-                genre='',
-                bitrate=0,
-                sample_rate=0,
-                channels=0
-            )
-
 
 # ============================================================================
 # TABLE MODEL
@@ -373,17 +141,28 @@ class MediaTableModel(QAbstractTableModel):
         ("Artist", 150),
         ("Album", 150),
         ("Genre", 100),
+        ("LUFS", 70),
+        ("True Peak", 95),
+        ("RMS", 70),
         ("Path", 400)
     ]
     
     def __init__(self):
         super().__init__()
         self.media_files = []
+        self.group_shading = []
     
-    def set_files(self, files: List[MediaFile]):
-        """Set files ke model"""
+    def set_files(self, files: List[MediaFile], grouped: bool = False):
+        """Set files ke model; grouped=True memberi warna selang-seling per grup content_hash"""
         self.beginResetModel()
         self.media_files = files
+        self.group_shading = []
+        if grouped:
+            shade, previous = False, None
+            for media_file in files:
+                if media_file.content_hash != previous:
+                    shade, previous = not shade, media_file.content_hash
+                self.group_shading.append(shade)
         self.endResetModel()
     
     def rowCount(self, parent=None):
@@ -424,7 +203,13 @@ class MediaTableModel(QAbstractTableModel):
                 return media_file.album if media_file.album else "Unknown"
             elif col == 6:  # Genre
                 return media_file.genre if media_file.genre else "Unknown"
-            elif col == 7:  # Path
+            elif col == 7:  # Integrated loudness
+                return self._format_level(media_file.loudness_lufs)
+            elif col == 8:  # True peak (dBTP)
+                return self._format_level(media_file.true_peak_db)
+            elif col == 9:  # RMS (dBFS)
+                return self._format_level(media_file.rms_db)
+            elif col == 10:  # Path
                 return media_file.path
         
         elif role == Qt.UserRole:
@@ -432,7 +217,7 @@ class MediaTableModel(QAbstractTableModel):
             return media_file.path
         
         elif role == Qt.TextAlignmentRole:
-            if col in [1, 3]:  # Duration dan Size
+            if col in [1, 3, 7, 8, 9]:  # Duration, Size dan level
                 return Qt.AlignRight | Qt.AlignVCenter
             return Qt.AlignLeft | Qt.AlignVCenter
         
@@ -442,8 +227,25 @@ class MediaTableModel(QAbstractTableModel):
             else:
                 return QColor(100, 255, 150)  # Green untuk audio
         
+        elif role == Qt.BackgroundRole and self.group_shading:
+            if self.group_shading[index.row()]:
+                return QColor(255, 255, 255, 18)
+            return None
+        
         elif role == Qt.ToolTipRole:
-            return f"Path: {media_file.path}\nDuration: {media_file.duration:.1f}s\nSize: {media_file.size:,} bytes"
+            tooltip = f"Path: {media_file.path}\nDuration: {media_file.duration:.1f}s\nSize: {media_file.size:,} bytes"
+            if media_file.content_hash:
+                tooltip += f"\nContent hash: {media_file.content_hash}"
+            if media_file.loudness_lufs is not None:
+                tooltip += (f"\nLoudness: {media_file.loudness_lufs:.1f} LUFS, "
+                            f"true peak {media_file.true_peak_db:.1f} dBTP, "
+                            f"sample peak {media_file.sample_peak_db:.1f} dBFS, "
+                            f"RMS {media_file.rms_db:.1f} dBFS")
+            if media_file.effective_duration is not None:
+                tooltip += (f"\nSilence: head {media_file.silence_head:.2f}s, tail {media_file.silence_tail:.2f}s, "
+                            f"first onset {media_file.onset_time:.2f}s "
+                            f"({media_file.effective_duration:.2f}s non-silent)")
+            return tooltip
         
         elif role == Qt.DecorationRole and col == 0:
             # Icon untuk file type
@@ -469,6 +271,29 @@ class MediaTableModel(QAbstractTableModel):
             return font
         return None
     
+    @staticmethod
+    def _format_level(value: Optional[float]) -> str:
+        """Format nilai dB; kosong jika file belum dianalisis"""
+        if value is None:
+            return ""
+        if value <= LOUDNESS_FLOOR_DB:
+            return "-inf"
+        return f"{value:.1f}"
+    
+    # Field MediaFile yang diisi oleh batch analisis di background
+    ANALYSIS_FIELDS = ('loudness_lufs', 'true_peak_db', 'sample_peak_db', 'rms_db',
+                       'silence_head', 'silence_tail', 'onset_time', 'effective_duration')
+    
+    def update_analysis(self, fresh: Dict[str, MediaFile]):
+        """Salin hasil analisis terbaru ke file yang sedang ditampilkan"""
+        for media_file in self.media_files:
+            updated = fresh.get(media_file.path)
+            if updated is not None:
+                for field_name in self.ANALYSIS_FIELDS:
+                    setattr(media_file, field_name, getattr(updated, field_name))
+        if self.media_files:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.media_files) - 1, len(self.COLUMNS) - 1))
+    
     def get_file_at(self, row: int) -> Optional[MediaFile]:
         """Get MediaFile pada row tertentu"""
         if 0 <= row < len(self.media_files):
@@ -491,6 +316,13 @@ class MediaTableModel(QAbstractTableModel):
             self.media_files.sort(key=lambda x: x.artist.lower(), reverse=(order == Qt.DescendingOrder))
         elif column == 5:  # Album
             self.media_files.sort(key=lambda x: x.album.lower(), reverse=(order == Qt.DescendingOrder))
+        elif column in (7, 8, 9):  # LUFS, True Peak, RMS
+            attr = {7: 'loudness_lufs', 8: 'true_peak_db', 9: 'rms_db'}[column]
+            analyzed = [f for f in self.media_files if getattr(f, attr) is not None]
+            pending = [f for f in self.media_files if getattr(f, attr) is None]
+            analyzed.sort(key=lambda x: getattr(x, attr), reverse=(order == Qt.DescendingOrder))
+            # File yang belum dianalisis selalu di bawah
+            self.media_files = analyzed + pending
         
         self.layoutChanged.emit()
 
@@ -500,7 +332,7 @@ class MediaTableModel(QAbstractTableModel):
 # ============================================================================
 
 class ScannerWorker(QObject):
-    """Worker untuk scanning files di background thread"""
+    """Jalankan MediaScanner di background thread dan teruskan hasilnya lewat signal"""
     
     progress = pyqtSignal(int, int, str)
     finished = pyqtSignal(list)
@@ -508,184 +340,359 @@ class ScannerWorker(QObject):
     
     def __init__(self, paths: List[str], database: AudioDatabase):
         super().__init__()
-        self.paths = paths
-        self.database = database
-        self._is_running = True
-        self.scanned_count = 0
-        self.total_files = 0
+        self.scanner = MediaScanner(paths, database, progress_callback=self.progress.emit)
     
     def scan(self):
         """Scan semua files di paths yang diberikan"""
         try:
-            all_files = []
-            
-            # Count total files first untuk progress bar
-            self.total_files = self._count_total_files()
-            
-            for i, path in enumerate(self.paths):
-                if not self._is_running:
-                    break
-                
-                if os.path.isfile(path):
-                    media_file = self._scan_file(path)
-                    if media_file:
-                        all_files.append(media_file)
-                        self.database.add_media_file(media_file)
-                        self.scanned_count += 1
-                        
-                        # Update progress
-                        if self.scanned_count % 5 == 0:
-                            progress_percent = int((self.scanned_count / max(self.total_files, 1)) * 100)
-                            self.progress.emit(progress_percent, self.total_files, 
-                                             f"Scanned {self.scanned_count}/{self.total_files} files...")
-                else:
-                    self._scan_directory(path, all_files)
-            
-            self.finished.emit(all_files)
-            
+            self.finished.emit(self.scanner.scan())
         except Exception as e:
             self.error.emit(str(e))
     
-    def _count_total_files(self) -> int:
-        """Count total files untuk progress estimation"""
-        count = 0
-        audio_exts = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
-        video_exts = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v', '.webm'}
-        supported_exts = audio_exts | video_exts
-        
-        for path in self.paths:
-            if os.path.isfile(path):
-                if Path(path).suffix.lower() in supported_exts:
-                    count += 1
-            else:
-                try:
-                    for root, dirs, files in os.walk(path):
-                        for file in files:
-                            if Path(file).suffix.lower() in supported_exts:
-                                count += 1
-                except:
-                    pass
-        
-        return max(count, 1)  # Minimal 1 untuk menghindari division by zero
+    def stop(self):
+        """Stop scanning"""
+        self.scanner.stop()
+
+
+# ============================================================================
+# IN-MEMORY AUDITION ENGINE (CLIP PENDEK)
+# ============================================================================
+
+# File dengan durasi <= CLIP_MAX_SECONDS diputar dari PCM di memory
+CLIP_MAX_SECONDS = 30.0
+CLIP_CACHE_BYTES = 128 * 1024 * 1024
+CLIP_SAMPLE_RATE = 48000
+# Buffer QAudioOutput kecil supaya play/seek terasa langsung
+CLIP_OUTPUT_BUFFER_SECONDS = 0.05
+
+
+@dataclass
+class DecodedClip:
+    """Audio pendek yang sudah di-decode ke PCM 16-bit interleaved"""
+    pcm: bytes
+    sample_rate: int
+    channels: int
     
-    def _scan_directory(self, directory: str, all_files: list):
-        """Scan semua files di directory"""
-        try:
-            audio_exts = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
-            video_exts = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v', '.webm'}
-            supported_exts = audio_exts | video_exts
-            
-            for root, dirs, files in os.walk(directory):
-                if not self._is_running:
-                    break
-                
-                for file in files:
-                    if not self._is_running:
-                        break
-                    
-                    file_path = os.path.join(root, file)
-                    ext = Path(file_path).suffix.lower()
-                    
-                    # Hanya proses file dengan extension yang didukung
-                    if ext in supported_exts:
-                        media_file = self._scan_file(file_path)
-                        if media_file:
-                            all_files.append(media_file)
-                            self.database.add_media_file(media_file)
-                            self.scanned_count += 1
-                            
-                            # Update progress setiap 5 files
-                            if self.scanned_count % 5 == 0:
-                                progress_percent = int((self.scanned_count / max(self.total_files, 1)) * 100)
-                                self.progress.emit(progress_percent, self.total_files, 
-                                                 f"Scanned {self.scanned_count}/{self.total_files} files...")
-        
-        except Exception as e:
-            print(f"Error scanning directory {directory}: {e}")
+    @property
+    def frame_bytes(self) -> int:
+        return 2 * self.channels
+    
+    @property
+    def n_frames(self) -> int:
+        return len(self.pcm) // self.frame_bytes
     
-    def _scan_file(self, file_path: str) -> Optional[MediaFile]:
-        """Scan single file dan extract metadata"""
+    @property
+    def duration(self) -> float:
+        return self.n_frames / self.sample_rate if self.sample_rate else 0.0
+    
+    @staticmethod
+    def decode(file_path: str) -> Optional['DecodedClip']:
+        """Decode file pendek ke memory: WAV dibaca langsung, format lain lewat ffmpeg"""
         try:
-            # Check extension
-            ext = Path(file_path).suffix.lower()
-            audio_exts = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
-            video_exts = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v', '.webm'}
+            info = AudioAnalyzer.read_wav_info(file_path) if file_path.lower().endswith('.wav') else None
+            if (info is not None and info.format_tag in (1, 3) and info.channels in (1, 2)
+                    and info.duration <= CLIP_MAX_SECONDS):
+                with open(file_path, 'rb') as f:
+                    f.seek(info.data_offset)
+                    raw = f.read(info.n_frames * info.block_align)
+                if info.format_tag == 1 and info.bits_per_sample == 16:
+                    return DecodedClip(raw, info.sample_rate, info.channels)
+                samples = AudioAnalyzer.decode_pcm(raw, info)
+                if samples is not None:
+                    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+                    return DecodedClip(pcm, info.sample_rate, info.channels)
             
-            if ext not in audio_exts | video_exts:
+            if not get_ffmpeg_exe():
                 return None
-            
-            is_video = ext in video_exts
-            
-            # Get file stats
-            try:
-                stat = os.stat(file_path)
-                file_size = stat.st_size
-                last_modified = stat.st_mtime
-            except:
-                file_size = 0
-                last_modified = 0
-            
-            # Get metadata dengan TinyTag
+            args = ["-i", file_path, "-t", f"{CLIP_MAX_SECONDS:.3f}", "-map", "0:a:0", "-vn", "-sn", "-dn",
+                    "-ac", "2", "-ar", str(CLIP_SAMPLE_RATE), "-f", "s16le", "pipe:1"]
+            proc = popen_ffmpeg(args, stdout=subprocess.PIPE)
             try:
-                tag = tinytag.TinyTag.get(file_path)
-                duration = tag.duration or 0.0
-                title = tag.title or Path(file_path).stem
-                artist = tag.artist or ""
-                album = tag.album or ""
-                genre = tag.genre or ""
-                bitrate = tag.bitrate or 0
-                sample_rate = tag.samplerate or 0
-                channels = getattr(tag, 'channels', 0)
-            except Exception as tag_error:
-                # print(f"Debug: Error reading tags for {file_path}: {tag_error}")
-                duration = 0.0
-                title = Path(file_path).stem
-                artist = ""
-                album = ""
-                genre = ""
-                bitrate = 0
-                sample_rate = 0
-                channels = 0
-            
-            return MediaFile(
-                path=file_path,
-                filename=Path(file_path).name,
-                extension=ext[1:],  # Remove dot
-                is_video=is_video,
-                duration=float(duration),
-                size=file_size,
-                last_modified=last_modified,
-                title=title,
-                artist=artist,
-                album=album,
-                genre=genre,
-                bitrate=bitrate,
-                sample_rate=sample_rate,
-                channels=channels
-            )
-            
+                pcm, _ = proc.communicate(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                return None
+            if proc.returncode != 0 or not pcm:
+                return None
+            return DecodedClip(pcm[:len(pcm) - len(pcm) % 4], CLIP_SAMPLE_RATE, 2)
         except Exception as e:
-            # print(f"Debug: Error scanning file {file_path}: {e}")
+            print(f"Error decoding clip {file_path}: {e}")
             return None
+
+
+class ClipCache:
+    """LRU DecodedClip di memory, dibatasi total ukuran PCM"""
+    
+    def __init__(self, max_bytes: int = CLIP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._clips = OrderedDict()  # key -> DecodedClip
+        self._used = 0
+        self._decoding = {}          # key -> threading.Event, decode yang sedang berjalan
+        self._lock = threading.Lock()
+    
+    def get(self, file_path: str) -> Optional[DecodedClip]:
+        key = file_cache_key(file_path)
+        with self._lock:
+            clip = self._clips.get(key) if key else None
+            if clip is None:
+                self.misses += 1
+                return None
+            self._clips.move_to_end(key)
+            self.hits += 1
+            return clip
+    
+    def put(self, file_path: str, clip: DecodedClip):
+        key = file_cache_key(file_path)
+        if key is None or len(clip.pcm) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._clips.pop(key, None)
+            if old is not None:
+                self._used -= len(old.pcm)
+            self._clips[key] = clip
+            self._used += len(clip.pcm)
+            while self._used > self.max_bytes and len(self._clips) > 1:
+                _, evicted = self._clips.popitem(last=False)
+                self._used -= len(evicted.pcm)
+    
+    def get_or_decode(self, file_path: str) -> Optional[DecodedClip]:
+        """Clip dari cache, atau decode (blocking; jangan dipanggil dari GUI thread)
+        
+        Jika file yang sama sedang di-decode thread lain (prefetch dan player),
+        tunggu hasil decode itu daripada decode dua kali.
+        """
+        clip = self.get(file_path)
+        key = file_cache_key(file_path)
+        if clip is not None or key is None:
+            return clip
+        
+        with self._lock:
+            done = self._decoding.get(key)
+            owner = done is None
+            if owner:
+                done = self._decoding[key] = threading.Event()
+        if not owner:
+            done.wait()
+            with self._lock:
+                return self._clips.get(key)
+        
+        try:
+            clip = DecodedClip.decode(file_path)
+            if clip is not None:
+                self.put(file_path, clip)
+        finally:
+            with self._lock:
+                del self._decoding[key]
+            done.set()
+        return clip
+
+
+class PcmRingDevice(QIODevice):
+    """QIODevice pull-mode untuk QAudioOutput di atas DecodedClip
+    
+    Dengan loop aktif, read yang melewati akhir clip lanjut dari start_frame
+    (ring), jadi repeat tidak ada jeda. Posisi disimpan dalam byte, seek per frame.
+    """
+    
+    def __init__(self, clip: DecodedClip, parent=None):
+        super().__init__(parent)
+        self.clip = clip
+        self.loop = False
+        self.start_frame = 0
+        self._data = memoryview(clip.pcm)
+        self._offset = 0
+        self._lock = threading.Lock()
+    
+    def isSequential(self) -> bool:
+        return True
+    
+    def seek_frame(self, frame: int):
+        frame = min(max(int(frame), 0), self.clip.n_frames)
+        with self._lock:
+            self._offset = frame * self.clip.frame_bytes
+    
+    def frame_position(self) -> int:
+        return self._offset // self.clip.frame_bytes
+    
+    def at_end(self) -> bool:
+        return not self.loop and self._offset >= len(self._data)
+    
+    def bytesAvailable(self) -> int:
+        if self.loop:
+            return len(self._data) + super().bytesAvailable()
+        return max(len(self._data) - self._offset, 0) + super().bytesAvailable()
+    
+    def readData(self, maxlen: int) -> bytes:
+        maxlen -= maxlen % self.clip.frame_bytes
+        parts = []
+        with self._lock:
+            while maxlen > 0:
+                chunk = self._data[self._offset:self._offset + maxlen]
+                if not len(chunk):
+                    if self.loop and len(self._data):
+                        self._offset = min(self.start_frame * self.clip.frame_bytes, len(self._data) - 1)
+                        self._offset -= self._offset % self.clip.frame_bytes
+                        continue
+                    break
+                parts.append(chunk.tobytes())
+                self._offset += len(chunk)
+                maxlen -= len(chunk)
+        return b''.join(parts)
+    
+    def writeData(self, data: bytes) -> int:
+        return -1
+
+
+class MemoryAudioEngine(QObject):
+    """Playback DecodedClip lewat QAudioOutput tanpa QMediaPlayer"""
+    
+    finished = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.clip = None
+        self.output = None
+        self.device = None
+        self.loop = False
+        self.start_frame = 0
+    
+    def load(self, clip: DecodedClip) -> bool:
+        """Siapkan output untuk clip; False jika format tidak didukung device"""
+        self.unload()
+        audio_format = QAudioFormat()
+        audio_format.setSampleRate(clip.sample_rate)
+        audio_format.setChannelCount(clip.channels)
+        audio_format.setSampleSize(16)
+        audio_format.setCodec("audio/pcm")
+        audio_format.setByteOrder(QAudioFormat.LittleEndian)
+        audio_format.setSampleType(QAudioFormat.SignedInt)
+        
+        device_info = QAudioDeviceInfo.defaultOutputDevice()
+        if not device_info.isFormatSupported(audio_format):
+            print(f"✗ Audio format {clip.sample_rate} Hz/{clip.channels} ch not supported by output device")
+            return False
+        
+        self.clip = clip
+        self.output = QAudioOutput(device_info, audio_format, self)
+        self.output.setBufferSize(int(clip.sample_rate * CLIP_OUTPUT_BUFFER_SECONDS) * clip.frame_bytes)
+        self.output.stateChanged.connect(self._on_state_changed)
+        self.device = PcmRingDevice(clip, self)
+        self.device.loop = self.loop
+        self.device.open(QIODevice.ReadOnly | QIODevice.Unbuffered)
+        return True
+    
+    def unload(self):
+        if self.output is not None:
+            self.output.stop()
+            self.output.deleteLater()
+        if self.device is not None:
+            self.device.close()
+            self.device.deleteLater()
+        self.output = self.device = self.clip = None
+        self.start_frame = 0
+    
+    def set_start(self, seconds: float):
+        """Posisi awal untuk play, stop dan loop (mis. onset pertama)"""
+        if self.clip is None:
+            return
+        self.start_frame = min(max(int(round(seconds * self.clip.sample_rate)), 0), self.clip.n_frames)
+        self.device.start_frame = self.start_frame
+        if self.output.state() not in (QAudio.ActiveState, QAudio.SuspendedState):
+            self.device.seek_frame(self.start_frame)
+    
+    def set_loop(self, loop: bool):
+        self.loop = loop
+        if self.device is not None:
+            self.device.loop = loop
+    
+    def play(self):
+        if self.output is None:
+            return
+        if self.output.state() == QAudio.SuspendedState:
+            self.output.resume()
+        elif self.output.state() != QAudio.ActiveState:
+            if self.device.at_end():
+                self.device.seek_frame(self.start_frame)
+            self.output.start(self.device)
+    
+    def pause(self):
+        if self.output is not None:
+            self.output.suspend()
     
     def stop(self):
-        """Stop scanning"""
-        self._is_running = False
+        if self.output is not None:
+            self.output.stop()
+            self.device.seek_frame(self.start_frame)
+    
+    def set_position(self, seconds: float):
+        """Seek sample-accurate; buffer output dibuang supaya langsung terdengar"""
+        if self.output is None:
+            return
+        frame = int(round(seconds * self.clip.sample_rate))
+        if self.output.state() == QAudio.ActiveState:
+            self.output.stop()
+            self.device.seek_frame(frame)
+            self.output.start(self.device)
+        else:
+            self.device.seek_frame(frame)
+    
+    def position(self) -> float:
+        """Posisi yang sedang terdengar (frame yang sudah dibaca dikurangi isi buffer output)"""
+        if self.output is None or self.clip is None:
+            return 0.0
+        frame = self.device.frame_position()
+        if self.output.state() in (QAudio.ActiveState, QAudio.SuspendedState):
+            buffered = max(self.output.bufferSize() - self.output.bytesFree(), 0)
+            frame -= buffered // self.clip.frame_bytes
+        if frame < 0:
+            frame += self.clip.n_frames if self.loop else -frame
+        return frame / self.clip.sample_rate
+    
+    def _on_state_changed(self, state):
+        # Idle = device kehabisan data; tanpa loop berarti clip selesai
+        if state == QAudio.IdleState and self.device is not None and self.device.at_end():
+            self.output.stop()
+            self.device.seek_frame(self.start_frame)
+            self.finished.emit()
 
 
 # ============================================================================
 # AUDIO PLAYER DENGAN FIX UNTUK VIDEO FILES (NO VIDEO OUTPUT)
 # ============================================================================
 
+class PlayerSignals(QObject):
+    """Signals dari background task ke EnhancedAudioPlayer (GUI thread)"""
+    
+    clip_decoded = pyqtSignal(str, object)
+    stream_progress = pyqtSignal(object)
+
+
 class EnhancedAudioPlayer:
     """Audio player dengan support untuk video files - HANYA AUDIO"""
     
     def __init__(self):
+        # Clip pendek diputar dari memory lewat QAudioOutput
+        self.clip_cache = ClipCache()
+        self.memory_engine = MemoryAudioEngine()
+        self.memory_engine.finished.connect(self._on_memory_finished)
+        self.use_memory_engine = False
+        
+        # Clip yang belum ada di cache di-decode di background (TASK_INTERACTIVE)
+        self.signals = PlayerSignals()
+        self.signals.clip_decoded.connect(self._on_clip_decoded)
+        self.signals.stream_progress.connect(self._on_stream_progress)
+        self._clip_token = None
+        
         self.current_file = None
         self.current_audio_file = None
         self.is_playing = False
         self.duration = 0
         self.position = 0
+        self.start_position = 0.0  # Posisi awal play/stop/repeat (onset pertama)
+        self.pending_seek = None   # Seek yang menunggu QMediaPlayer selesai load
         self.autoplay = False  # Autoplay setelah load
         self.repeat = False    # Repeat track setelah selesai
         self.media_ended = False  # Flag untuk track selesai
@@ -714,10 +721,26 @@ class EnhancedAudioPlayer:
         # Temporary files tracker
         self.temp_files = []
         
+        # Device untuk audio yang masih di-extract (progressive playback);
+        # _pending_stream = extraction yang belum punya cukup data untuk dibuka
+        self.stream_device = None
+        self._pending_stream = None
+        self._stream_listener = None
+        
         # Suppress warnings
         import warnings
         warnings.filterwarnings("ignore", category=RuntimeWarning)
     
+    @property
+    def repeat(self) -> bool:
+        return self._repeat
+    
+    @repeat.setter
+    def repeat(self, value: bool):
+        self._repeat = value
+        # Clip di memory di-loop langsung oleh device (tanpa jeda)
+        self.memory_engine.set_loop(value)
+    
     def _disable_video_output(self):
         """Multiple methods to disable video output"""
         try:
@@ -736,13 +759,165 @@ class EnhancedAudioPlayer:
             # Ignore video output errors
             pass
     
-    def load_file(self, file_path: str, autoplay: bool = False, repeat: bool = False) -> bool:
-        """Load audio atau video file dengan autoplay dan repeat options"""
+    def _load_memory_clip(self, file_path: str, duration: float) -> bool:
+        """Load file pendek ke MemoryAudioEngine, False jika harus lewat QMediaPlayer
+        
+        Hanya clip yang sudah ada di ClipCache (mis. dari prefetch) yang langsung
+        dipakai. Clip lain di-decode di background sementara file diputar lewat
+        QMediaPlayer, lalu engine diganti di _on_clip_decoded.
+        """
+        if duration <= 0:
+            duration = AudioAnalyzer.get_audio_duration(file_path)
+        if not 0 < duration <= CLIP_MAX_SECONDS:
+            return False
+        
+        clip = self.clip_cache.get(file_path)
+        if clip is None:
+            self._request_clip_decode(file_path)
+            return False
+        return self._start_memory_clip(file_path, clip)
+    
+    def _request_clip_decode(self, file_path: str):
+        token = CancelToken()
+        self._clip_token = token
+        clip_cache, signals = self.clip_cache, self.signals
+        
+        def decode():
+            clip = clip_cache.get_or_decode(file_path)
+            if clip is not None and not token.is_cancelled():
+                signals.clip_decoded.emit(file_path, clip)
+        
+        get_task_scheduler().submit(decode, TASK_INTERACTIVE, "cpu", "clip decode", token)
+    
+    def _on_clip_decoded(self, file_path: str, clip: DecodedClip):
+        """Clip selesai di-decode: pindah dari QMediaPlayer ke memory engine di posisi yang sama"""
+        if (file_path != self.current_file or self.use_memory_engine
+                or self._clip_token is None or self._clip_token.is_cancelled()):
+            return
+        self._clip_token = None
+        was_playing = self.is_playing
+        position = self.pending_seek if self.pending_seek is not None else self.position
+        if self.media_ended:
+            position = self.start_position
+        if not self._start_memory_clip(file_path, clip):
+            return
+        
+        self.qt_player.stop()
+        self.qt_player.setMedia(QMediaContent())
+        self._close_stream_device()
+        self.pending_seek = None
+        self.memory_engine.set_start(self.start_position)
+        self.set_position(min(max(position, 0.0), self.duration))
+        if was_playing:
+            self.play()
+    
+    def _start_memory_clip(self, file_path: str, clip: DecodedClip) -> bool:
+        if not self.memory_engine.load(clip):
+            return False
+        self.memory_engine.set_loop(self.repeat)
+        self.use_memory_engine = True
+        self.current_audio_file = None
+        self.duration = clip.duration
+        print(f"⚡ Loaded clip into memory: {Path(file_path).name}, Duration: {self.duration:.2f}s")
+        return True
+    
+    def _on_memory_finished(self):
+        """Clip di memory selesai (hanya terjadi jika repeat tidak aktif)"""
+        self.media_ended = True
+        print("🎵 Track finished playing")
+        self.stop()
+    
+    def _wait_for_stream(self, stream: 'StreamingExtraction'):
+        """Buka stream begitu chunk pertama tersedia, tanpa menahan GUI thread
+        
+        Listener dipanggil dari extraction thread; signal di-queue ke GUI thread
+        dan device dibuka di _on_stream_progress.
+        """
+        signals = self.signals
+        
+        def on_data():
+            signals.stream_progress.emit(stream)
+        
+        self._pending_stream = stream
+        self._stream_listener = on_data
+        stream.add_listener(on_data)
+        # Extraction dari prefetch mungkin sudah punya cukup data
+        self._on_stream_progress(stream)
+    
+    def _on_stream_progress(self, stream: 'StreamingExtraction'):
+        """Extraction punya data baru (GUI thread): buka device jika sudah cukup"""
+        if stream is not self._pending_stream:
+            return
+        start_bytes = WAV_HEADER_SIZE + 1
+        if stream.sample_rate:
+            start_bytes = WAV_HEADER_SIZE + int(STREAM_START_SECONDS * stream.sample_rate) * 2 * stream.channels
+        if not stream.is_done() and stream.available_bytes() < start_bytes:
+            return
+        self._stop_waiting_for_stream()
+        
+        device = None
+        if not stream.failed and stream.bytes_written > 0:
+            device = GrowingWavDevice(stream)
+            if not device.open(QIODevice.ReadOnly | QIODevice.Unbuffered):
+                device.close()
+                device = None
+        if device is None:
+            print("✗ Streaming extraction failed, using original file")
+            self.current_audio_file = None
+            self.qt_player.setMedia(QMediaContent(QUrl.fromLocalFile(self.current_file)))
+        else:
+            print(f"✓ Stream opened: {Path(self.current_file).name}")
+            self.stream_device = device
+            self.current_audio_file = stream.current_path()
+            self.qt_player.setMedia(QMediaContent(), device)
+        # play() selama menunggu hanya mencatat is_playing
+        if self.is_playing:
+            self.qt_player.play()
+    
+    def _stop_waiting_for_stream(self):
+        if self._pending_stream is not None:
+            self._pending_stream.remove_listener(self._stream_listener)
+            self._pending_stream = None
+            self._stream_listener = None
+    
+    def _close_stream_device(self):
+        self._stop_waiting_for_stream()
+        if self.stream_device is not None:
+            self.stream_device.close()
+            self.stream_device = None
+    
+    def load_file(self, file_path: str, autoplay: bool = False, repeat: bool = False,
+                  duration: float = 0.0, proxy_path: Optional[str] = None,
+                  start_position: float = 0.0) -> bool:
+        """Load audio atau video file dengan autoplay dan repeat options
+        
+        duration yang sudah diketahui (database/prefetch) melewati pembacaan tag.
+        proxy_path (preview proxy) diputar sebagai ganti file asli.
+        start_position (detik) dipakai sebagai awal play, stop dan repeat.
+        """
         try:
+            if self._clip_token is not None:
+                self._clip_token.cancel()
+                self._clip_token = None
+            self.qt_player.setMedia(QMediaContent())
+            self._close_stream_device()
+            self.memory_engine.unload()
+            self.use_memory_engine = False
             self.current_file = file_path
             self.autoplay = autoplay
             self.repeat = repeat
             self.media_ended = False
+            self.start_position = max(float(start_position), 0.0)
+            self.position = self.start_position
+            self.pending_seek = self.start_position if self.start_position > 0 else None
+            
+            # Clip pendek: decode ke memory dan putar lewat QAudioOutput
+            if not proxy_path and self._load_memory_clip(file_path, duration):
+                self.pending_seek = None
+                self.memory_engine.set_start(self.start_position)
+                if self.autoplay:
+                    self.play()
+                return True
             
             # Cek jika ini video file
             video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v'}
@@ -750,30 +925,50 @@ class EnhancedAudioPlayer:
             
             file_to_load = file_path
             
+            if proxy_path:
+                # Preview proxy kecil, seek cepat (juga menggantikan extraction video)
+                self.current_audio_file = proxy_path
+                file_to_load = proxy_path
+                print(f"✓ Using preview proxy: {proxy_path}")
             # Untuk video files, kita akan mencoba extract audio atau gunakan workaround
-            if is_video:
+            elif is_video:
                 print(f"⚠ Video file detected: {Path(file_path).name}")
                 
+                stream = get_extraction_cache().start_stream(file_path) if get_ffmpeg_exe() else None
+                if stream is not None and not stream.is_complete():
+                    # Playback dimulai begitu chunk pertama dari ffmpeg tersedia
+                    self.current_audio_file = stream.current_path()
+                    self.duration = duration if duration > 0 else AudioAnalyzer.get_audio_duration(file_path)
+                    print(f"Streaming extracted audio: {Path(file_path).name}, Duration: {self.duration:.1f}s")
+                    self._disable_video_output()
+                    self._wait_for_stream(stream)
+                    if self.autoplay:
+                        self.play()
+                    return True
+                elif stream is not None:
+                    self.current_audio_file = stream.final_path
+                    file_to_load = stream.final_path
+                    print(f"✓ Using extracted audio: {file_to_load}")
                 # Coba extract audio jika MoviePy tersedia
-                if MOVIEPY_AVAILABLE and mp is not None:
-                    print(f"Extracting audio from video...")
-                    extracted_audio = AudioAnalyzer.extract_audio_from_video(file_path)
+                elif MOVIEPY_AVAILABLE and get_moviepy() is not None:
+                    print("Extracting audio from video...")
+                    # File di extraction cache tidak dihapus saat cleanup
+                    extracted_audio = get_extraction_cache().get_or_extract(file_path)
                     if extracted_audio and os.path.exists(extracted_audio):
                         self.current_audio_file = extracted_audio
-                        self.temp_files.append(extracted_audio)
                         file_to_load = extracted_audio
                         print(f"✓ Using extracted audio: {extracted_audio}")
                     else:
-                        print(f"✗ Audio extraction failed, using original file")
+                        print("✗ Audio extraction failed, using original file")
                         file_to_load = file_path
                 else:
-                    print(f"MoviePy not available, using original file")
+                    print("MoviePy not available, using original file")
                     file_to_load = file_path
             else:
                 self.current_audio_file = None
             
             # Get duration
-            self.duration = AudioAnalyzer.get_audio_duration(file_path)
+            self.duration = duration if duration > 0 else AudioAnalyzer.get_audio_duration(file_path)
             
             print(f"Loading file for playback: {Path(file_to_load).name}, Duration: {self.duration:.1f}s")
             
@@ -788,8 +983,9 @@ class EnhancedAudioPlayer:
             self.qt_player.setMedia(media_content)
             
             # Jika autoplay diaktifkan, play setelah load
+            # (QMediaPlayer mulai sendiri begitu media selesai di-load)
             if self.autoplay:
-                QTimer.singleShot(300, self.play)  # Delay lebih lama untuk pastikan media loaded
+                self.play()
             
             return True
             
@@ -815,6 +1011,11 @@ class EnhancedAudioPlayer:
         status_name = status_names.get(status, str(status))
         if status in [QMediaPlayer.LoadedMedia, QMediaPlayer.EndOfMedia, QMediaPlayer.InvalidMedia]:
             print(f"Media status: {status_name}")
+        
+        # Seek ke start_position begitu media bisa di-seek
+        if self.pending_seek is not None and status in (QMediaPlayer.LoadedMedia, QMediaPlayer.BufferedMedia):
+            self.qt_player.setPosition(int(self.pending_seek * 1000))
+            self.pending_seek = None
     
     def _on_player_error(self, error):
         """Handle player errors"""
@@ -851,7 +1052,15 @@ class EnhancedAudioPlayer:
         
         try:
             # Coba play dengan error handling
-            self.qt_player.play()
+            if self.use_memory_engine:
+                self.memory_engine.play()
+            elif self._pending_stream is None:
+                # Dari stop (atau repeat) mulai lagi di start_position
+                if (self.start_position > 0 and self.pending_seek is None
+                        and self.qt_player.state() == QMediaPlayer.StoppedState):
+                    self.qt_player.setPosition(int(self.start_position * 1000))
+                self.qt_player.play()
+            # Stream yang belum terbuka: diputar di _on_stream_progress karena is_playing
             self.is_playing = True
             self.timer.start()
             print(f"▶ Playing: {Path(self.current_file).name}")
@@ -863,7 +1072,10 @@ class EnhancedAudioPlayer:
     def pause(self):
         """Pause audio"""
         try:
-            self.qt_player.pause()
+            if self.use_memory_engine:
+                self.memory_engine.pause()
+            else:
+                self.qt_player.pause()
             self.is_playing = False
             self.timer.stop()
             print("⏸ Audio paused")
@@ -873,9 +1085,12 @@ class EnhancedAudioPlayer:
     def stop(self):
         """Stop audio"""
         try:
-            self.qt_player.stop()
+            if self.use_memory_engine:
+                self.memory_engine.stop()
+            else:
+                self.qt_player.stop()
             self.is_playing = False
-            self.position = 0
+            self.position = self.start_position
             self.timer.stop()
             print("⏹ Audio stopped")
         except Exception as e:
@@ -887,6 +1102,15 @@ class EnhancedAudioPlayer:
             return
         
         try:
+            if self.use_memory_engine:
+                self.memory_engine.set_position(position)
+                self.position = position
+                return
+            if self._pending_stream is not None:
+                # Di-seek oleh _on_media_status_changed setelah stream terbuka
+                self.pending_seek = position
+                self.position = position
+                return
             ms_position = int(position * 1000)
             self.qt_player.setPosition(ms_position)
         except Exception as e:
@@ -894,13 +1118,18 @@ class EnhancedAudioPlayer:
     
     def _on_qt_position_changed(self, position):
         """Update position from Qt player"""
+        if self.use_memory_engine:
+            return
         self.position = position / 1000.0  # Convert to seconds
     
     def _on_qt_state_changed(self, state):
         """Handle Qt player state changes"""
+        if self.use_memory_engine:
+            # QMediaPlayer yang dihentikan setelah pindah ke memory engine
+            return
         if state == QMediaPlayer.StoppedState:
             self.is_playing = False
-            self.position = 0
+            self.position = self.start_position
             self.timer.stop()
         elif state == QMediaPlayer.PlayingState:
             self.is_playing = True
@@ -909,11 +1138,14 @@ class EnhancedAudioPlayer:
     
     def _update_position(self):
         """Update position timer"""
-        # Position sudah diupdate oleh signal Qt
-        pass
+        # Position QMediaPlayer sudah diupdate oleh signal Qt
+        if self.use_memory_engine:
+            self.position = self.memory_engine.position()
     
     def cleanup(self):
         """Clean up temporary files"""
+        self._close_stream_device()
+        self.memory_engine.unload()
         for temp_file in self.temp_files:
             try:
                 if os.path.exists(temp_file):
@@ -1129,6 +1361,40 @@ class DragTableView(QTableView):
             export_desktop = export_submenu.addAction("Desktop")
             export_documents = export_submenu.addAction("Documents")
             export_custom = export_submenu.addAction("Custom Folder...")
+            export_submenu.addSeparator()
+            mode_submenu = export_submenu.addMenu("Export Mode")
+            mode_group = QActionGroup(mode_submenu)
+            mode_group.setExclusive(True)
+            mode_actions = {}
+            current_mode = getattr(self.window(), "export_mode", "copy")
+            for mode, label in EXPORT_MODES.items():
+                mode_action = mode_submenu.addAction(label)
+                mode_action.setCheckable(True)
+                mode_action.setChecked(mode == current_mode)
+                mode_group.addAction(mode_action)
+                mode_actions[mode_action] = mode
+            mode_submenu.addSeparator()
+            sync_action = mode_submenu.addAction("Sync (skip unchanged files)")
+            sync_action.setCheckable(True)
+            sync_action.setChecked(getattr(self.window(), "export_sync", False))
+            verify_action = mode_submenu.addAction("Verify Content Hash")
+            verify_action.setCheckable(True)
+            verify_action.setChecked(getattr(self.window(), "export_verify_hash", False))
+            verify_action.setEnabled(sync_action.isChecked())
+            format_actions = {}
+            if get_ffmpeg_exe():
+                format_submenu = export_submenu.addMenu("Convert To")
+                format_group = QActionGroup(format_submenu)
+                format_group.setExclusive(True)
+                current_format = getattr(self.window(), "export_format", "")
+                for format_name in ["", *EXPORT_TRANSCODE_FORMATS]:
+                    format_action = format_submenu.addAction(format_name or "Original (no conversion)")
+                    format_action.setCheckable(True)
+                    format_action.setChecked(format_name == current_format)
+                    format_group.addAction(format_action)
+                    format_actions[format_action] = format_name
+                    if not format_name:
+                        format_submenu.addSeparator()
             
             menu.addSeparator()
             
@@ -1138,8 +1404,13 @@ class DragTableView(QTableView):
             
             menu.addSeparator()
             
+            similar_action = menu.addAction("🔎 Find Similar Sounds")
+            
+            menu.addSeparator()
+            
             # Extract audio (for videos)
-            if MOVIEPY_AVAILABLE:
+            extract_action = None
+            if audio_extraction_available():
                 extract_action = menu.addAction("🎵 Extract Audio from Video")
             
             # Execute menu
@@ -1157,18 +1428,30 @@ class DragTableView(QTableView):
                 self._export_to_folder(Path.home() / "Documents")
             elif action == export_custom:
                 self._export_to_custom_folder()
+            elif action in mode_actions:
+                self.window().export_mode = mode_actions[action]
+            elif action == sync_action:
+                self.window().export_sync = sync_action.isChecked()
+            elif action == verify_action:
+                self.window().export_verify_hash = verify_action.isChecked()
+            elif action in format_actions:
+                self.window().export_format = format_actions[action]
             elif action == open_action:
                 self._open_selected_file()
             elif action == open_location_action:
                 self._open_file_location()
-            elif action == extract_action and MOVIEPY_AVAILABLE:
+            elif action == similar_action:
+                file_path = self.model().data(selected[0].siblingAtColumn(0), Qt.UserRole)
+                if file_path:
+                    self.window().find_similar(file_path)
+            elif action is not None and action == extract_action:
                 self._extract_audio_from_selected()
                 
         except Exception as e:
             print(f"Error in contextMenuEvent: {e}")
     
     def _export_to_folder(self, folder_path: Path):
-        """Export selected files to specific folder"""
+        """Export selected files to specific folder (background, lihat ExportEngine)"""
         try:
             selected = self.selectionModel().selectedRows()
             if not selected:
@@ -1180,39 +1463,10 @@ class DragTableView(QTableView):
             for index in selected:
                 file_path = model.data(index.siblingAtColumn(0), Qt.UserRole)
                 if file_path and os.path.exists(file_path):
-                    file_paths.append(Path(file_path))
-            
-            if not file_paths:
-                return
-            
-            # Create destination folder jika tidak ada
-            folder_path.mkdir(parents=True, exist_ok=True)
-            
-            # Copy files
-            success_count = 0
-            for src_path in file_paths:
-                try:
-                    dst_path = folder_path / src_path.name
-                    # Handle duplicate names
-                    counter = 1
-                    while dst_path.exists():
-                        name_parts = src_path.stem.split('.')
-                        if len(name_parts) > 1:
-                            new_name = f"{name_parts[0]}_{counter}.{src_path.suffix[1:]}"
-                        else:
-                            new_name = f"{src_path.stem}_{counter}{src_path.suffix}"
-                        dst_path = folder_path / new_name
-                        counter += 1
-                    
-                    import shutil
-                    shutil.copy2(src_path, dst_path)
-                    success_count += 1
-                except Exception as e:
-                    print(f"Error copying {src_path}: {e}")
+                    file_paths.append(file_path)
             
-            # Show result
-            QMessageBox.information(self.window(), "Export Complete",
-                f"Successfully exported {success_count}/{len(file_paths)} files to:\n{folder_path}")
+            if file_paths:
+                self.window().export_files(file_paths, str(folder_path))
             
         except Exception as e:
             print(f"Error exporting to folder: {e}")
@@ -1231,18 +1485,21 @@ class DragTableView(QTableView):
             print(f"Error in custom folder export: {e}")
     
     def _extract_audio_from_selected(self):
-        """Extract audio from selected video file"""
+        """Extract audio from all selected video files"""
         try:
             selected = self.selectionModel().selectedRows()
-            if not selected:
+            if not selected or not audio_extraction_available():
                 return
             
-            row = selected[0].row()
             model = self.model()
             if hasattr(model, 'get_file_at'):
-                media_file = model.get_file_at(row)
-                if media_file and media_file.is_video and MOVIEPY_AVAILABLE:
-                    self.window().extract_audio_from_video(media_file.path)
+                video_paths = []
+                for index in selected:
+                    media_file = model.get_file_at(index.row())
+                    if media_file and media_file.is_video:
+                        video_paths.append(media_file.path)
+                if video_paths:
+                    self.window().extract_audio_batch(video_paths)
         except Exception as e:
             print(f"Error extracting audio: {e}")
     
@@ -1290,161 +1547,4019 @@ class DragTableView(QTableView):
 # AUDIO ANALYZER DENGAN PERBAIKAN
 # ============================================================================
 
-class AudioAnalyzer:
-    """Class untuk menganalisis audio dan membuat waveform"""
+# Jumlah frame yang di-decode per chunk saat membaca WAV besar
+WAV_CHUNK_FRAMES = 1 << 18
+
+# Decode waveform lewat ffmpeg pipe (MP3/FLAC/OGG/M4A/video)
+WAVEFORM_SAMPLE_RATE = 22050
+WAVEFORM_MAX_DECODE_SECONDS = 2 * 60 * 60
+
+# Preview cepat: decode beberapa segmen pendek yang tersebar di file
+PREVIEW_SAMPLE_RATE = 8000
+PREVIEW_SEGMENTS = 32
+PREVIEW_SEGMENT_SECONDS = 1.0
+PREVIEW_MIN_DURATION = 120.0
+
+# Sample rate untuk decode detail range saat waveform di-zoom
+DETAIL_SAMPLE_RATE = 48000
+
+
+@dataclass
+class WavInfo:
+    """Informasi format dari header RIFF/WAVE"""
+    format_tag: int          # 1 = PCM integer, 3 = IEEE float
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    data_offset: int
+    data_size: int
     
-    @staticmethod
-    def extract_audio_from_video(video_path: str) -> Optional[str]:
-        """Extract audio dari video file ke temporary WAV file"""
-        if not MOVIEPY_AVAILABLE or mp is None:
-            print("✗ MoviePy not available for audio extraction")
+    @property
+    def block_align(self) -> int:
+        return self.channels * (self.bits_per_sample // 8)
+    
+    @property
+    def n_frames(self) -> int:
+        return self.data_size // max(self.block_align, 1)
+    
+    @property
+    def duration(self) -> float:
+        return self.n_frames / self.sample_rate if self.sample_rate else 0.0
+
+
+def build_wav_header(sample_rate: int, channels: int, bits_per_sample: int, data_size: int) -> bytes:
+    """Header RIFF/WAVE PCM standar 44 byte"""
+    block_align = channels * bits_per_sample // 8
+    data_size = min(int(data_size), 0xFFFFFFFF - 36)
+    return struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + data_size, b'WAVE',
+                       b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align,
+                       block_align, bits_per_sample, b'data', data_size)
+
+
+WAV_HEADER_SIZE = 44
+
+
+@dataclass
+class WaveformPeaks:
+    """Peak data per bucket (min/max/RMS) untuk visualisasi waveform
+    
+    Array selalu sepanjang jumlah bucket total; `filled` menunjukkan berapa
+    bucket yang sudah dihitung (untuk hasil parsial).
+    """
+    mins: np.ndarray
+    maxs: np.ndarray
+    rms: np.ndarray
+    filled: int = 0
+    synthetic: bool = False  # True untuk waveform fallback (bukan data audio asli)
+    
+    def __len__(self):
+        return len(self.mins)
+    
+    @classmethod
+    def empty(cls, num_buckets: int) -> 'WaveformPeaks':
+        return cls(np.zeros(num_buckets, dtype=np.float32),
+                   np.zeros(num_buckets, dtype=np.float32),
+                   np.zeros(num_buckets, dtype=np.float32))
+    
+    @classmethod
+    def from_amplitudes(cls, values) -> 'WaveformPeaks':
+        """Buat envelope simetris dari list amplitude (waveform sintetis)"""
+        amp = np.abs(np.asarray(values, dtype=np.float32))
+        return cls(-amp, amp.copy(), amp * np.float32(0.7071), len(amp), synthetic=True)
+    
+    def copy(self) -> 'WaveformPeaks':
+        return WaveformPeaks(self.mins.copy(), self.maxs.copy(), self.rms.copy(),
+                             self.filled, self.synthetic)
+    
+    def peak(self) -> float:
+        """Absolute peak dari bucket yang sudah terisi"""
+        if self.filled == 0:
+            return 0.0
+        return float(max(np.max(np.abs(self.mins[:self.filled])),
+                         np.max(np.abs(self.maxs[:self.filled]))))
+
+
+class PeakAccumulator:
+    """Reduce samples yang datang per chunk ke bucket min/max/RMS
+    
+    Memory yang dipakai hanya sebesar jumlah bucket, berapapun panjang file.
+    Bucket boundary tidak harus sejajar dengan chunk boundary.
+    """
+    
+    def __init__(self, total_frames: int, num_buckets: int):
+        self.total_frames = max(int(total_frames), 1)
+        self.num_buckets = max(min(int(num_buckets), self.total_frames), 1)
+        self.frames_done = 0
+        
+        self.peaks = WaveformPeaks.empty(self.num_buckets)
+        self.peaks.mins.fill(np.inf)
+        self.peaks.maxs.fill(-np.inf)
+        self._energy = np.zeros(self.num_buckets, dtype=np.float64)
+        self._counts = np.zeros(self.num_buckets, dtype=np.int64)
+    
+    def _bucket_of(self, frame: int) -> int:
+        return min(frame * self.num_buckets // self.total_frames, self.num_buckets - 1)
+    
+    def _bucket_start(self, bucket: int) -> int:
+        return -(-bucket * self.total_frames // self.num_buckets)  # ceil division
+    
+    @property
+    def progress(self) -> float:
+        return min(self.frames_done / self.total_frames, 1.0)
+    
+    def feed(self, samples: np.ndarray):
+        """Tambahkan chunk samples (frames, channels) berikutnya"""
+        n = len(samples)
+        if n == 0:
+            return
+        
+        start = self.frames_done
+        first = self._bucket_of(start)
+        last = self._bucket_of(start + n - 1)
+        
+        # Offset (relatif ke chunk) dari setiap bucket yang dimulai di chunk ini
+        starts = [0] + [self._bucket_start(b) - start for b in range(first + 1, last + 1)]
+        starts = np.asarray(starts, dtype=np.int64)
+        counts = np.diff(np.append(starts, n))
+        
+        # Frames interleaved dan contiguous, jadi bucket bisa di-reduce langsung
+        # di array flat (lebih cepat daripada reduce per axis)
+        channels = samples.shape[1] if samples.ndim > 1 else 1
+        flat = np.ascontiguousarray(samples).reshape(-1)
+        flat_starts = starts * channels
+        mins = np.minimum.reduceat(flat, flat_starts)
+        maxs = np.maximum.reduceat(flat, flat_starts)
+        energy = np.add.reduceat(np.square(flat, dtype=np.float32), flat_starts) / channels
+        
+        idx = slice(first, last + 1)
+        self.peaks.mins[idx] = np.minimum(self.peaks.mins[idx], mins)
+        self.peaks.maxs[idx] = np.maximum(self.peaks.maxs[idx], maxs)
+        self._energy[idx] += energy
+        self._counts[idx] += counts
+        self.peaks.rms[idx] = np.sqrt(self._energy[idx] / self._counts[idx])
+        
+        self.frames_done += n
+        if self.frames_done >= self.total_frames:
+            self.peaks.filled = self.num_buckets
+        else:
+            self.peaks.filled = self._bucket_of(self.frames_done)
+    
+    def finish(self, trim: bool = True) -> Optional[WaveformPeaks]:
+        """Return peaks final
+        
+        Jika stream lebih pendek dari estimasi, bucket kosong dibuang (trim)
+        atau dibiarkan kosong supaya posisi bucket tetap sesuai timeline
+        (misalnya saat decode dibatasi durasi maksimum).
+        """
+        used = int(np.count_nonzero(self._counts))
+        if used == 0:
+            return None
+        
+        peaks = self.peaks
+        if used < self.num_buckets:
+            if trim:
+                peaks = WaveformPeaks(peaks.mins[:used], peaks.maxs[:used], peaks.rms[:used])
+            else:
+                peaks.mins[used:] = 0.0
+                peaks.maxs[used:] = 0.0
+        peaks.filled = used
+        return peaks
+
+
+class AudioAnalyzer:
+    """Class untuk menganalisis audio dan membuat waveform"""
+    
+    @staticmethod
+    def extract_audio_from_video(video_path: str, output_path: Optional[str] = None) -> Optional[str]:
+        """Extract audio dari video file ke WAV (output_path, atau temporary file)"""
+        editor = get_moviepy()
+        if editor is None:
+            print("✗ MoviePy not available for audio extraction")
+            return None
+            
+        try:
+            print(f"Extracting audio from: {video_path}")
+            
+            if output_path:
+                audio_path = output_path
+            else:
+                # Buat temporary file untuk audio
+                temp_dir = tempfile.gettempdir()
+                video_name = Path(video_path).stem
+                safe_name = ''.join(c for c in video_name if c.isalnum() or c in '._- ')
+                audio_filename = f"extracted_{safe_name}_{int(time.time())}.wav"
+                audio_path = os.path.join(temp_dir, audio_filename)
+            
+            print(f"Output audio path: {audio_path}")
+            
+            # Extract audio menggunakan moviepy
+            video = editor.VideoFileClip(video_path)
+            if video.audio is not None:
+                print("✓ Video has audio track, extracting...")
+                video.audio.write_audiofile(audio_path, verbose=False, logger=None)
+                video.close()
+                print(f"✓ Audio extraction successful: {audio_path}")
+                return audio_path
+            else:
+                print("✗ Video has no audio track")
+                video.close()
+                return None
+        except Exception as e:
+            print(f"✗ Error extracting audio from video: {e}")
+            return None
+    
+    @staticmethod
+    def get_audio_duration(file_path: str) -> float:
+        """Get duration dari file audio/video"""
+        try:
+            tag = tinytag.TinyTag.get(file_path)
+            duration = tag.duration if tag.duration is not None else 0.0
+            return float(duration) if duration is not None else 0.0
+        except Exception as e:
+            print(f"Error getting duration for {file_path}: {e}")
+            return 0.0
+    
+    @staticmethod
+    def generate_waveform_data(file_path: str, num_points: int = 800,
+                               progress_callback: Optional[Callable[[WaveformPeaks, float], None]] = None,
+                               cancel_token: Optional['CancelToken'] = None,
+                               preview: bool = False) -> Optional[WaveformPeaks]:
+        """Generate waveform peaks dari file audio untuk visualisasi
+        
+        progress_callback dipanggil dengan data parsial dan progress (0..1)
+        selama file dibaca. Return None jika job dibatalkan lewat cancel_token.
+        preview=True memakai mode resolusi rendah yang cepat untuk format compressed.
+        """
+        try:
+            wav_info = AudioAnalyzer.read_wav_info(file_path) if file_path.lower().endswith('.wav') else None
+            if wav_info is not None and wav_info.format_tag in (1, 3):
+                return AudioAnalyzer._read_wav_file(file_path, num_points,
+                                                    progress_callback, cancel_token)
+            
+            # Video yang audionya sudah di-extract dibaca lewat WAV di cache
+            video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v'}
+            is_video = Path(file_path).suffix.lower() in video_extensions
+            extracted_audio = get_extraction_cache().lookup(file_path) if is_video else None
+            if extracted_audio is not None:
+                return AudioAnalyzer._read_wav_file(extracted_audio, num_points,
+                                                    progress_callback, cancel_token)
+            
+            # Format lain (dan video) di-decode langsung lewat ffmpeg pipe
+            if get_ffmpeg_exe():
+                peaks = AudioAnalyzer._read_ffmpeg_stream(file_path, num_points, progress_callback,
+                                                          cancel_token, preview)
+                if peaks is not None or (cancel_token is not None and cancel_token.is_cancelled()):
+                    return peaks
+            
+            # Fallback tanpa ffmpeg: extract audio video dengan MoviePy
+            if is_video and MOVIEPY_AVAILABLE and get_moviepy() is not None:
+                # Extraction dipakai bersama dengan player lewat cache
+                extracted_audio = get_extraction_cache().get_or_extract(file_path)
+                if cancel_token is not None and cancel_token.is_cancelled():
+                    return None
+                if extracted_audio and os.path.exists(extracted_audio):
+                    try:
+                        return AudioAnalyzer._read_wav_file(extracted_audio, num_points,
+                                                            progress_callback, cancel_token)
+                    except:
+                        pass
+            
+            return AudioAnalyzer._generate_simplified_waveform(file_path, num_points)
+                
+        except Exception as e:
+            print(f"Error generating waveform data: {e}")
+            return AudioAnalyzer._generate_dummy_waveform(num_points)
+    
+    @staticmethod
+    def probe_duration(file_path: str) -> float:
+        """Durasi dari tag, fallback ke header yang dibaca ffmpeg"""
+        duration = AudioAnalyzer.get_audio_duration(file_path)
+        if duration > 0 or not get_ffmpeg_exe():
+            return duration
+        
+        try:
+            proc = popen_ffmpeg(["-i", file_path], stderr=subprocess.PIPE)
+            _, stderr = proc.communicate(timeout=10)
+            match = re.search(rb"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", stderr)
+            if match:
+                h, m, sec = match.groups()
+                return int(h) * 3600 + int(m) * 60 + float(sec)
+        except Exception as e:
+            print(f"Error probing duration for {file_path}: {e}")
+        return 0.0
+    
+    @staticmethod
+    def probe_audio_format(file_path: str) -> Optional[Tuple[int, int]]:
+        """(sample_rate, channels) dari audio stream pertama, dibaca dari output ffmpeg"""
+        if not get_ffmpeg_exe():
+            return None
+        try:
+            proc = popen_ffmpeg(["-i", file_path], stderr=subprocess.PIPE)
+            _, stderr = proc.communicate(timeout=10)
+            match = re.search(rb"Stream #[^\n]*?Audio: [^\n]*?(\d+) Hz, ([^,\n]+)", stderr)
+            if match:
+                # Surround di-downmix ke stereo untuk player dan waveform
+                channels = 1 if match.group(2).strip() == b"mono" else 2
+                return int(match.group(1)), channels
+        except Exception as e:
+            print(f"Error probing audio format for {file_path}: {e}")
+        return None
+    
+    @staticmethod
+    def _read_ffmpeg_stream(file_path: str, num_points: int,
+                            progress_callback: Optional[Callable[[WaveformPeaks, float], None]] = None,
+                            cancel_token: Optional['CancelToken'] = None,
+                            preview: bool = False) -> Optional[WaveformPeaks]:
+        """Decode audio ke float32 PCM lewat ffmpeg pipe dan reduce per chunk"""
+        duration = AudioAnalyzer.probe_duration(file_path)
+        decode_duration = min(duration, WAVEFORM_MAX_DECODE_SECONDS) if duration > 0 else WAVEFORM_MAX_DECODE_SECONDS
+        
+        if preview:
+            sample_rate, channels = PREVIEW_SAMPLE_RATE, 1
+        else:
+            sample_rate, channels = WAVEFORM_SAMPLE_RATE, 2
+        
+        if preview and decode_duration >= PREVIEW_MIN_DURATION:
+            # Buka file beberapa kali dengan input seeking dan gabungkan segmen
+            # pendek, jadi hanya ~PREVIEW_SEGMENTS detik audio yang di-decode
+            args = []
+            spacing = decode_duration / PREVIEW_SEGMENTS
+            for i in range(PREVIEW_SEGMENTS):
+                args += ["-ss", f"{i * spacing:.3f}", "-t", f"{PREVIEW_SEGMENT_SECONDS:.3f}", "-i", file_path]
+            inputs = "".join(f"[{i}:a:0]" for i in range(PREVIEW_SEGMENTS))
+            args += ["-filter_complex", f"{inputs}concat=n={PREVIEW_SEGMENTS}:v=0:a=1[out]", "-map", "[out]"]
+            total_frames = int(PREVIEW_SEGMENTS * PREVIEW_SEGMENT_SECONDS * sample_rate)
+        else:
+            args = ["-i", file_path, "-t", f"{decode_duration:.3f}", "-map", "0:a:0", "-vn", "-sn", "-dn"]
+            total_frames = int(duration * sample_rate) if duration > 0 else int(60 * sample_rate)
+        accumulator = PeakAccumulator(total_frames, num_points)
+        if not AudioAnalyzer._feed_ffmpeg_pipe(args, sample_rate, channels, accumulator,
+                                               progress_callback, cancel_token):
+            return None
+        
+        # Jika decode dipotong di WAVEFORM_MAX_DECODE_SECONDS, sisa timeline dibiarkan kosong
+        truncated = not preview and duration > decode_duration
+        return accumulator.finish(trim=not truncated)
+    
+    @staticmethod
+    def _feed_ffmpeg_pipe(args: List[str], sample_rate: int, channels: int,
+                          accumulator: PeakAccumulator,
+                          progress_callback: Optional[Callable[[WaveformPeaks, float], None]] = None,
+                          cancel_token: Optional['CancelToken'] = None) -> bool:
+        """Jalankan ffmpeg dengan output f32le ke stdout dan feed ke accumulator
+        
+        Return False jika dibatalkan.
+        """
+        args = args + ["-ac", str(channels), "-ar", str(sample_rate), "-f", "f32le", "pipe:1"]
+        frame_bytes = 4 * channels
+        chunk_bytes = WAV_CHUNK_FRAMES * frame_bytes
+        
+        proc = popen_ffmpeg(args, stdout=subprocess.PIPE, bufsize=chunk_bytes)
+        try:
+            while True:
+                if cancel_token is not None and cancel_token.is_cancelled():
+                    return False
+                
+                raw = proc.stdout.read(chunk_bytes)
+                usable = len(raw) - len(raw) % frame_bytes
+                if usable == 0:
+                    return True
+                
+                accumulator.feed(np.frombuffer(raw[:usable], dtype='<f4').reshape(-1, channels))
+                if progress_callback is not None:
+                    progress_callback(accumulator.peaks, accumulator.progress)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+    
+    @staticmethod
+    def decode_mono(file_path: str, sample_rate: int,
+                    max_seconds: float) -> Optional[Tuple[np.ndarray, int]]:
+        """Decode maksimal max_seconds pertama ke float32 mono untuk analisis
+        
+        WAV (dan audio video yang sudah di-extract) dibaca langsung di sample rate
+        aslinya; format lain di-decode ffmpeg ke sample_rate. Return (samples, rate).
+        """
+        try:
+            source = file_path
+            if Path(file_path).suffix.lower() in {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v', '.webm'}:
+                source = get_extraction_cache().lookup(file_path) or file_path
+            
+            info = AudioAnalyzer.read_wav_info(source) if source.lower().endswith('.wav') else None
+            if info is not None and info.format_tag in (1, 3) and info.block_align > 0:
+                frames = min(info.n_frames, int(max_seconds * info.sample_rate))
+                with open(source, 'rb') as f:
+                    f.seek(info.data_offset)
+                    samples = AudioAnalyzer.decode_pcm(f.read(frames * info.block_align), info)
+                if samples is not None:
+                    return samples.mean(axis=1, dtype=np.float32), info.sample_rate
+            
+            if not get_ffmpeg_exe():
+                return None
+            args = ["-i", file_path, "-t", f"{max_seconds:.3f}", "-map", "0:a:0", "-vn", "-sn", "-dn",
+                    "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "pipe:1"]
+            proc = popen_ffmpeg(args, stdout=subprocess.PIPE)
+            try:
+                raw, _ = proc.communicate(timeout=max(30.0, max_seconds))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                return None
+            if proc.returncode != 0 or len(raw) < 4:
+                return None
+            return np.frombuffer(raw[:len(raw) - len(raw) % 4], dtype='<f4'), sample_rate
+        except Exception as e:
+            print(f"Error decoding {Path(file_path).name} for analysis: {e}")
+            return None
+    
+    @staticmethod
+    def iter_pcm_chunks(file_path: str, sample_rate: int,
+                        max_seconds: float) -> Optional[Tuple[int, int, Iterator[np.ndarray]]]:
+        """Decode seluruh file per chunk (frames, channels) float32 untuk analisis
+        
+        Seperti decode_mono, WAV dibaca lewat memmap di sample rate aslinya dan
+        format lain di-decode ffmpeg ke sample_rate dengan jumlah channel asli
+        (mono tetap mono). Return (rate, channels, iterator chunk).
+        """
+        source = file_path
+        if Path(file_path).suffix.lower() in {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v', '.webm'}:
+            source = get_extraction_cache().lookup(file_path) or file_path
+        
+        info = AudioAnalyzer.read_wav_info(source) if source.lower().endswith('.wav') else None
+        if (info is not None and info.format_tag in (1, 3) and info.block_align > 0
+                and info.n_frames > 0 and AudioAnalyzer.decode_pcm(b"", info) is not None):
+            def wav_chunks():
+                n_frames = min(info.n_frames, int(max_seconds * info.sample_rate))
+                data = np.memmap(source, dtype=np.uint8, mode='r',
+                                 offset=info.data_offset, shape=(info.n_frames * info.block_align,))
+                try:
+                    for chunk_start in range(0, n_frames, WAV_CHUNK_FRAMES):
+                        chunk_end = min(chunk_start + WAV_CHUNK_FRAMES, n_frames)
+                        yield AudioAnalyzer.decode_pcm(
+                            data[chunk_start * info.block_align:chunk_end * info.block_align], info)
+                finally:
+                    del data
+            return info.sample_rate, max(info.channels, 1), wav_chunks()
+        
+        audio_format = AudioAnalyzer.probe_audio_format(file_path)
+        if audio_format is None:
+            return None
+        channels = audio_format[1]
+        
+        def ffmpeg_chunks():
+            args = ["-i", file_path, "-t", f"{max_seconds:.3f}", "-map", "0:a:0", "-vn", "-sn", "-dn",
+                    "-ac", str(channels), "-ar", str(sample_rate), "-f", "f32le", "pipe:1"]
+            frame_bytes = 4 * channels
+            chunk_bytes = WAV_CHUNK_FRAMES * frame_bytes
+            proc = popen_ffmpeg(args, stdout=subprocess.PIPE, bufsize=chunk_bytes)
+            try:
+                while True:
+                    raw = proc.stdout.read(chunk_bytes)
+                    usable = len(raw) - len(raw) % frame_bytes
+                    if usable == 0:
+                        return
+                    yield np.frombuffer(raw[:usable], dtype='<f4').reshape(-1, channels)
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                proc.stdout.close()
+                proc.wait()
+        return sample_rate, channels, ffmpeg_chunks()
+    
+    @staticmethod
+    def generate_waveform_range(file_path: str, start: float, end: float, num_buckets: int,
+                                cancel_token: Optional['CancelToken'] = None) -> Optional[WaveformPeaks]:
+        """Decode hanya range waktu [start, end) detik untuk detail saat zoom"""
+        if end <= start:
+            return None
+        try:
+            wav_info = AudioAnalyzer.read_wav_info(file_path) if file_path.lower().endswith('.wav') else None
+            if wav_info is not None and wav_info.format_tag in (1, 3):
+                peaks = AudioAnalyzer._read_wav_file(file_path, num_buckets, cancel_token=cancel_token,
+                                                     start=start, end=end)
+                return None if peaks is None or peaks.synthetic else peaks
+            
+            if not get_ffmpeg_exe():
+                return None
+            
+            args = ["-ss", f"{start:.4f}", "-t", f"{end - start:.4f}", "-i", file_path,
+                    "-map", "0:a:0", "-vn", "-sn", "-dn"]
+            accumulator = PeakAccumulator(int((end - start) * DETAIL_SAMPLE_RATE), num_buckets)
+            if not AudioAnalyzer._feed_ffmpeg_pipe(args, DETAIL_SAMPLE_RATE, 2, accumulator,
+                                                   cancel_token=cancel_token):
+                return None
+            return accumulator.finish(trim=False)
+        except Exception as e:
+            print(f"Error generating waveform range: {e}")
+            return None
+    
+    @staticmethod
+    def read_wav_info(file_path: str) -> Optional[WavInfo]:
+        """Parse header RIFF/WAVE (PCM, IEEE float, dan WAVE_FORMAT_EXTENSIBLE)"""
+        try:
+            file_size = os.path.getsize(file_path)
+            with open(file_path, 'rb') as f:
+                riff = f.read(12)
+                if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+                    return None
+                
+                fmt = None
+                while True:
+                    header = f.read(8)
+                    if len(header) < 8:
+                        return None
+                    chunk_id, chunk_size = struct.unpack('<4sI', header)
+                    
+                    if chunk_id == b'fmt ':
+                        body = f.read(chunk_size)
+                        format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', body[:16])
+                        if format_tag == 0xFFFE and len(body) >= 26:
+                            # WAVE_FORMAT_EXTENSIBLE: format asli ada di awal SubFormat GUID
+                            format_tag = struct.unpack('<H', body[24:26])[0]
+                        fmt = (format_tag, channels, sample_rate, bits)
+                    elif chunk_id == b'data':
+                        if fmt is None:
+                            return None
+                        data_offset = f.tell()
+                        # Header dari stream/recorder kadang tidak menulis size yang benar
+                        available = file_size - data_offset
+                        if chunk_size == 0 or chunk_size > available:
+                            chunk_size = available
+                        return WavInfo(fmt[0], fmt[1], fmt[2], fmt[3], data_offset, chunk_size)
+                    else:
+                        f.seek(chunk_size, os.SEEK_CUR)
+                    
+                    # Chunk di-pad ke ukuran genap
+                    if chunk_size % 2 and chunk_id != b'data':
+                        f.seek(1, os.SEEK_CUR)
+        except Exception as e:
+            print(f"Error reading WAV header: {e}")
+            return None
+    
+    @staticmethod
+    def decode_pcm(raw: bytes, info: WavInfo) -> Optional[np.ndarray]:
+        """Decode raw PCM bytes ke float32 array dengan shape (frames, channels)"""
+        bits = info.bits_per_sample
+        usable = len(raw) - len(raw) % max(info.block_align, 1)
+        raw = raw[:usable]
+        
+        if info.format_tag == 3:
+            if bits == 32:
+                data = np.frombuffer(raw, dtype='<f4')
+            elif bits == 64:
+                data = np.frombuffer(raw, dtype='<f8').astype(np.float32)
+            else:
+                return None
+        elif info.format_tag == 1:
+            if bits == 8:
+                data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+            elif bits == 16:
+                data = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+            elif bits == 24:
+                b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+                ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+                ints = (ints ^ 0x800000) - 0x800000  # sign extend 24-bit
+                data = ints.astype(np.float32) / 8388608.0
+            elif bits == 32:
+                data = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+            else:
+                return None
+        else:
+            return None
+        
+        return data.reshape(-1, max(info.channels, 1))
+    
+    @staticmethod
+    def _read_wav_file(file_path: str, num_points: int,
+                       progress_callback: Optional[Callable[[WaveformPeaks, float], None]] = None,
+                       cancel_token: Optional['CancelToken'] = None,
+                       start: float = 0.0, end: Optional[float] = None) -> Optional[WaveformPeaks]:
+        """Read WAV file lewat np.memmap per chunk dan hitung peaks
+        
+        Hanya satu chunk (WAV_CHUNK_FRAMES frames) yang di-decode sekaligus,
+        jadi memory tetap kecil walaupun file berukuran beberapa GB.
+        start/end (detik) membatasi range yang dibaca.
+        """
+        try:
+            info = AudioAnalyzer.read_wav_info(file_path)
+            if info is None or info.n_frames == 0 or info.block_align == 0:
+                return AudioAnalyzer._generate_dummy_waveform(num_points)
+            
+            n_frames = info.n_frames
+            first_frame = min(max(int(start * info.sample_rate), 0), n_frames)
+            last_frame = n_frames if end is None else min(int(end * info.sample_rate), n_frames)
+            if last_frame <= first_frame:
+                return AudioAnalyzer._generate_dummy_waveform(num_points)
+            
+            accumulator = PeakAccumulator(last_frame - first_frame, num_points)
+            data = np.memmap(file_path, dtype=np.uint8, mode='r',
+                             offset=info.data_offset, shape=(n_frames * info.block_align,))
+            try:
+                for chunk_start in range(first_frame, last_frame, WAV_CHUNK_FRAMES):
+                    if cancel_token is not None and cancel_token.is_cancelled():
+                        return None
+                    
+                    chunk_end = min(chunk_start + WAV_CHUNK_FRAMES, last_frame)
+                    samples = AudioAnalyzer.decode_pcm(
+                        data[chunk_start * info.block_align:chunk_end * info.block_align], info)
+                    if samples is None:
+                        print(f"Unsupported WAV format: tag={info.format_tag}, bits={info.bits_per_sample}")
+                        return AudioAnalyzer._generate_dummy_waveform(num_points)
+                    
+                    accumulator.feed(samples)
+                    if progress_callback is not None:
+                        progress_callback(accumulator.peaks, accumulator.progress)
+            finally:
+                # Tutup mapping supaya file tidak terkunci (Windows)
+                del data
+            
+            peaks = accumulator.finish()
+            return peaks if peaks is not None else AudioAnalyzer._generate_dummy_waveform(num_points)
+                    
+        except Exception as e:
+            print(f"Error reading WAV file: {e}")
+            return AudioAnalyzer._generate_dummy_waveform(num_points)
+    
+    @staticmethod
+    def _generate_simplified_waveform(file_path: str, num_points: int) -> WaveformPeaks:
+        """Generate simplified waveform untuk non-WAV files"""
+        try:
+            duration = AudioAnalyzer.get_audio_duration(file_path)
+            
+            x = np.arange(num_points) / num_points
+            t = x * 20
+            y = (np.sin(t * np.pi * 2) * 0.5 + 
+                 np.sin(t * np.pi * 4) * 0.3 + 
+                 np.sin(t * np.pi * 8) * 0.2)
+            y += np.random.uniform(-0.1, 0.1, num_points)
+            return WaveformPeaks.from_amplitudes(y)
+        except:
+            return AudioAnalyzer._generate_dummy_waveform(num_points)
+    
+    @staticmethod
+    def _generate_dummy_waveform(num_points: int) -> WaveformPeaks:
+        """Generate dummy waveform data sebagai fallback"""
+        x = np.arange(num_points) / num_points
+        y = np.sin(x * np.pi * 8) * 0.7 + np.random.uniform(-0.1, 0.1, num_points)
+        return WaveformPeaks.from_amplitudes(y)
+
+
+# ============================================================================
+# WAVEFORM PEAK CACHE
+# ============================================================================
+
+# Resolusi level 0 dari peak pyramid yang disimpan di cache
+PYRAMID_BASE_BUCKETS = 16384
+PEAK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PEAK_CACHE_MEMORY_BYTES = 32 * 1024 * 1024
+
+
+def get_cache_dir(name: str) -> Path:
+    """Folder cache per fitur yang tetap ada setelah aplikasi di-restart"""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    cache_dir = base / "AudioEverythingPro" / name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def evict_cache_dir(cache_dir: Path, suffix: str, max_bytes: int,
+                    keep: Optional[str] = None) -> Optional[int]:
+    """Hapus file cache yang paling lama tidak dipakai (mtime) sampai total
+    di bawah max_bytes. Return total ukuran yang tersisa, None jika gagal scan"""
+    try:
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if entry.is_file() and entry.name.endswith(suffix):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError as e:
+        print(f"Error scanning cache {cache_dir}: {e}")
+        return None
+    
+    total = sum(size for _, size, _ in entries)
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if keep is not None and os.path.basename(path) == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+def file_cache_key(file_path: str) -> Optional[str]:
+    """Cache key dari path + size + mtime; berubah jika file diubah"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    identity = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(identity.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class PeakPyramid:
+    """Mip-map dari WaveformPeaks: level 0 resolusi penuh, setiap level
+    berikutnya berisi setengah jumlah bucket (min of mins, max of maxs)"""
+    
+    MIN_LEVEL_BUCKETS = 64
+    
+    def __init__(self, levels: List[WaveformPeaks]):
+        self.levels = levels
+    
+    @classmethod
+    def from_peaks(cls, base: WaveformPeaks) -> 'PeakPyramid':
+        levels = [base]
+        while len(levels[-1]) >= cls.MIN_LEVEL_BUCKETS * 2:
+            levels.append(cls._halve(levels[-1]))
+        return cls(levels)
+    
+    @staticmethod
+    def _halve(peaks: WaveformPeaks) -> WaveformPeaks:
+        n = len(peaks)
+        even = n - n % 2
+        mins = np.minimum(peaks.mins[0:even:2], peaks.mins[1:even:2])
+        maxs = np.maximum(peaks.maxs[0:even:2], peaks.maxs[1:even:2])
+        rms = np.sqrt((np.square(peaks.rms[0:even:2]) + np.square(peaks.rms[1:even:2])) / 2)
+        if n % 2:
+            mins = np.append(mins, peaks.mins[-1])
+            maxs = np.append(maxs, peaks.maxs[-1])
+            rms = np.append(rms, peaks.rms[-1])
+        # Pasangan bucket hanya lengkap jika keduanya sudah terisi
+        filled = (peaks.filled + 1) // 2 if peaks.filled == n else peaks.filled // 2
+        return WaveformPeaks(mins, maxs, rms.astype(np.float32), filled)
+    
+    @property
+    def base(self) -> WaveformPeaks:
+        return self.levels[0]
+    
+    def level_for_width(self, width: int) -> WaveformPeaks:
+        """Level paling kecil yang masih punya >= width bucket"""
+        ratio = len(self.base) / max(int(width), 1)
+        index = int(np.floor(np.log2(ratio))) if ratio > 1 else 0
+        return self.levels[min(index, len(self.levels) - 1)]
+    
+    def nbytes(self) -> int:
+        return sum(l.mins.nbytes + l.maxs.nbytes + l.rms.nbytes for l in self.levels)
+    
+    # ---- Binary format ---------------------------------------------------
+    # Header: magic, version, level count, filled (level 0), scale
+    # Lalu panjang tiap level (uint32), lalu per level: mins int8, maxs int8, rms uint8.
+    # Nilai dikuantisasi relatif ke scale (absolute peak file).
+    
+    MAGIC = b'AXPK'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHIf')
+    
+    def to_bytes(self) -> bytes:
+        scale = max(self.base.peak(), 1e-9)
+        parts = [self.HEADER.pack(self.MAGIC, self.VERSION, len(self.levels), self.base.filled, scale),
+                 np.array([len(l) for l in self.levels], dtype='<u4').tobytes()]
+        for level in self.levels:
+            n = level.filled
+            for values, dtype, factor in ((level.mins, np.int8, 127), (level.maxs, np.int8, 127),
+                                          (level.rms, np.uint8, 255)):
+                q = np.zeros(len(level), dtype=dtype)
+                q[:n] = np.round(np.clip(values[:n] / scale, -1.0, 1.0) * factor)
+                parts.append(q.tobytes())
+        return b''.join(parts)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional['PeakPyramid']:
+        if len(data) < cls.HEADER.size:
+            return None
+        magic, version, n_levels, filled, scale = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            return None
+        
+        offset = cls.HEADER.size
+        lengths = np.frombuffer(data, dtype='<u4', count=n_levels, offset=offset)
+        offset += 4 * n_levels
+        
+        levels = []
+        for n in lengths:
+            n = int(n)
+            mins = np.frombuffer(data, np.int8, n, offset).astype(np.float32) * (scale / 127)
+            maxs = np.frombuffer(data, np.int8, n, offset + n).astype(np.float32) * (scale / 127)
+            rms = np.frombuffer(data, np.uint8, n, offset + 2 * n).astype(np.float32) * (scale / 255)
+            offset += 3 * n
+            levels.append(WaveformPeaks(mins, maxs, rms, min(filled, n)))
+            filled = (filled + 1) // 2 if filled == n else filled // 2
+        return cls(levels)
+
+
+class PeakCache:
+    """Cache peak pyramid di disk (LRU, dibatasi ukuran) plus LRU kecil di memory
+    
+    Key dari path + size + mtime, jadi file yang berubah otomatis miss.
+    """
+    
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 max_bytes: int = PEAK_CACHE_MAX_BYTES,
+                 memory_bytes: int = PEAK_CACHE_MEMORY_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir("peaks")
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.hits = 0
+        self.misses = 0
+        
+        self._memory = OrderedDict()  # key -> PeakPyramid
+        self._memory_used = 0
+        self._disk_used = None        # dihitung saat pertama dibutuhkan
+        self._lock = threading.Lock()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pk"
+    
+    def get(self, file_path: str) -> Optional[PeakPyramid]:
+        """Ambil pyramid dari cache, None jika belum ada"""
+        key = file_cache_key(file_path)
+        if key is None:
+            return None
+        
+        with self._lock:
+            pyramid = self._memory.get(key)
+            if pyramid is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return pyramid
+        
+        entry = self._entry_path(key)
+        try:
+            pyramid = PeakPyramid.from_bytes(entry.read_bytes())
+            # Update mtime sebagai penanda "last used" untuk eviction
+            os.utime(entry)
+        except OSError:
+            pyramid = None
+        except Exception as e:
+            print(f"Corrupt peak cache entry {entry.name}: {e}")
+            pyramid = None
+        
+        with self._lock:
+            if pyramid is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, pyramid)
+        return pyramid
+    
+    def put(self, file_path: str, pyramid: PeakPyramid):
+        """Simpan pyramid ke memory dan disk"""
+        key = file_cache_key(file_path)
+        if key is None:
+            return
+        
+        entry = self._entry_path(key)
+        data = pyramid.to_bytes()
+        try:
+            tmp_path = entry.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, entry)
+        except OSError as e:
+            print(f"Error writing peak cache: {e}")
+            return
+        
+        with self._lock:
+            self._remember(key, pyramid)
+            if self._disk_used is not None:
+                self._disk_used += len(data)
+            need_evict = self._disk_used is None or self._disk_used > self.max_bytes
+        
+        if need_evict:
+            self._evict()
+    
+    def _remember(self, key: str, pyramid: PeakPyramid):
+        """Masukkan ke memory LRU (lock harus sudah dipegang)"""
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= old.nbytes()
+        self._memory[key] = pyramid
+        self._memory_used += pyramid.nbytes()
+        while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= evicted.nbytes()
+    
+    def _evict(self):
+        """Hapus entry yang paling lama tidak dipakai sampai di bawah max_bytes"""
+        total = evict_cache_dir(self.cache_dir, ".pk", self.max_bytes)
+        if total is None:
+            return
+        with self._lock:
+            self._disk_used = total
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "disk_bytes": self._disk_used,
+            }
+
+
+# ============================================================================
+# EXTRACTED AUDIO CACHE
+# ============================================================================
+
+EXTRACTION_CACHE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# Streaming extraction: ukuran chunk yang ditulis dan audio minimum sebelum playback
+STREAM_CHUNK_BYTES = 64 * 1024
+STREAM_START_SECONDS = 0.5
+STREAM_READ_WAIT = 0.05
+
+
+class StreamingExtraction:
+    """Extract audio video ke WAV 16-bit lewat ffmpeg (-vn) di background thread
+    
+    Data ditulis ke file partial per chunk, jadi pembaca (GrowingWavDevice)
+    bisa mulai sebelum extraction selesai. Header ditulis dengan data size 0
+    dan di-patch setelah selesai, lalu file dipindah ke final_path.
+    """
+    
+    def __init__(self, video_path: str, partial_path: Optional[Path] = None,
+                 final_path: Optional[Path] = None):
+        self.video_path = video_path
+        self.partial_path = partial_path
+        self.final_path = None          # diisi setelah extraction selesai
+        self.target_path = final_path
+        self.sample_rate = 0
+        self.channels = 0
+        self.expected_bytes = 0         # estimasi data size dari durasi
+        self.bytes_written = 0
+        self.failed = False
+        self.cancel_token = CancelToken()
+        
+        self._listeners = []
+        self._done = threading.Event()
+        self._cond = threading.Condition()
+    
+    @classmethod
+    def completed(cls, video_path: str, audio_path: str) -> 'StreamingExtraction':
+        """Extraction yang sudah ada di cache"""
+        stream = cls(video_path)
+        info = AudioAnalyzer.read_wav_info(audio_path)
+        if info is not None:
+            stream.sample_rate, stream.channels = info.sample_rate, info.channels
+            stream.bytes_written = stream.expected_bytes = info.data_size
+        stream.final_path = audio_path
+        stream._done.set()
+        return stream
+    
+    # ---- Status ---------------------------------------------------------
+    
+    def is_complete(self) -> bool:
+        return self._done.is_set() and self.final_path is not None
+    
+    def is_done(self) -> bool:
+        return self._done.is_set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+    
+    def current_path(self) -> Optional[str]:
+        if self.final_path is not None:
+            return self.final_path
+        return str(self.partial_path) if self.partial_path is not None else None
+    
+    def available_bytes(self) -> int:
+        """Jumlah byte file (header + data) yang sudah bisa dibaca"""
+        return WAV_HEADER_SIZE + self.bytes_written
+    
+    def wait_for(self, file_bytes: int, timeout: float) -> int:
+        """Tunggu sampai file berisi >= file_bytes atau extraction selesai"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.available_bytes() < file_bytes and not self._done.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return self.available_bytes()
+    
+    def header_bytes(self) -> bytes:
+        """Header yang dilihat pembaca: size sebenarnya jika sudah selesai,
+        estimasi dari durasi selama extraction masih berjalan"""
+        data_size = self.bytes_written if self._done.is_set() else max(self.expected_bytes, self.bytes_written)
+        return build_wav_header(self.sample_rate or 44100, self.channels or 2, 16, data_size)
+    
+    def add_listener(self, callback: Callable[[], None]):
+        """callback() dipanggil dari extraction thread setiap ada data baru"""
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[], None]):
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+    
+    def _notify(self):
+        with self._cond:
+            self._cond.notify_all()
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception:
+                pass
+    
+    # ---- Extraction -----------------------------------------------------
+    
+    def run(self) -> bool:
+        """Jalankan ffmpeg dan tulis output ke file partial (blocking)"""
+        try:
+            audio_format = AudioAnalyzer.probe_audio_format(self.video_path)
+            if audio_format is None:
+                print(f"✗ No audio stream found in {Path(self.video_path).name}")
+                return False
+            self.sample_rate, self.channels = audio_format
+            duration = AudioAnalyzer.probe_duration(self.video_path)
+            frame_bytes = 2 * self.channels
+            if duration > 0:
+                # Sedikit lebih panjang; pembaca berhenti di akhir data sebenarnya
+                self.expected_bytes = int((duration + 1.0) * self.sample_rate) * frame_bytes
+            else:
+                self.expected_bytes = 0xFFFFFFFF - 36
+            
+            args = ["-i", self.video_path, "-map", "0:a:0", "-vn", "-sn", "-dn",
+                    "-ac", str(self.channels), "-ar", str(self.sample_rate),
+                    "-f", "s16le", "pipe:1"]
+            proc = popen_ffmpeg(args, stdout=subprocess.PIPE, bufsize=STREAM_CHUNK_BYTES)
+            try:
+                with open(self.partial_path, 'wb') as f:
+                    f.write(build_wav_header(self.sample_rate, self.channels, 16, 0))
+                    while not self.cancel_token.is_cancelled():
+                        raw = proc.stdout.read1(STREAM_CHUNK_BYTES)
+                        if not raw:
+                            break
+                        f.write(raw)
+                        f.flush()
+                        with self._cond:
+                            self.bytes_written += len(raw)
+                        self._notify()
+                    
+                    if self.cancel_token.is_cancelled():
+                        return False
+                    proc.wait()
+                    if proc.returncode != 0 or self.bytes_written == 0:
+                        print(f"✗ ffmpeg audio extraction failed ({proc.returncode})")
+                        return False
+                    
+                    # Data size yang benar setelah semua chunk tertulis
+                    f.seek(0)
+                    f.write(build_wav_header(self.sample_rate, self.channels, 16, self.bytes_written))
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                proc.stdout.close()
+                proc.wait()
+            return True
+        except Exception as e:
+            print(f"✗ Error extracting audio with ffmpeg: {e}")
+            return False
+    
+    def _finish(self, final_path: Optional[str]):
+        """Tandai selesai (final_path None jika gagal/dibatalkan)"""
+        with self._cond:
+            self.final_path = final_path
+            self.failed = final_path is None
+            self._done.set()
+        self._notify()
+
+
+class GrowingWavDevice(QIODevice):
+    """QIODevice read-only di atas StreamingExtraction untuk QMediaPlayer
+    
+    Header memakai estimasi data size selama extraction berjalan. Read yang
+    melewati data yang sudah ada menunggu sebentar lalu return kosong;
+    readyRead di-emit setiap ada chunk baru. File dibuka per read supaya
+    tidak menahan rename file partial ke cache (Windows).
+    """
+    
+    def __init__(self, stream: StreamingExtraction, parent=None):
+        super().__init__(parent)
+        self.stream = stream
+        self.stream.add_listener(self._on_data)
+    
+    def _on_data(self):
+        # Dipanggil dari extraction thread; emit di-queue ke thread device
+        self.readyRead.emit()
+    
+    def close(self):
+        self.stream.remove_listener(self._on_data)
+        super().close()
+    
+    def isSequential(self) -> bool:
+        return False
+    
+    def size(self) -> int:
+        if self.stream.is_done():
+            return self.stream.available_bytes()
+        return WAV_HEADER_SIZE + max(self.stream.expected_bytes, self.stream.bytes_written)
+    
+    def bytesAvailable(self) -> int:
+        return max(self.stream.available_bytes() - self.pos(), 0) + super().bytesAvailable()
+    
+    def atEnd(self) -> bool:
+        return self.stream.is_done() and self.pos() >= self.stream.available_bytes()
+    
+    def readData(self, maxlen: int) -> bytes:
+        pos = self.pos()
+        out = b''
+        if pos < WAV_HEADER_SIZE:
+            out = self.stream.header_bytes()[pos:pos + maxlen]
+            pos += len(out)
+            maxlen -= len(out)
+        if maxlen <= 0:
+            return out
+        
+        available = self.stream.wait_for(pos + 1, STREAM_READ_WAIT)
+        count = min(maxlen, available - pos)
+        if count <= 0:
+            return out
+        
+        for _ in range(2):
+            path = self.stream.current_path()
+            try:
+                with open(path, 'rb') as f:
+                    f.seek(pos)
+                    return out + f.read(count)
+            except OSError:
+                # File partial baru saja dipindah ke cache; coba path baru
+                continue
+        return out
+    
+    def writeData(self, data: bytes) -> int:
+        return -1
+
+
+class ExtractionCache:
+    """Cache audio hasil extract dari video, dipakai bersama oleh player dan waveform
+    
+    File disimpan sebagai <key>.wav dengan key dari path + size + mtime, jadi
+    tetap valid setelah restart dan otomatis miss jika video diubah. Request
+    bersamaan untuk file yang sama menunggu satu extraction saja.
+    """
+    
+    SUFFIX = ".wav"
+    
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 max_bytes: int = EXTRACTION_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir("extracted")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        
+        self._inflight = {}  # key -> threading.Event
+        self._lock = threading.Lock()
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+    
+    def lookup(self, video_path: str) -> Optional[str]:
+        """Path audio yang sudah di-extract, tanpa memulai extraction baru"""
+        key = file_cache_key(video_path)
+        if key is None:
+            return None
+        entry = self._entry_path(key)
+        try:
+            os.utime(entry)
+        except OSError:
+            return None
+        return str(entry)
+    
+    def start_stream(self, video_path: str) -> Optional[StreamingExtraction]:
+        """Mulai (atau ikut) extraction ffmpeg di background, return tanpa menunggu
+        
+        Jika audio sudah ada di cache, return extraction yang sudah selesai.
+        """
+        key = file_cache_key(video_path)
+        if key is None or not get_ffmpeg_exe():
+            return None
+        
+        cached = self.lookup(video_path)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return StreamingExtraction.completed(video_path, cached)
+        
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                partial_dir = self.cache_dir / "partial"
+                partial_dir.mkdir(exist_ok=True)
+                pending = StreamingExtraction(video_path,
+                                              partial_dir / f"{key}.{os.getpid()}{self.SUFFIX}",
+                                              self._entry_path(key))
+                self._inflight[key] = pending
+                self.misses += 1
+                started = True
+            else:
+                started = False
+        
+        if isinstance(pending, StreamingExtraction):
+            if started:
+                threading.Thread(target=self._run_stream, args=(key, pending),
+                                 name="audio-extract", daemon=True).start()
+            return pending
+        
+        # Extraction MoviePy untuk file ini sedang berjalan
+        pending.wait()
+        cached = self.lookup(video_path)
+        return StreamingExtraction.completed(video_path, cached) if cached else None
+    
+    def _run_stream(self, key: str, stream: StreamingExtraction):
+        final_path = None
+        try:
+            if stream.run():
+                entry = stream.target_path
+                for attempt in range(20):
+                    try:
+                        os.replace(stream.partial_path, entry)
+                        final_path = str(entry)
+                        break
+                    except PermissionError:
+                        # Windows: pembaca sedang membuka file partial
+                        time.sleep(0.05)
+                if final_path is not None:
+                    print(f"✓ Cached extracted audio: {entry.name}")
+        except OSError as e:
+            print(f"✗ Error caching extracted audio: {e}")
+        finally:
+            if final_path is None:
+                try:
+                    os.remove(stream.partial_path)
+                except OSError:
+                    pass
+            with self._lock:
+                self._inflight.pop(key, None)
+            stream._finish(final_path)
+        
+        if final_path is not None:
+            evict_cache_dir(self.cache_dir, self.SUFFIX, self.max_bytes, keep=Path(final_path).name)
+    
+    def cancel_all(self):
+        """Batalkan semua streaming extraction yang sedang berjalan"""
+        with self._lock:
+            pending = list(self._inflight.values())
+        for stream in pending:
+            if isinstance(stream, StreamingExtraction):
+                stream.cancel_token.cancel()
+    
+    def get_or_extract(self, video_path: str,
+                       extractor: Optional[Callable[[str, str], Optional[str]]] = None) -> Optional[str]:
+        """Return path audio ter-extract, extract dulu jika belum ada di cache
+        
+        extractor(video_path, output_path) menulis audio ke output_path.
+        Default-nya streaming ffmpeg, atau MoviePy jika ffmpeg tidak ada.
+        """
+        if extractor is None and get_ffmpeg_exe():
+            stream = self.start_stream(video_path)
+            if stream is None:
+                return None
+            stream.wait()
+            return stream.final_path
+        
+        key = file_cache_key(video_path)
+        if key is None:
+            return None
+        
+        while True:
+            cached = self.lookup(video_path)
+            if cached is not None:
+                with self._lock:
+                    self.hits += 1
+                return cached
+            
+            with self._lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = threading.Event()
+                    self._inflight[key] = pending
+                    self.misses += 1
+                    break
+            # Thread lain sedang extract file yang sama; tunggu hasilnya
+            pending.wait()
+            with self._lock:
+                if key not in self._inflight and self.lookup(video_path) is None:
+                    # Extraction thread lain gagal, jangan diulang di sini
+                    return None
+        
+        try:
+            return self._extract(key, video_path, extractor)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set()
+    
+    def _extract(self, key: str, video_path: str,
+                 extractor: Optional[Callable[[str, str], Optional[str]]]) -> Optional[str]:
+        entry = self._entry_path(key)
+        # File sementara di subfolder supaya tidak ikut di-scan eviction;
+        # suffix .wav tetap di akhir supaya extractor memilih format yang benar
+        partial_dir = self.cache_dir / "partial"
+        partial_dir.mkdir(exist_ok=True)
+        tmp_audio = str(partial_dir / f"{key}.{threading.get_ident()}{self.SUFFIX}")
+        extractor = extractor or AudioAnalyzer.extract_audio_from_video
+        try:
+            result = extractor(video_path, tmp_audio)
+            if not result or not os.path.exists(tmp_audio):
+                return None
+            os.replace(tmp_audio, entry)
+        except Exception as e:
+            print(f"✗ Error caching extracted audio: {e}")
+            return None
+        finally:
+            try:
+                os.remove(tmp_audio)
+            except OSError:
+                pass
+        
+        evict_cache_dir(self.cache_dir, self.SUFFIX, self.max_bytes, keep=entry.name)
+        print(f"✓ Cached extracted audio: {entry.name}")
+        return str(entry)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "in_flight": len(self._inflight),
+            }
+
+
+_EXTRACTION_CACHE: Optional[ExtractionCache] = None
+_EXTRACTION_CACHE_LOCK = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Instance ExtractionCache yang dipakai bersama di seluruh aplikasi"""
+    global _EXTRACTION_CACHE
+    with _EXTRACTION_CACHE_LOCK:
+        if _EXTRACTION_CACHE is None:
+            _EXTRACTION_CACHE = ExtractionCache()
+        return _EXTRACTION_CACHE
+
+
+# ============================================================================
+# BACKGROUND TASK SCHEDULER
+# ============================================================================
+
+# Priority class (angka kecil = lebih dulu)
+TASK_INTERACTIVE = 0    # waveform file yang sedang dipilih/di-zoom
+TASK_PREFETCH = 1       # warm row tetangga, preview proxy
+TASK_INDEXING = 2       # scan folder, export dan batch extraction
+TASK_ANALYSIS = 3       # silence/loudness/fingerprint (slot process AnalysisScheduler)
+TASK_PRIORITY_NAMES = ("interactive", "prefetch", "indexing", "analysis")
+
+# Task bersamaan per resource
+TASK_RESOURCE_LIMITS = {
+    "cpu": max(2, os.cpu_count() or 1),
+    "disk": 3,
+    "proxy": 1,         # satu encode proxy sekaligus supaya tidak mengganggu playback
+}
+# Slot yang hanya boleh dipakai task interactive, supaya audition tetap
+# responsif walaupun scan/analisis besar sedang berjalan
+TASK_INTERACTIVE_RESERVE = {"cpu": 1}
+TASK_THROUGHPUT_WINDOW = 10.0
+# Interval AnalysisScheduler mencoba lagi saat slot sedang dipakai task lain
+TASK_THROTTLE_WAIT = 0.25
+
+
+@dataclass
+class ScheduledTask:
+    """Satu task di antrian TaskScheduler"""
+    seq: int
+    func: Callable[[], Any]
+    priority: int
+    resource: str
+    label: str
+    token: CancelToken
+
+
+class TaskScheduler:
+    """Satu thread pool untuk semua background task aplikasi
+    
+    Task dipilih berdasarkan priority class lalu urutan submit (FIFO), dan
+    hanya dijalankan jika resource-nya masih punya slot. Task non-interactive
+    tidak boleh memakai slot cadangan (TASK_INTERACTIVE_RESERVE) dan tidak
+    mendahului task ber-priority lebih tinggi yang menunggu resource yang
+    sama. Task di antrian yang token-nya dibatalkan dibuang tanpa dijalankan;
+    task yang sedang berjalan harus memeriksa token-nya sendiri.
+    
+    Pekerjaan di luar thread pool (mis. process AnalysisScheduler) memakai
+    try_acquire()/release() supaya tetap dihitung dalam batas yang sama.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, int]] = None,
+                 reserve: Optional[Dict[str, int]] = None, max_threads: Optional[int] = None):
+        self.limits = dict(limits or TASK_RESOURCE_LIMITS)
+        self.reserve = dict(TASK_INTERACTIVE_RESERVE if reserve is None else reserve)
+        self.max_threads = max_threads or sum(self.limits.values())
+        self._cond = threading.Condition()
+        self._queues: Dict[Tuple[int, str], deque] = {}
+        self._usage: Dict[str, int] = {}
+        self._backlog = [0] * len(TASK_PRIORITY_NAMES)
+        self._running = [0] * len(TASK_PRIORITY_NAMES)
+        self._done = [0] * len(TASK_PRIORITY_NAMES)
+        self._failed = [0] * len(TASK_PRIORITY_NAMES)
+        self._cancelled = [0] * len(TASK_PRIORITY_NAMES)
+        self._recent = deque()    # (waktu selesai, priority) untuk throughput
+        self._threads = []
+        self._busy = 0         # thread yang sedang menjalankan task
+        self._seq = 0
+        self._shutdown = False
+    
+    def submit(self, func: Callable[[], Any], priority: int, resource: str = "cpu",
+               label: str = "", token: Optional[CancelToken] = None) -> CancelToken:
+        """Antrikan func(); return token untuk membatalkannya selama masih di antrian"""
+        token = token or CancelToken()
+        with self._cond:
+            if self._shutdown:
+                token.cancel()
+                return token
+            self._seq += 1
+            task = ScheduledTask(self._seq, func, priority, resource,
+                                 label or getattr(func, "__name__", ""), token)
+            self._queues.setdefault((priority, resource), deque()).append(task)
+            # Thread baru hanya jika thread idle tidak cukup untuk task di antrian
+            queued = sum(len(queue) for queue in self._queues.values())
+            if len(self._threads) - self._busy < queued and len(self._threads) < self.max_threads:
+                thread = threading.Thread(target=self._worker, name=f"task-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify_all()
+        return token
+    
+    def try_acquire(self, priority: int, resource: str) -> bool:
+        """Ambil satu slot resource untuk pekerjaan di luar thread pool"""
+        with self._cond:
+            if self._shutdown or not self._has_slot(priority, resource):
+                return False
+            self._usage[resource] = self._usage.get(resource, 0) + 1
+            self._running[priority] += 1
+            return True
+    
+    def has_capacity(self, priority: int, resource: str) -> bool:
+        with self._cond:
+            return not self._shutdown and self._has_slot(priority, resource)
+    
+    def release(self, priority: int, resource: str, outcome: str = "done"):
+        """Kembalikan slot dari try_acquire(); outcome: done, failed atau cancelled"""
+        with self._cond:
+            self._finish(priority, resource, outcome)
+    
+    def set_backlog(self, priority: int, count: int):
+        """Jumlah pekerjaan yang menunggu di luar antrian ini (ditampilkan di TaskPanel)"""
+        with self._cond:
+            self._backlog[priority] = max(0, count)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot antrian, task berjalan dan throughput per priority class"""
+        with self._cond:
+            self._trim_recent()
+            recent = [0] * len(TASK_PRIORITY_NAMES)
+            for _, priority in self._recent:
+                recent[priority] += 1
+            queued = list(self._backlog)
+            for (priority, _), queue in self._queues.items():
+                queued[priority] += sum(1 for task in queue if not task.token.is_cancelled())
+            classes = [{
+                "name": name,
+                "queued": queued[priority],
+                "running": self._running[priority],
+                "done": self._done[priority],
+                "failed": self._failed[priority],
+                "cancelled": self._cancelled[priority],
+                "throughput": recent[priority] / TASK_THROUGHPUT_WINDOW,
+            } for priority, name in enumerate(TASK_PRIORITY_NAMES)]
+            resources = {resource: (self._usage.get(resource, 0), limit)
+                         for resource, limit in self.limits.items()}
+            return {"classes": classes, "resources": resources, "threads": len(self._threads)}
+    
+    def shutdown(self, timeout: float = 2.0):
+        """Buang task di antrian dan tunggu task yang sedang berjalan"""
+        with self._cond:
+            self._shutdown = True
+            for (priority, _), queue in self._queues.items():
+                for task in queue:
+                    task.token.cancel()
+                self._cancelled[priority] += len(queue)
+                queue.clear()
+            self._cond.notify_all()
+            threads = list(self._threads)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+    
+    def _has_slot(self, priority: int, resource: str) -> bool:
+        limit = self.limits.get(resource, self.max_threads)
+        if priority != TASK_INTERACTIVE:
+            limit -= self.reserve.get(resource, 0)
+            # Jangan mendahului task lebih penting yang menunggu resource yang sama
+            for (other, other_resource), queue in self._queues.items():
+                if other < priority and other_resource == resource and queue:
+                    return False
+        return self._usage.get(resource, 0) < limit
+    
+    def _pick(self) -> Optional[ScheduledTask]:
+        best = None
+        for (priority, resource), queue in self._queues.items():
+            while queue and queue[0].token.is_cancelled():
+                queue.popleft()
+                self._cancelled[priority] += 1
+            if not queue:
+                continue
+            head = queue[0]
+            if best is not None and (best.priority, best.seq) < (priority, head.seq):
+                continue
+            if self._has_slot(priority, resource):
+                best = head
+        if best is not None:
+            self._queues[(best.priority, best.resource)].popleft()
+            self._usage[best.resource] = self._usage.get(best.resource, 0) + 1
+            self._running[best.priority] += 1
+        return best
+    
+    def _finish(self, priority: int, resource: str, outcome: str):
+        self._usage[resource] = max(0, self._usage.get(resource, 0) - 1)
+        self._running[priority] = max(0, self._running[priority] - 1)
+        if outcome == "failed":
+            self._failed[priority] += 1
+        elif outcome == "cancelled":
+            self._cancelled[priority] += 1
+        else:
+            self._done[priority] += 1
+        if outcome != "cancelled":
+            self._recent.append((time.monotonic(), priority))
+            self._trim_recent()
+        self._cond.notify_all()
+    
+    def _trim_recent(self):
+        now = time.monotonic()
+        while self._recent and now - self._recent[0][0] > TASK_THROUGHPUT_WINDOW:
+            self._recent.popleft()
+    
+    def _worker(self):
+        while True:
+            with self._cond:
+                task = self._pick()
+                while task is None:
+                    if self._shutdown:
+                        return
+                    self._cond.wait()
+                    task = self._pick()
+                self._busy += 1
+            outcome = "done"
+            try:
+                task.func()
+            except Exception as e:
+                outcome = "failed"
+                print(f"Error in background task {task.label}: {e}")
+                traceback.print_exc()
+            with self._cond:
+                self._busy -= 1
+                self._finish(task.priority, task.resource, outcome)
+
+
+class TaskLanes:
+    """Jalankan func(item) untuk banyak item lewat TaskScheduler, maksimal
+    `lanes` task bersamaan
+    
+    Setiap task mengerjakan satu item lalu lane antri lagi, jadi task
+    ber-priority lebih tinggi bisa masuk di antara item.
+    """
+    
+    def __init__(self, func: Callable[[Any], None], items: List[Any], lanes: int,
+                 priority: int, resource: str, label: str):
+        self.func = func
+        self.lanes = max(1, lanes)
+        self.priority = priority
+        self.resource = resource
+        self.label = label
+        self._items = deque(items)
+        self._queued = 0
+        self._lock = threading.Lock()
+    
+    def start(self):
+        for _ in range(min(self.lanes, len(self._items))):
+            self._submit()
+    
+    def _submit(self):
+        with self._lock:
+            self._queued += 1
+        get_task_scheduler().submit(self._run, self.priority, self.resource, self.label)
+    
+    def _run(self):
+        with self._lock:
+            self._queued -= 1
+            item = self._items.popleft() if self._items else None
+        if item is None:
+            return
+        self.func(item)
+        with self._lock:
+            more = len(self._items) > self._queued
+        if more:
+            self._submit()
+
+
+_TASK_SCHEDULER: Optional[TaskScheduler] = None
+_TASK_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_task_scheduler() -> TaskScheduler:
+    """Instance TaskScheduler yang dipakai bersama di seluruh aplikasi"""
+    global _TASK_SCHEDULER
+    with _TASK_SCHEDULER_LOCK:
+        if _TASK_SCHEDULER is None:
+            _TASK_SCHEDULER = TaskScheduler()
+        return _TASK_SCHEDULER
+
+
+class TaskPanel(QDialog):
+    """Panel non-modal: antrian, task berjalan dan throughput per priority class"""
+    
+    REFRESH_MS = 500
+    
+    def __init__(self, scheduler: TaskScheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.setWindowTitle("Background Tasks")
+        self.resize(680, 260)
+        layout = QVBoxLayout(self)
+        
+        headers = ["Class", "Queued", "Running", "Done", "Failed", "Cancelled", "Throughput"]
+        self.table = QTableWidget(len(TASK_PRIORITY_NAMES), len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        for row in range(len(TASK_PRIORITY_NAMES)):
+            for col in range(len(headers)):
+                item = QTableWidgetItem("")
+                if col > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+        layout.addWidget(self.table)
+        
+        self.lbl_resources = QLabel("")
+        self.lbl_resources.setStyleSheet("color: #888;")
+        layout.addWidget(self.lbl_resources)
+        
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+    
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+    
+    def refresh(self):
+        stats = self.scheduler.stats()
+        for row, info in enumerate(stats["classes"]):
+            values = [info["name"].capitalize(), str(info["queued"]), str(info["running"]),
+                      str(info["done"]), str(info["failed"]), str(info["cancelled"]),
+                      f"{info['throughput']:.1f}/s"]
+            for col, value in enumerate(values):
+                self.table.item(row, col).setText(value)
+        resources = "  ·  ".join(f"{name}: {used}/{limit}" for name, (used, limit) in stats["resources"].items())
+        self.lbl_resources.setText(f"Slots in use — {resources}  ·  {stats['threads']} worker thread(s)")
+
+
+# ============================================================================
+# BACKGROUND WAVEFORM WORKER
+# ============================================================================
+
+class WaveformSignals(QObject):
+    """Signals untuk WaveformWorker (worker bukan QObject)"""
+    
+    partial = pyqtSignal(int, object)
+    progress = pyqtSignal(int, float)
+    finished = pyqtSignal(int, object)
+
+
+class WaveformWorker:
+    """Generate waveform data lewat TaskScheduler, bisa dibatalkan"""
+    
+    def __init__(self, job_id: int, file_path: str, peak_cache: Optional[PeakCache] = None,
+                 num_points: int = PYRAMID_BASE_BUCKETS, source_path: Optional[str] = None):
+        self.job_id = job_id
+        self.file_path = file_path
+        # File yang di-decode (mis. preview proxy); cache tetap memakai file_path
+        self.source_path = source_path or file_path
+        self.peak_cache = peak_cache
+        self.num_points = num_points
+        self.cancel_token = CancelToken()
+        self.signals = WaveformSignals()
+        
+        # Batasi frekuensi update parsial supaya UI tidak kebanjiran repaint
+        self._last_partial = 0.0
+    
+    def run(self):
+        try:
+            if self.peak_cache is not None:
+                pyramid = self.peak_cache.get(self.file_path)
+                if pyramid is not None:
+                    self.signals.finished.emit(self.job_id, pyramid)
+                    return
+            
+            progress_callback = self._on_partial
+            
+            # File compressed yang panjang: tampilkan preview cepat dulu,
+            # lalu decode penuh di belakang tanpa menimpa preview
+            if (not self.source_path.lower().endswith('.wav')
+                    and AudioAnalyzer.probe_duration(self.source_path) >= PREVIEW_MIN_DURATION):
+                preview = AudioAnalyzer.generate_waveform_data(
+                    self.source_path, self.num_points,
+                    cancel_token=self.cancel_token, preview=True
+                )
+                if preview is None:
+                    return
+                self.signals.partial.emit(self.job_id, PeakPyramid.from_peaks(preview))
+                progress_callback = self._on_progress
+            
+            data = AudioAnalyzer.generate_waveform_data(
+                self.source_path, self.num_points,
+                progress_callback=progress_callback,
+                cancel_token=self.cancel_token
+            )
+            if data is None or self.cancel_token.is_cancelled():
+                return
+            
+            pyramid = PeakPyramid.from_peaks(data)
+            # Waveform sintetis (fallback) tidak disimpan ke cache
+            if self.peak_cache is not None and not data.synthetic:
+                self.peak_cache.put(self.file_path, pyramid)
+            self.signals.finished.emit(self.job_id, pyramid)
+        except Exception as e:
+            print(f"Error in waveform worker: {e}")
+    
+    def _on_partial(self, peaks: WaveformPeaks, progress: float):
+        now = time.monotonic()
+        if now - self._last_partial >= 0.05 and not self.cancel_token.is_cancelled():
+            self._last_partial = now
+            # Copy karena worker terus mengisi array yang sama
+            self.signals.partial.emit(self.job_id, PeakPyramid.from_peaks(peaks.copy()))
+            self.signals.progress.emit(self.job_id, progress)
+    
+    def _on_progress(self, peaks: WaveformPeaks, progress: float):
+        now = time.monotonic()
+        if now - self._last_partial >= 0.05 and not self.cancel_token.is_cancelled():
+            self._last_partial = now
+            self.signals.progress.emit(self.job_id, progress)
+    
+    def cancel(self):
+        """Batalkan job"""
+        self.cancel_token.cancel()
+
+
+class WaveformDetailWorker:
+    """Decode detail peaks untuk range waktu tertentu (saat waveform di-zoom)"""
+    
+    def __init__(self, job_id: int, file_path: str, start: float, end: float, num_buckets: int):
+        self.job_id = job_id
+        self.file_path = file_path
+        self.start = start
+        self.end = end
+        self.num_buckets = num_buckets
+        self.cancel_token = CancelToken()
+        self.signals = WaveformSignals()
+    
+    def run(self):
+        try:
+            peaks = AudioAnalyzer.generate_waveform_range(
+                self.file_path, self.start, self.end, self.num_buckets, self.cancel_token
+            )
+            if peaks is not None and not self.cancel_token.is_cancelled():
+                self.signals.finished.emit(self.job_id, (self.start, self.end, peaks))
+        except Exception as e:
+            print(f"Error in waveform detail worker: {e}")
+    
+    def cancel(self):
+        """Batalkan job"""
+        self.cancel_token.cancel()
+
+
+# ============================================================================
+# PREVIEW PROXIES
+# ============================================================================
+
+# File panjang/besar diputar dari proxy MP3 mono kecil di cache
+PROXY_MIN_DURATION = 20 * 60
+PROXY_MIN_SIZE = 500 * 1024 * 1024
+PROXY_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+PROXY_BITRATE = 64000
+PROXY_SAMPLE_RATE = 44100
+
+
+class ProxyCache:
+    """Proxy preview (MP3 mono CBR, cepat untuk seek) untuk file panjang
+    
+    Key dari path + size + mtime seperti cache lain; drag dan export tetap
+    memakai file asli.
+    """
+    
+    SUFFIX = ".mp3"
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = PROXY_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir("proxies")
+        self.max_bytes = max_bytes
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+    
+    @staticmethod
+    def needs_proxy(media_file: MediaFile) -> bool:
+        """Proxy hanya berguna untuk file panjang/besar yang bitrate-nya jauh di atas proxy"""
+        if not (media_file.duration >= PROXY_MIN_DURATION or media_file.size >= PROXY_MIN_SIZE):
+            return False
+        if media_file.duration > 0:
+            bytes_per_second = media_file.size / media_file.duration
+            return bytes_per_second > 2 * PROXY_BITRATE / 8
+        return True
+    
+    def lookup(self, file_path: str) -> Optional[str]:
+        key = file_cache_key(file_path)
+        if key is None:
+            return None
+        entry = self._entry_path(key)
+        try:
+            os.utime(entry)
+        except OSError:
+            return None
+        return str(entry)
+    
+    def build(self, file_path: str, cancel_token: Optional['CancelToken'] = None) -> Optional[str]:
+        """Encode proxy dengan ffmpeg (blocking), return path proxy"""
+        key = file_cache_key(file_path)
+        if key is None or not get_ffmpeg_exe():
+            return None
+        entry = self._entry_path(key)
+        partial_dir = self.cache_dir / "partial"
+        partial_dir.mkdir(exist_ok=True)
+        tmp_path = partial_dir / f"{key}.{os.getpid()}{self.SUFFIX}"
+        
+        args = ["-y", "-i", file_path, "-map", "0:a:0", "-vn", "-sn", "-dn",
+                "-ac", "1", "-ar", str(PROXY_SAMPLE_RATE),
+                "-c:a", "libmp3lame", "-b:a", str(PROXY_BITRATE), "-f", "mp3", str(tmp_path)]
+        started = time.time()
+        proc = popen_ffmpeg(args)
+        try:
+            while proc.poll() is None:
+                if cancel_token is not None and cancel_token.is_cancelled():
+                    proc.kill()
+                    proc.wait()
+                    return None
+                time.sleep(0.1)
+            if proc.returncode != 0:
+                print(f"✗ Failed to build preview proxy for {Path(file_path).name}")
+                return None
+            os.replace(tmp_path, entry)
+        except OSError as e:
+            print(f"✗ Error writing preview proxy: {e}")
+            return None
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        
+        evict_cache_dir(self.cache_dir, self.SUFFIX, self.max_bytes, keep=entry.name)
+        print(f"✓ Preview proxy ready for {Path(file_path).name} ({time.time() - started:.1f}s)")
+        return str(entry)
+
+
+class ProxySignals(QObject):
+    """Signals untuk ProxyWorker"""
+    
+    finished = pyqtSignal(str, str)   # file asli, path proxy ('' jika gagal)
+
+
+class ProxyWorker:
+    """Build satu preview proxy di background"""
+    
+    def __init__(self, file_path: str, proxy_cache: ProxyCache):
+        self.file_path = file_path
+        self.proxy_cache = proxy_cache
+        self.cancel_token = CancelToken()
+        self.signals = ProxySignals()
+    
+    def run(self):
+        proxy_path = None
+        try:
+            proxy_path = self.proxy_cache.build(self.file_path, self.cancel_token)
+        except Exception as e:
+            print(f"Error building preview proxy: {e}")
+        if not self.cancel_token.is_cancelled():
+            self.signals.finished.emit(self.file_path, proxy_path or "")
+    
+    def cancel(self):
+        self.cancel_token.cancel()
+
+
+class ProxyBuilder(QObject):
+    """Antrian build proxy di TaskScheduler (resource "proxy": satu encode sekaligus)"""
+    
+    proxy_ready = pyqtSignal(str, str)   # file asli, path proxy
+    
+    def __init__(self, proxy_cache: ProxyCache, parent=None):
+        super().__init__(parent)
+        self.proxy_cache = proxy_cache
+        self.tasks = get_task_scheduler()
+        self._jobs = {}   # file_path -> ProxyWorker
+    
+    def request(self, file_path: str):
+        """Jadwalkan build proxy jika belum ada dan belum di antrian"""
+        if file_path in self._jobs or self.proxy_cache.lookup(file_path):
+            return
+        job = ProxyWorker(file_path, self.proxy_cache)
+        job.signals.finished.connect(self._on_finished)
+        self._jobs[file_path] = job
+        self.tasks.submit(job.run, TASK_PREFETCH, "proxy", "preview proxy", job.cancel_token)
+    
+    def _on_finished(self, file_path: str, proxy_path: str):
+        self._jobs.pop(file_path, None)
+        if proxy_path:
+            self.proxy_ready.emit(file_path, proxy_path)
+    
+    def shutdown(self):
+        for job in self._jobs.values():
+            job.cancel()
+        self._jobs.clear()
+
+
+# ============================================================================
+# NEIGHBOR PREFETCH
+# ============================================================================
+
+# Jumlah row di atas dan di bawah row aktif yang di-warm di background
+PREFETCH_RADIUS = 3
+PREFETCH_MEMORY_BYTES = 64 * 1024 * 1024
+PREFETCH_HEAD_BYTES = 1024 * 1024
+PREFETCH_MAX_EXTRACT_SECONDS = 10 * 60
+PREFETCH_DELAY_MS = 120
+# Perkiraan ukuran PeakPyramid float32 di memory (semua level ~2x level 0)
+PREFETCH_PYRAMID_BYTES = PYRAMID_BASE_BUCKETS * 3 * 4 * 2
+
+
+@dataclass
+class PrefetchEntry:
+    """Hasil prefetch untuk satu file"""
+    duration: float = 0.0
+    pyramid: Optional[PeakPyramid] = None
+    stream: Optional[StreamingExtraction] = None
+    
+    def nbytes(self) -> int:
+        return self.pyramid.nbytes() if self.pyramid is not None else 0
+
+
+class PrefetchSignals(QObject):
+    """Signals untuk PrefetchWorker"""
+    
+    finished = pyqtSignal(str, object)
+
+
+class PrefetchWorker:
+    """Warm satu file: header/awal file, extraction (video) dan peak pyramid"""
+    
+    def __init__(self, media_file: MediaFile, peak_cache: Optional[PeakCache], load_peaks: bool,
+                 clip_cache: Optional[ClipCache] = None):
+        self.media_file = media_file
+        self.peak_cache = peak_cache
+        self.clip_cache = clip_cache
+        self.load_peaks = load_peaks
+        self.cancel_token = CancelToken()
+        self.signals = PrefetchSignals()
+    
+    def run(self):
+        path = self.media_file.path
+        entry = PrefetchEntry(duration=self.media_file.duration)
+        try:
+            # Baca awal file supaya header ada di OS cache untuk player dan tinytag
+            with open(path, 'rb') as f:
+                f.read(PREFETCH_HEAD_BYTES)
+            if entry.duration <= 0:
+                entry.duration = AudioAnalyzer.get_audio_duration(path)
+            
+            # Clip pendek di-decode ke ClipCache supaya player bisa langsung play
+            if self.clip_cache is not None and 0 < entry.duration <= CLIP_MAX_SECONDS:
+                self.clip_cache.get_or_decode(path)
+            
+            if (self.media_file.is_video and get_ffmpeg_exe()
+                    and 0 < entry.duration <= PREFETCH_MAX_EXTRACT_SECONDS):
+                entry.stream = get_extraction_cache().start_stream(path)
+                # Tunggu extraction selesai supaya waveform dibaca dari WAV di cache
+                while entry.stream is not None and not entry.stream.wait(0.1):
+                    if self.cancel_token.is_cancelled():
+                        return
+            
+            if self.load_peaks and self.peak_cache is not None and not self.cancel_token.is_cancelled():
+                pyramid = self.peak_cache.get(path)
+                if pyramid is None:
+                    data = AudioAnalyzer.generate_waveform_data(path, PYRAMID_BASE_BUCKETS,
+                                                                cancel_token=self.cancel_token)
+                    if data is None or self.cancel_token.is_cancelled():
+                        return
+                    pyramid = PeakPyramid.from_peaks(data)
+                    if not data.synthetic:
+                        self.peak_cache.put(path, pyramid)
+                entry.pyramid = pyramid
+        except Exception as e:
+            print(f"Error prefetching {Path(path).name}: {e}")
+        finally:
+            # Selalu dikirim, juga saat dibatalkan: extraction yang sudah dimulai dipegang
+            # entry.stream dan hanya NeighborPrefetcher yang tahu apakah masih dibutuhkan
+            self.signals.finished.emit(path, entry)
+    
+    def cancel(self):
+        self.cancel_token.cancel()
+
+
+class NeighborPrefetcher(QObject):
+    """Warm K row sebelum dan sesudah row aktif dalam urutan model saat ini
+    
+    Entry di luar jendela row di-evict setiap kali cursor pindah, dan peak
+    pyramid yang dipegang dibatasi oleh memory_budget (row terdekat didahulukan).
+    """
+    
+    def __init__(self, peak_cache: Optional[PeakCache], radius: int = PREFETCH_RADIUS,
+                 memory_budget: int = PREFETCH_MEMORY_BYTES, clip_cache: Optional[ClipCache] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.peak_cache = peak_cache
+        self.clip_cache = clip_cache
+        self.radius = radius
+        self.memory_budget = memory_budget
+        
+        # Class prefetch: tidak pernah mengantri di depan waveform job interaktif
+        self.tasks = get_task_scheduler()
+        
+        self._entries = {}    # path -> PrefetchEntry
+        self._jobs = {}       # path -> PrefetchWorker
+        self._window = []     # path dalam jendela, urut dari yang terdekat
+        self._current = None
+        self._pending = None  # (model, row)
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._schedule)
+    
+    def set_current(self, model: 'MediaTableModel', row: int):
+        """Row aktif berubah; prefetch dijadwalkan setelah cursor berhenti sebentar"""
+        media_file = model.get_file_at(row)
+        self._current = media_file.path if media_file else None
+        self._pending = (model, row)
+        self._timer.start(PREFETCH_DELAY_MS)
+    
+    def get(self, file_path: str) -> Optional[PrefetchEntry]:
+        """Entry hasil prefetch untuk file, None jika belum siap"""
+        return self._entries.get(file_path)
+    
+    def memory_used(self) -> int:
+        return sum(entry.nbytes() for entry in self._entries.values())
+    
+    def _schedule(self):
+        if self._pending is None:
+            return
+        model, row = self._pending
+        self._pending = None
+        
+        neighbors = []
+        for distance in range(1, self.radius + 1):
+            for neighbor_row in (row + distance, row - distance):
+                media_file = model.get_file_at(neighbor_row)
+                if media_file is not None:
+                    neighbors.append(media_file)
+        self._window = ([self._current] if self._current else []) + [f.path for f in neighbors]
+        keep = set(self._window)
+        
+        # Row aktif dikerjakan oleh job interaktif, job prefetch-nya tidak perlu
+        for path, job in list(self._jobs.items()):
+            if path not in keep or path == self._current:
+                job.cancel()
+                del self._jobs[path]
+        for path in list(self._entries):
+            if path not in keep:
+                self._evict(path)
+        
+        budget_used = self.memory_used() + PREFETCH_PYRAMID_BYTES * len(self._jobs)
+        for media_file in neighbors:
+            if media_file.path in self._entries or media_file.path in self._jobs:
+                continue
+            load_peaks = budget_used + PREFETCH_PYRAMID_BYTES <= self.memory_budget
+            if load_peaks:
+                budget_used += PREFETCH_PYRAMID_BYTES
+            job = PrefetchWorker(media_file, self.peak_cache, load_peaks, self.clip_cache)
+            job.signals.finished.connect(self._on_job_finished)
+            self._jobs[media_file.path] = job
+            self.tasks.submit(job.run, TASK_PREFETCH, "cpu", "prefetch", job.cancel_token)
+    
+    def _on_job_finished(self, path: str, entry: PrefetchEntry):
+        # Job yang sudah dibatalkan bisa selesai setelah job baru untuk path yang sama dijadwalkan
+        job = self._jobs.get(path)
+        is_current_job = job is not None and job.signals is self.sender()
+        if is_current_job:
+            del self._jobs[path]
+        if path not in self._window:
+            # Row sudah jauh: extraction yang belum selesai dibatalkan
+            if entry.stream is not None and not entry.stream.is_done():
+                entry.stream.cancel_token.cancel()
+            return
+        if not is_current_job:
+            # Dibatalkan karena menjadi row aktif (stream dipakai player) atau sudah diganti job baru
+            return
+        self._entries[path] = entry
+        self._enforce_budget()
+    
+    def _enforce_budget(self):
+        """Lepas pyramid dari entry terjauh sampai di bawah memory_budget"""
+        used = self.memory_used()
+        for path in reversed(self._window):
+            if used <= self.memory_budget:
+                break
+            entry = self._entries.get(path)
+            if entry is not None and entry.pyramid is not None and path != self._current:
+                used -= entry.nbytes()
+                entry.pyramid = None
+    
+    def _evict(self, path: str):
+        entry = self._entries.pop(path, None)
+        # Extraction yang belum selesai untuk row yang sudah jauh dibatalkan
+        if entry is not None and entry.stream is not None and not entry.stream.is_done():
+            entry.stream.cancel_token.cancel()
+    
+    def shutdown(self):
+        """Batalkan semua job prefetch (saat aplikasi ditutup)"""
+        self._timer.stop()
+        for job in self._jobs.values():
+            job.cancel()
+        self._jobs.clear()
+
+
+# ============================================================================
+# ACOUSTIC FINGERPRINT & SIMILARITY SEARCH
+# ============================================================================
+
+# Fingerprint dihitung dari awal file (mono, <= FINGERPRINT_MAX_SECONDS)
+FINGERPRINT_SAMPLE_RATE = 11025
+FINGERPRINT_MAX_SECONDS = 60.0
+FINGERPRINT_FFT_SIZE = 1024
+FINGERPRINT_BANDS = 24
+FINGERPRINT_MIN_HZ = 50.0
+FINGERPRINT_MAX_HZ = 5000.0
+# Vector: bentuk spektrum rata-rata, variasi per band, dan flux per band
+FINGERPRINT_DIM = 3 * FINGERPRINT_BANDS
+SIMILAR_RESULTS = 50
+
+
+def compute_fingerprint(samples: np.ndarray, sample_rate: int) -> Optional[np.ndarray]:
+    """Fingerprint spektral (float32, FINGERPRINT_DIM) dari audio mono
+    
+    Energi per band (log-spaced, FINGERPRINT_MIN_HZ..FINGERPRINT_MAX_HZ) dihitung
+    per frame FFT; frame yang hampir sunyi diabaikan. Band di atas 5 kHz tidak
+    dipakai supaya fingerprint WAV 48 kHz dan MP3 yang di-decode di 11 kHz
+    tetap sebanding. Bentuk spektrum dinormalisasi sehingga gain tidak berpengaruh.
+    """
+    if samples is None or len(samples) == 0:
+        return None
+    
+    # FFT size mengikuti sample rate supaya resolusi frekuensi sama
+    n_fft = int(2 ** round(np.log2(FINGERPRINT_FFT_SIZE * sample_rate / FINGERPRINT_SAMPLE_RATE)))
+    hop = n_fft // 2
+    if len(samples) < n_fft:
+        samples = np.pad(samples, (0, n_fft - len(samples)))
+    
+    frames = np.lib.stride_tricks.sliding_window_view(samples, n_fft)[::hop]
+    window = np.hanning(n_fft).astype(np.float32)
+    
+    # Bin FFT -> band: batas band dalam bin, minimal satu bin per band
+    n_bins = n_fft // 2 + 1
+    nyquist = sample_rate / 2
+    edges_hz = np.geomspace(FINGERPRINT_MIN_HZ, min(FINGERPRINT_MAX_HZ, nyquist), FINGERPRINT_BANDS + 1)
+    edges = np.round(edges_hz / nyquist * (n_bins - 1)).astype(np.int64)
+    edges = np.minimum(np.maximum(edges, np.arange(len(edges)) + edges[0]), n_bins - 1)
+    
+    # FFT per blok frame supaya memory tetap kecil untuk WAV sample rate tinggi
+    log_bands = np.empty((len(frames), FINGERPRINT_BANDS), dtype=np.float32)
+    for start in range(0, len(frames), 256):
+        block = frames[start:start + 256] * window
+        power = np.abs(np.fft.rfft(block, axis=1)[:, :edges[-1] + 1]) ** 2
+        bands = np.add.reduceat(power, edges[:-1], axis=1)
+        log_bands[start:start + len(block)] = 10.0 * np.log10(bands + 1e-10)
+    frame_energy = log_bands.max(axis=1)
+    active = frame_energy > frame_energy.max() - 60.0
+    if not np.any(active):
+        return None
+    log_bands = log_bands[active]
+    
+    mean = log_bands.mean(axis=0)
+    shape = mean - mean.mean()
+    spread = log_bands.std(axis=0)
+    flux = (np.abs(np.diff(log_bands, axis=0)).mean(axis=0)
+            if len(log_bands) > 1 else np.zeros(FINGERPRINT_BANDS))
+    return np.concatenate([shape, spread, flux]).astype(np.float32)
+
+
+def fingerprint_file(file_path: str) -> Optional[np.ndarray]:
+    """Decode awal file lalu hitung fingerprint-nya"""
+    decoded = AudioAnalyzer.decode_mono(file_path, FINGERPRINT_SAMPLE_RATE, FINGERPRINT_MAX_SECONDS)
+    if decoded is None:
+        return None
+    samples, sample_rate = decoded
+    return compute_fingerprint(samples, sample_rate)
+
+
+class SimilarityIndex:
+    """Nearest-neighbour index di memory untuk fingerprint
+    
+    Semua fingerprint disimpan sebagai satu matrix float32; setiap dimensi
+    di-standardisasi lalu tiap baris dinormalisasi, jadi query adalah satu
+    matrix-vector product (cosine similarity) plus argpartition.
+    """
+    
+    def __init__(self):
+        self.paths: List[str] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.mean: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        self.dirty = True
+        self._lock = threading.Lock()
+    
+    def invalidate(self):
+        """Tandai index perlu di-load ulang (fingerprint baru tersimpan)"""
+        self.dirty = True
+    
+    def ensure_loaded(self, database: AudioDatabase):
+        with self._lock:
+            if not self.dirty:
+                return
+            start = time.perf_counter()
+            rows = database.get_fingerprints()
+            self.dirty = False
+            self.paths = [path for path, _ in rows]
+            if not rows:
+                self.matrix = None
+                return
+            raw = np.frombuffer(b"".join(blob for _, blob in rows), dtype=np.float32)
+            raw = raw.reshape(len(rows), FINGERPRINT_DIM)
+            self.mean = raw.mean(axis=0)
+            self.scale = raw.std(axis=0) + 1e-6
+            self.matrix = self._normalize(raw)
+            print(f"✓ Similarity index: {len(rows)} fingerprints loaded in "
+                  f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        z = (vectors - self.mean) / self.scale
+        norms = np.linalg.norm(z, axis=-1, keepdims=True)
+        return (z / np.maximum(norms, 1e-9)).astype(np.float32)
+    
+    def query(self, fingerprint: np.ndarray, k: int = SIMILAR_RESULTS) -> List[Tuple[str, float]]:
+        """k fingerprint paling mirip: list of (path, cosine similarity)"""
+        with self._lock:
+            if self.matrix is None or len(self.paths) == 0:
+                return []
+            scores = self.matrix @ self._normalize(fingerprint.astype(np.float32))
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.paths[i], float(scores[i])) for i in top]
+
+
+class SimilarSearchSignals(QObject):
+    """Hasil find similar dari background task ke UI thread"""
+    
+    finished = pyqtSignal(str, object, int, float)  # file_path, files, jumlah dicari, ms query
+    not_analyzable = pyqtSignal(str)
+    error = pyqtSignal(str, str)
+
+
+# ============================================================================
+# LOUDNESS ANALYSIS (ITU-R BS.1770)
+# ============================================================================
+
+LOUDNESS_SAMPLE_RATE = 48000
+# Nilai untuk file yang sunyi total (loudness/peak -inf)
+LOUDNESS_FLOOR_DB = -120.0
+LOUDNESS_BLOCK_SECONDS = 0.4
+LOUDNESS_SUBBLOCKS = 4             # gating block 400 ms, overlap 75% (hop 100 ms)
+LOUDNESS_ABSOLUTE_GATE = -70.0
+LOUDNESS_RELATIVE_GATE = -10.0
+K_WEIGHTING_TAPS = 4096
+TRUE_PEAK_OVERSAMPLE = 4
+TRUE_PEAK_TAPS_PER_PHASE = 32
+
+
+def _biquad_response(b: List[float], a: List[float], w: np.ndarray) -> np.ndarray:
+    z1 = np.exp(-1j * w)
+    z2 = z1 * z1
+    return (b[0] + b[1] * z1 + b[2] * z2) / (a[0] + a[1] * z1 + a[2] * z2)
+
+
+_K_WEIGHTING_CACHE: Dict[int, np.ndarray] = {}
+
+
+def k_weighting_spectrum(sample_rate: int, n_fft: int) -> np.ndarray:
+    """Spektrum (rfft, n_fft) dari FIR K-weighting untuk sample_rate
+    
+    Koefisien dua biquad (high shelf + high pass RLB) dihitung untuk sample
+    rate apa pun seperti libebur128; impulse response-nya dipotong ke
+    K_WEIGHTING_TAPS sample (sudah meluruh jauh sebelum itu).
+    """
+    key = (sample_rate, n_fft)
+    cached = _K_WEIGHTING_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    # Stage 1: high shelf (+4 dB di atas ~1.7 kHz)
+    f0, gain, q = 1681.974450955533, 3.999843853973347, 0.7071752369554196
+    k = np.tan(np.pi * f0 / sample_rate)
+    vh = 10.0 ** (gain / 20.0)
+    vb = vh ** 0.4996667741545416
+    a0 = 1.0 + k / q + k * k
+    shelf_b = [(vh + vb * k / q + k * k) / a0, 2.0 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0]
+    shelf_a = [1.0, 2.0 * (k * k - 1.0) / a0, (1.0 - k / q + k * k) / a0]
+    
+    # Stage 2: high pass RLB (~38 Hz)
+    f0, q = 38.13547087602444, 0.5003270373238773
+    k = np.tan(np.pi * f0 / sample_rate)
+    a0 = 1.0 + k / q + k * k
+    hp_b = [1.0, -2.0, 1.0]
+    hp_a = [1.0, 2.0 * (k * k - 1.0) / a0, (1.0 - k / q + k * k) / a0]
+    
+    # Impulse response lewat frequency sampling, lalu dipotong ke FIR
+    grid = 1 << 16
+    w = 2.0 * np.pi * np.arange(grid // 2 + 1) / grid
+    response = _biquad_response(shelf_b, shelf_a, w) * _biquad_response(hp_b, hp_a, w)
+    fir = np.fft.irfft(response, grid)[:K_WEIGHTING_TAPS]
+    spectrum = np.fft.rfft(fir, n_fft)
+    _K_WEIGHTING_CACHE[key] = spectrum
+    return spectrum
+
+
+def true_peak_phases() -> List[np.ndarray]:
+    """Filter polyphase untuk oversampling 4x (windowed sinc)"""
+    taps = TRUE_PEAK_OVERSAMPLE * TRUE_PEAK_TAPS_PER_PHASE
+    n = np.arange(taps) - (taps - 1) / 2.0
+    h = np.sinc(n / TRUE_PEAK_OVERSAMPLE) * np.kaiser(taps, 5.0)
+    h *= TRUE_PEAK_OVERSAMPLE / h.sum()
+    return [h[p::TRUE_PEAK_OVERSAMPLE].copy() for p in range(TRUE_PEAK_OVERSAMPLE)]
+
+
+class LoudnessMeter:
+    """Streaming meter: integrated loudness, true/sample peak dan RMS
+    
+    Audio di-feed per chunk (frames, channels). K-weighting diterapkan dengan
+    overlap-save FFT convolution, energi dikumpulkan per sub-block 100 ms lalu
+    gating block 400 ms dibentuk dengan moving sum (semua vectorized).
+    """
+    
+    def __init__(self, sample_rate: int, channels: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.subblock = int(round(sample_rate * LOUDNESS_BLOCK_SECONDS / LOUDNESS_SUBBLOCKS))
+        self.k_tail = np.zeros((K_WEIGHTING_TAPS - 1, channels), dtype=np.float64)
+        self.pending = np.zeros((0, channels), dtype=np.float64)
+        self.subblock_energy: List[np.ndarray] = []
+        self.phases = true_peak_phases()
+        self.tp_tail = np.zeros((TRUE_PEAK_TAPS_PER_PHASE - 1, channels), dtype=np.float32)
+        self.sample_peak = 0.0
+        self.true_peak = 0.0
+        self.sum_squares = 0.0
+        self.count = 0
+    
+    def feed(self, chunk: np.ndarray):
+        if chunk.size == 0:
+            return
+        chunk = chunk.reshape(len(chunk), self.channels)
+        
+        # Sample peak dan RMS (unweighted)
+        self.sample_peak = max(self.sample_peak, float(np.abs(chunk).max()))
+        self.sum_squares += float(np.square(chunk, dtype=np.float64).sum())
+        self.count += chunk.size
+        
+        # True peak: oversampling 4x per phase, dengan konteks dari chunk sebelumnya
+        context = np.concatenate([self.tp_tail, chunk])
+        for ch in range(self.channels):
+            for phase in self.phases:
+                upsampled = np.convolve(context[:, ch], phase, mode='valid')
+                if upsampled.size:
+                    self.true_peak = max(self.true_peak, float(np.abs(upsampled).max()))
+        self.tp_tail = context[-(TRUE_PEAK_TAPS_PER_PHASE - 1):]
+        
+        # K-weighting (overlap-save)
+        block = np.concatenate([self.k_tail, chunk.astype(np.float64)])
+        n_fft = 1 << int(np.ceil(np.log2(len(block))))
+        spectrum = k_weighting_spectrum(self.sample_rate, n_fft)
+        filtered = np.fft.irfft(np.fft.rfft(block, n_fft, axis=0) * spectrum[:, None], n_fft, axis=0)
+        filtered = filtered[K_WEIGHTING_TAPS - 1:len(block)]
+        self.k_tail = block[-(K_WEIGHTING_TAPS - 1):]
+        
+        # Energi per sub-block 100 ms
+        squared = np.concatenate([self.pending, filtered * filtered])
+        full = len(squared) // self.subblock * self.subblock
+        if full:
+            energy = squared[:full].reshape(-1, self.subblock, self.channels).sum(axis=1)
+            self.subblock_energy.append(energy)
+        self.pending = squared[full:]
+    
+    def result(self) -> Optional[LoudnessResult]:
+        if self.count == 0:
+            return None
+        
+        def to_db(value: float, scale: float = 20.0) -> float:
+            return max(scale * np.log10(value), LOUDNESS_FLOOR_DB) if value > 0 else LOUDNESS_FLOOR_DB
+        
+        rms = np.sqrt(self.sum_squares / self.count)
+        lufs = LOUDNESS_FLOOR_DB
+        # Sub-block terakhir yang belum penuh ikut dihitung, dibobot panjangnya
+        parts = list(self.subblock_energy)
+        lengths = [np.full(len(energy), float(self.subblock)) for energy in parts]
+        if len(self.pending):
+            parts.append(self.pending.sum(axis=0, keepdims=True))
+            lengths.append(np.array([float(len(self.pending))]))
+        if parts:
+            energy = np.concatenate(parts)
+            length = np.concatenate(lengths)
+            # File lebih pendek dari satu gating block: pakai seluruh isi sebagai satu block
+            if length.sum() < LOUDNESS_SUBBLOCKS * self.subblock:
+                n = len(energy)
+            else:
+                n = LOUDNESS_SUBBLOCKS
+            cumulative = np.concatenate([np.zeros((1, self.channels)), np.cumsum(energy, axis=0)])
+            samples = np.concatenate([[0.0], np.cumsum(length)])
+            blocks = (cumulative[n:] - cumulative[:-n]) / (samples[n:] - samples[:-n])[:, None]   # mean square per channel
+            block_power = blocks.sum(axis=1)   # bobot channel 1.0 (L/R/C)
+            with np.errstate(divide='ignore'):
+                block_loudness = -0.691 + 10.0 * np.log10(block_power)
+            gated = block_loudness > LOUDNESS_ABSOLUTE_GATE
+            if np.any(gated):
+                relative = -0.691 + 10.0 * np.log10(block_power[gated].mean()) + LOUDNESS_RELATIVE_GATE
+                gated &= block_loudness > relative
+                lufs = max(-0.691 + 10.0 * np.log10(block_power[gated].mean()), LOUDNESS_FLOOR_DB)
+        
+        return LoudnessResult(
+            lufs=float(lufs),
+            true_peak_db=float(to_db(max(self.true_peak, self.sample_peak))),
+            sample_peak_db=float(to_db(self.sample_peak)),
+            rms_db=float(to_db(rms)),
+        )
+
+
+def measure_loudness(file_path: str) -> Optional[LoudnessResult]:
+    """Analisis loudness satu file (module-level supaya bisa dipakai ProcessPoolExecutor)"""
+    try:
+        stream = AudioAnalyzer.iter_pcm_chunks(file_path, LOUDNESS_SAMPLE_RATE, WAVEFORM_MAX_DECODE_SECONDS)
+        if stream is None:
+            return None
+        sample_rate, channels, chunks = stream
+        meter = LoudnessMeter(sample_rate, channels)
+        for chunk in chunks:
+            meter.feed(chunk)
+        return meter.result()
+    except Exception as e:
+        print(f"Error measuring loudness of {Path(file_path).name}: {e}")
+        return None
+
+
+# ============================================================================
+# SILENCE & ONSET MARKERS
+# ============================================================================
+
+SILENCE_SAMPLE_RATE = 22050
+SILENCE_FRAME_SECONDS = 0.01
+# Frame di bawah max(SILENCE_FLOOR_DB, frame terkeras + SILENCE_RELATIVE_DB) dianggap sunyi
+SILENCE_FLOOR_DB = -60.0
+SILENCE_RELATIVE_DB = -48.0
+# Onset: kenaikan level minimal terhadap frame-frame sebelumnya
+ONSET_RISE_DB = 12.0
+ONSET_HISTORY_FRAMES = 5
+ONSET_SEARCH_SECONDS = 10.0
+# Playback mulai sedikit sebelum onset supaya attack tidak terpotong
+ONSET_PREROLL = 0.05
+
+
+def compute_silence_markers(frame_energy: np.ndarray, frame_seconds: float,
+                            total_seconds: float) -> SilenceMarkers:
+    """Hitung head/tail silence dan onset pertama dari mean square per frame"""
+    with np.errstate(divide='ignore'):
+        level = 10.0 * np.log10(frame_energy)
+    if level.size == 0 or not np.any(np.isfinite(level)):
+        return SilenceMarkers(head=total_seconds, tail=0.0, onset=0.0, effective_duration=0.0)
+    
+    threshold = max(SILENCE_FLOOR_DB, float(np.nanmax(level)) + SILENCE_RELATIVE_DB)
+    active = np.flatnonzero(level > threshold)
+    if active.size == 0:
+        return SilenceMarkers(head=total_seconds, tail=0.0, onset=0.0, effective_duration=0.0)
+    first, last = int(active[0]), int(active[-1])
+    head = first * frame_seconds
+    end = min((last + 1) * frame_seconds, total_seconds)
+    
+    # Onset = frame pertama (dekat awal suara) yang naik ONSET_RISE_DB di atas
+    # level maksimum beberapa frame sebelumnya; silence dihitung sebagai threshold.
+    # File yang langsung mulai dengan suara (room tone) tidak dianggap naik di
+    # frame pertama. Tanpa lonjakan (mis. fade-in) onset = akhir silence awal.
+    floored = np.maximum(level, threshold)
+    padded = np.concatenate([np.full(ONSET_HISTORY_FRAMES, floored[0]), floored])
+    history = np.lib.stride_tricks.sliding_window_view(padded[:-1], ONSET_HISTORY_FRAMES).max(axis=1)
+    rise = floored - history
+    search_end = min(len(level), first + int(ONSET_SEARCH_SECONDS / frame_seconds) + 1)
+    candidates = np.flatnonzero(rise[first:search_end] >= ONSET_RISE_DB)
+    onset = (first + int(candidates[0])) * frame_seconds if candidates.size else head
+    
+    return SilenceMarkers(head=head, tail=max(total_seconds - end, 0.0), onset=onset,
+                          effective_duration=max(end - head, 0.0))
+
+
+def detect_silence(file_path: str) -> Optional[SilenceMarkers]:
+    """Analisis silence/onset satu file (module-level untuk ProcessPoolExecutor)"""
+    try:
+        stream = AudioAnalyzer.iter_pcm_chunks(file_path, SILENCE_SAMPLE_RATE, WAVEFORM_MAX_DECODE_SECONDS)
+        if stream is None:
+            return None
+        sample_rate, channels, chunks = stream
+        frame = max(int(round(sample_rate * SILENCE_FRAME_SECONDS)), 1)
+        energies = []
+        pending = np.zeros(0, dtype=np.float64)
+        total_frames = 0
+        for chunk in chunks:
+            total_frames += len(chunk)
+            # Mean square rata-rata semua channel per sample, lalu per frame 10 ms
+            squared = np.concatenate([pending, np.square(chunk, dtype=np.float64).mean(axis=1)])
+            full = len(squared) // frame * frame
+            if full:
+                energies.append(squared[:full].reshape(-1, frame).mean(axis=1))
+            pending = squared[full:]
+        if total_frames == 0:
             return None
+        if pending.size:
+            energies.append(np.array([pending.mean()]))
+        
+        frame_energy = np.concatenate(energies) if energies else np.zeros(0)
+        return compute_silence_markers(frame_energy, frame / sample_rate, total_frames / sample_rate)
+    except Exception as e:
+        print(f"Error detecting silence in {Path(file_path).name}: {e}")
+        return None
+
+
+# ============================================================================
+# ANALYSIS SCHEDULER
+# ============================================================================
+
+ANALYSIS_PROCESS_WORKERS = max(1, os.cpu_count() or 1)
+# Batas job bersamaan per resource (analyzer mendeklarasikan resource yang dipakai)
+ANALYSIS_RESOURCE_LIMITS = {
+    "cpu": ANALYSIS_PROCESS_WORKERS,
+    "disk": 2,
+}
+ANALYSIS_COMMIT_EVERY = 50
+ANALYSIS_COMMIT_INTERVAL = 2.0
+ANALYSIS_MAX_ATTEMPTS = 3
+ANALYSIS_RETRY_PENALTY = 10
+# Interval minimum (detik) untuk refresh hasil analisis di tabel selama scheduler berjalan
+ANALYSIS_REFRESH_INTERVAL = 5.0
+
+# name -> Analyzer; diisi oleh @register_analyzer saat module di-import
+# (juga di worker process, jadi job cukup dikirim sebagai nama analyzer)
+ANALYZER_REGISTRY: Dict[str, 'Analyzer'] = {}
+
+
+def register_analyzer(cls):
+    """Class decorator: daftarkan analyzer ke AnalysisScheduler"""
+    ANALYZER_REGISTRY[cls.name] = cls()
+    return cls
+
+
+class Analyzer:
+    """Base class untuk analisis per file yang dijalankan AnalysisScheduler
+    
+    analyze() berjalan di worker process dan harus mengembalikan hasil yang
+    bisa di-pickle (None = gagal). store() berjalan di thread scheduler dan
+    menyimpan batch hasil ke database. Naikkan version jika algoritmanya
+    berubah supaya semua file dianalisis ulang.
+    """
+    
+    name = ""
+    version = 1
+    priority = 0          # priority dasar job (lebih besar = lebih dulu)
+    resource = "cpu"      # key di ANALYSIS_RESOURCE_LIMITS
+    done_column = ""      # kolom media_files yang terisi jika analisis sudah ada
+    
+    def analyze(self, file_path: str) -> Any:
+        raise NotImplementedError
+    
+    def store(self, database: AudioDatabase, results: List[Tuple[str, Any]]):
+        raise NotImplementedError
+
+
+@register_analyzer
+class SilenceAnalyzer(Analyzer):
+    """Silence head/tail dan onset pertama (untuk preview yang di-trim)"""
+    
+    name = "silence"
+    priority = 30
+    done_column = "effective_duration"
+    
+    def analyze(self, file_path: str) -> Optional[SilenceMarkers]:
+        return detect_silence(file_path)
+    
+    def store(self, database: AudioDatabase, results: List[Tuple[str, SilenceMarkers]]):
+        database.set_silence_markers(results)
+
+
+@register_analyzer
+class LoudnessAnalyzer(Analyzer):
+    """Integrated loudness, true/sample peak dan RMS"""
+    
+    name = "loudness"
+    priority = 20
+    done_column = "loudness_lufs"
+    
+    def analyze(self, file_path: str) -> Optional[LoudnessResult]:
+        return measure_loudness(file_path)
+    
+    def store(self, database: AudioDatabase, results: List[Tuple[str, LoudnessResult]]):
+        database.set_loudness(results)
+
+
+@register_analyzer
+class FingerprintAnalyzer(Analyzer):
+    """Fingerprint akustik untuk Find Similar Sounds"""
+    
+    name = "fingerprint"
+    priority = 10
+    done_column = "fingerprint"
+    
+    def analyze(self, file_path: str) -> Optional[np.ndarray]:
+        return fingerprint_file(file_path)
+    
+    def store(self, database: AudioDatabase, results: List[Tuple[str, np.ndarray]]):
+        database.set_fingerprints([(path, vector.astype(np.float32).tobytes()) for path, vector in results])
+
+
+def run_analyzer(name: str, file_path: str) -> Any:
+    """Entry point job di worker process"""
+    result = ANALYZER_REGISTRY[name].analyze(file_path)
+    if result is None:
+        raise RuntimeError("no result (audio could not be decoded)")
+    return result
+
+
+class AnalysisScheduler:
+    """Menjalankan semua analyzer terdaftar di background, tanpa dependensi Qt
+    
+    Job disimpan di tabel analysis_jobs (bertahan setelah restart) dan
+    dijadwalkan ulang otomatis oleh trigger database saat size/mtime file
+    berubah. Dispatcher thread mengambil job berdasarkan priority, dengan
+    path dari prioritize() (mis. baris yang terlihat) lebih dulu, lalu
+    menjalankannya di satu ProcessPoolExecutor dengan batas per resource.
+    Job yang gagal dicoba lagi sampai ANALYSIS_MAX_ATTEMPTS kali.
+    
+    Callback dipanggil dari thread dispatcher:
+    on_progress(analyzer, processed, total), on_stored(analyzer, paths), on_idle().
+    """
+    
+    def __init__(self, database: AudioDatabase, analyzers: Optional[List[str]] = None,
+                 max_workers: int = ANALYSIS_PROCESS_WORKERS,
+                 on_progress: Optional[Callable[[str, int, int], None]] = None,
+                 on_stored: Optional[Callable[[str, List[str]], None]] = None,
+                 on_idle: Optional[Callable[[], None]] = None):
+        self.database = database
+        self.analyzers = [ANALYZER_REGISTRY[name] for name in (analyzers or list(ANALYZER_REGISTRY))]
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self.on_stored = on_stored
+        self.on_idle = on_idle
+        # Process analisis memakai slot class analysis di TaskScheduler bersama
+        self.tasks = get_task_scheduler()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._preferred: List[str] = []
+        self._totals: Dict[str, int] = {}
+        self._processed: Dict[str, int] = {}
+        self._thread = None
+    
+    def start(self):
+        """Mulai dispatcher (job running dari sesi sebelumnya dikembalikan ke antrian)"""
+        if self._thread is not None:
+            return
+        self.database.release_analysis_jobs()
+        self.enqueue()
+        self._thread = threading.Thread(target=self._run, name="analysis-scheduler", daemon=True)
+        self._thread.start()
+    
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def enqueue(self):
+        """Buat job untuk file baru (mis. setelah scan) dan bangunkan dispatcher"""
+        with self._lock:
+            for analyzer in self.analyzers:
+                pending = self.database.enqueue_analysis_jobs(analyzer.name, analyzer.version,
+                                                              analyzer.done_column, analyzer.priority)
+                self._processed.setdefault(analyzer.name, 0)
+                self._totals[analyzer.name] = self._processed[analyzer.name] + pending
+            self._idle.clear()
+        self._update_backlog()
+        self._wake.set()
+    
+    def prioritize(self, paths: List[str]):
+        """Analisis file ini lebih dulu (menggantikan daftar sebelumnya)"""
+        with self._lock:
+            self._preferred = list(paths)
+        self._wake.set()
+    
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        return self._idle.wait(timeout)
+    
+    def shutdown(self, timeout: float = 5.0):
+        """Hentikan dispatcher; job yang belum selesai kembali ke antrian"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self):
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+        from concurrent.futures.process import BrokenProcessPool
+        import multiprocessing
+        
+        # "spawn": fork dari proses Qt yang punya banyak thread tidak aman
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        by_name = {analyzer.name: analyzer for analyzer in self.analyzers}
+        in_flight: Dict[Any, Tuple[str, Analyzer]] = {}
+        usage: Dict[str, int] = {}
+        results: Dict[str, List[Tuple[str, Any]]] = {}
+        last_flush = time.monotonic()
+        
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                throttled = False
+                
+                # Isi slot kosong, dengan batas per resource (analyzer dan TaskScheduler)
+                while len(in_flight) < self.max_workers:
+                    allowed = [a.name for a in self.analyzers
+                               if usage.get(a.resource, 0) < ANALYSIS_RESOURCE_LIMITS.get(a.resource, self.max_workers)
+                               and self.tasks.has_capacity(TASK_ANALYSIS, a.resource)]
+                    if not allowed:
+                        throttled = True
+                        break
+                    with self._lock:
+                        preferred = self._preferred
+                    job = self.database.claim_analysis_job(allowed, preferred)
+                    if job is None:
+                        break
+                    path, name = job
+                    analyzer = by_name[name]
+                    if not self.tasks.try_acquire(TASK_ANALYSIS, analyzer.resource):
+                        self.database.release_analysis_jobs([job])
+                        throttled = True
+                        break
+                    in_flight[executor.submit(run_analyzer, name, path)] = (path, analyzer)
+                    usage[analyzer.resource] = usage.get(analyzer.resource, 0) + 1
+                
+                if not in_flight and throttled:
+                    # Slot sedang dipakai task yang lebih penting; coba lagi sebentar lagi
+                    self._wake.wait(TASK_THROTTLE_WAIT)
+                    continue
+                
+                if not in_flight:
+                    self._flush(results)
+                    if not self._idle.is_set():
+                        self._idle.set()
+                        if self.on_idle is not None:
+                            self.on_idle()
+                    self._wake.wait()
+                    continue
+                
+                done, _ = wait(list(in_flight), timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, analyzer = in_flight.pop(future)
+                    usage[analyzer.resource] -= 1
+                    self.tasks.release(TASK_ANALYSIS, analyzer.resource,
+                                      "failed" if future.exception() is not None else "done")
+                    try:
+                        results.setdefault(analyzer.name, []).append((path, future.result()))
+                    except Exception as e:
+                        if isinstance(e, BrokenProcessPool) and not self._stop.is_set():
+                            # Worker process crash: pool harus dibuat ulang
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                        print(f"✗ {analyzer.name} failed for {Path(path).name}: {e}")
+                        if self.database.fail_analysis_job(analyzer.name, path, str(e) or type(e).__name__,
+                                                           ANALYSIS_MAX_ATTEMPTS, ANALYSIS_RETRY_PENALTY):
+                            self._count(analyzer.name, 1)
+                
+                if (sum(len(batch) for batch in results.values()) >= ANALYSIS_COMMIT_EVERY
+                        or time.monotonic() - last_flush >= ANALYSIS_COMMIT_INTERVAL):
+                    self._flush(results)
+                    last_flush = time.monotonic()
+        except Exception as e:
+            print(f"Error in analysis scheduler: {e}")
+            traceback.print_exc()
+        finally:
+            self._flush(results)
+            executor.shutdown(wait=False, cancel_futures=True)
+            for _, analyzer in in_flight.values():
+                self.tasks.release(TASK_ANALYSIS, analyzer.resource, "cancelled")
+            self.database.release_analysis_jobs([(path, analyzer.name) for path, analyzer in in_flight.values()])
+            self.tasks.set_backlog(TASK_ANALYSIS, 0)
+    
+    def _flush(self, results: Dict[str, List[Tuple[str, Any]]]):
+        """Simpan hasil yang terkumpul lalu tandai job-nya selesai"""
+        for analyzer in self.analyzers:
+            batch = results.pop(analyzer.name, None)
+            if not batch:
+                continue
+            try:
+                analyzer.store(self.database, batch)
+                paths = [path for path, _ in batch]
+                self.database.complete_analysis_jobs(analyzer.name, analyzer.version, paths)
+            except Exception as e:
+                print(f"Error storing {analyzer.name} results: {e}")
+                continue
+            self._count(analyzer.name, len(batch))
+            if self.on_stored is not None:
+                self.on_stored(analyzer.name, paths)
+    
+    def _count(self, name: str, processed: int):
+        with self._lock:
+            self._processed[name] = self._processed.get(name, 0) + processed
+            done, total = self._processed[name], max(self._totals.get(name, 0), self._processed[name])
+        self._update_backlog()
+        if self.on_progress is not None:
+            self.on_progress(name, done, total)
+    
+    def _update_backlog(self):
+        with self._lock:
+            remaining = sum(max(0, total - self._processed.get(name, 0)) for name, total in self._totals.items())
+        self.tasks.set_backlog(TASK_ANALYSIS, remaining)
+
+
+class AnalysisSchedulerSignals(QObject):
+    """Meneruskan callback AnalysisScheduler (thread dispatcher) ke UI thread"""
+    
+    progress = pyqtSignal(str, int, int)
+    stored = pyqtSignal(str, object)
+    idle = pyqtSignal()
+
+
+def run_headless_analysis(db_path: str = "media_index.db") -> int:
+    """Jalankan semua analisis untuk index tanpa UI (python main.py --analyze)"""
+    database = AudioDatabase(db_path)
+    last_report = {}
+    
+    def report(name: str, done: int, total: int):
+        # Satu baris per analyzer setiap ~5%
+        step = max(total // 20, 1)
+        if done == total or done - last_report.get(name, 0) >= step:
+            last_report[name] = done
+            print(f"  {name}: {done}/{total}")
+    
+    scheduler = AnalysisScheduler(database, on_progress=report)
+    scheduler.start()
+    try:
+        scheduler.wait_until_idle()
+    except KeyboardInterrupt:
+        print("Interrupted, pending jobs stay queued")
+    finally:
+        scheduler.shutdown()
+    
+    for name, counts in sorted(database.get_analysis_counts().items()):
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        print(f"✓ {name}: {summary}")
+    return 0
+
+
+# ============================================================================
+# WAVEFORM WIDGET
+# ============================================================================
+
+class SimpleWaveformWidget(QWidget):
+    """Waveform display dengan playhead, zoom dan pan
+    
+    Waveform di-render sekali ke QPixmap (satu bar min/max per kolom pixel)
+    dan hanya di-render ulang saat data, view, ukuran, atau device pixel ratio
+    berubah. Update playhead hanya me-repaint strip kecil di sekitar playhead.
+    
+    Wheel untuk zoom di posisi cursor, Shift+wheel atau drag untuk pan,
+    double click untuk reset zoom. Jika zoom melebihi resolusi pyramid,
+    widget meminta detail range lewat signal detail_requested.
+    """
+    
+    # (start_seconds, end_seconds, num_buckets)
+    detail_requested = pyqtSignal(float, float, int)
+    
+    PLAYHEAD_WIDTH = 2
+    TIME_TEXT_RECT = QRect(0, 0, 180, 28)
+    PROGRESS_TEXT_WIDTH = 240
+    MIN_VIEW_SECONDS = 0.01
+    ZOOM_STEP = 1.25
+    MAX_DETAIL_BUCKETS = 1 << 17
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.waveform_data = None
+        self.duration = 0
+        self.current_position = 0
+        self.loading = False
+        self.progress = 0.0
+        self.setMinimumHeight(100)
+        
+        # Visible range sebagai fraksi timeline (0..1)
+        self.view_start = 0.0
+        self.view_end = 1.0
+        self._drag_x = None
+        
+        # Detail hasil decode on-demand: (start_frac, end_frac, WaveformPeaks)
+        self.detail = None
+        
+        # Marker silence/onset (detik): (akhir silence awal, awal silence akhir, onset)
+        self.markers = None
+        self._detail_timer = QTimer(self)
+        self._detail_timer.setSingleShot(True)
+        self._detail_timer.setInterval(150)
+        self._detail_timer.timeout.connect(self._request_detail)
+        
+        # Cached render dari waveform
+        self._pixmap = None
+        self._pixmap_key = None
+        
+        # Colors
+        self.bg_color = QColor(25, 25, 30)
+        self.waveform_color = QColor(100, 180, 255, 200)
+        self.rms_color = QColor(170, 215, 255, 220)
+        self.playhead_color = QColor(255, 50, 50, 220)
+        self.silence_color = QColor(0, 0, 0, 110)
+        self.onset_color = QColor(255, 200, 60, 200)
+        self.text_color = QColor(200, 200, 200)
+    
+    def set_audio_data(self, waveform_data: Optional[PeakPyramid], duration):
+        self.waveform_data = waveform_data
+        self.duration = max(float(duration), 0.1)
+        self.current_position = 0
+        self.loading = False
+        self.progress = 0.0
+        self.view_start, self.view_end = 0.0, 1.0
+        self.detail = None
+        self.markers = None
+        self._detail_timer.stop()
+        self._invalidate()
+    
+    def set_loading(self, duration):
+        """Reset widget sambil menunggu waveform dari background worker"""
+        self.set_audio_data(None, duration)
+        self.loading = True
+    
+    def update_waveform_data(self, waveform_data, complete=False):
+        """Update waveform (parsial atau final) tanpa reset posisi"""
+        self.waveform_data = waveform_data
+        self.loading = not complete
+        self._invalidate()
+        if complete:
+            self._schedule_detail()
+    
+    def set_detail(self, start: float, end: float, peaks: WaveformPeaks):
+        """Set detail peaks untuk range waktu [start, end) detik"""
+        if self.duration <= 0 or peaks is None or peaks.filled == 0:
+            return
+        self.detail = (start / self.duration, end / self.duration, peaks)
+        self._invalidate()
+    
+    def set_markers(self, head_end: float, tail_start: float, onset: float):
+        """Tandai silence di awal/akhir dan onset pertama (detik)"""
+        self.markers = (head_end, tail_start, onset)
+        self.update()
+    
+    def set_progress(self, progress):
+        """Update progress (0..1) saat waveform masih dihitung"""
+        self.progress = progress
+        self.update(self._progress_text_rect())
+    
+    def set_position(self, position):
+        old_second = int(self.current_position)
+        old_x = self._position_to_x(self.current_position)
+        self.current_position = max(0.0, min(float(position), self.duration))
+        new_x = self._position_to_x(self.current_position)
+        
+        # Saat zoom, ikuti playhead per halaman jika keluar dari view
+        span = self.view_end - self.view_start
+        frac = self.current_position / self.duration if self.duration > 0 else 0.0
+        if span < 1.0 and 0 <= old_x <= self.width() and not (self.view_start <= frac <= self.view_end):
+            self._set_view(frac, frac + span)
+            return
+        
+        # Repaint hanya strip lama dan baru dari playhead
+        if new_x != old_x:
+            margin = self.PLAYHEAD_WIDTH + 1
+            left = min(old_x, new_x) - margin
+            self.update(QRect(left, 0, abs(new_x - old_x) + 2 * margin, self.height()))
+        if int(self.current_position) != old_second:
+            self.update(self.TIME_TEXT_RECT)
+    
+    def reset_zoom(self):
+        self._set_view(0.0, 1.0)
+    
+    def _invalidate(self):
+        self._pixmap = None
+        self.update()
+    
+    def resizeEvent(self, event):
+        self._pixmap = None
+        super().resizeEvent(event)
+        self._schedule_detail()
+    
+    def _progress_text_rect(self) -> QRect:
+        return QRect(self.width() - self.PROGRESS_TEXT_WIDTH, 0, self.PROGRESS_TEXT_WIDTH, 28)
+    
+    # ---- View mapping ----------------------------------------------------
+    
+    def _position_to_x(self, position: float) -> int:
+        if self.duration <= 0:
+            return 0
+        frac = position / self.duration
+        return int((frac - self.view_start) / (self.view_end - self.view_start) * self.width())
+    
+    def _x_to_frac(self, x: float) -> float:
+        return self.view_start + (x / max(self.width(), 1)) * (self.view_end - self.view_start)
+    
+    def _set_view(self, start: float, end: float):
+        """Set visible range (fraksi) dengan clamp ke timeline dan zoom maksimum"""
+        min_span = min(self.MIN_VIEW_SECONDS / self.duration, 1.0) if self.duration > 0 else 1.0
+        span = min(max(end - start, min_span), 1.0)
+        start = min(max(start, 0.0), 1.0 - span)
+        if (start, start + span) == (self.view_start, self.view_end):
+            return
+        self.view_start, self.view_end = start, start + span
+        self._invalidate()
+        self._schedule_detail()
+    
+    def wheelEvent(self, event):
+        if self.waveform_data is None:
+            return
+        delta = event.angleDelta().y() or event.angleDelta().x()
+        if delta == 0:
+            return
+        span = self.view_end - self.view_start
+        
+        if event.modifiers() & Qt.ShiftModifier or event.angleDelta().x():
+            # Pan
+            shift = -span * 0.1 * (delta / 120)
+            self._set_view(self.view_start + shift, self.view_end + shift)
+        else:
+            # Zoom dengan anchor di posisi cursor
+            anchor = self._x_to_frac(event.pos().x())
+            factor = self.ZOOM_STEP ** (-delta / 120)
+            new_span = span * factor
+            ratio = (anchor - self.view_start) / span if span > 0 else 0.5
+            start = anchor - ratio * new_span
+            self._set_view(start, start + new_span)
+        event.accept()
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_x = event.pos().x()
+        super().mousePressEvent(event)
+    
+    def mouseMoveEvent(self, event):
+        if self._drag_x is not None and event.buttons() & Qt.LeftButton:
+            dx = event.pos().x() - self._drag_x
+            self._drag_x = event.pos().x()
+            shift = -dx / max(self.width(), 1) * (self.view_end - self.view_start)
+            self._set_view(self.view_start + shift, self.view_end + shift)
+        super().mouseMoveEvent(event)
+    
+    def mouseReleaseEvent(self, event):
+        self._drag_x = None
+        super().mouseReleaseEvent(event)
+    
+    def mouseDoubleClickEvent(self, event):
+        self.reset_zoom()
+    
+    # ---- Detail on demand ------------------------------------------------
+    
+    def _needs_detail(self) -> bool:
+        """True jika pyramid terlalu kasar untuk view sekarang"""
+        if self.waveform_data is None or self.loading or self.duration <= 0.1:
+            return False
+        span = self.view_end - self.view_start
+        columns = self.width() * self.devicePixelRatioF()
+        if len(self.waveform_data.base) * span >= columns:
+            return False
+        if self.detail is not None:
+            d_start, d_end, peaks = self.detail
+            covered = d_start <= self.view_start and self.view_end <= d_end
+            if covered and len(peaks) / (d_end - d_start) * span >= columns:
+                return False
+        return True
+    
+    def _schedule_detail(self):
+        if self._needs_detail():
+            self._detail_timer.start()
+    
+    def _request_detail(self):
+        if not self._needs_detail():
+            return
+        # Decode range sedikit lebih lebar dari view supaya pan tidak langsung butuh decode baru
+        span = self.view_end - self.view_start
+        start = max(self.view_start - span * 0.5, 0.0)
+        end = min(self.view_end + span * 0.5, 1.0)
+        columns = self.width() * self.devicePixelRatioF()
+        buckets = int(min(columns * 2 * (end - start) / span, self.MAX_DETAIL_BUCKETS))
+        self.detail_requested.emit(start * self.duration, end * self.duration, max(buckets, 1))
+    
+    # ---- Rendering -------------------------------------------------------
+    
+    def _source_peaks(self, columns: int) -> Tuple[WaveformPeaks, float, float]:
+        """Pilih data untuk view: detail jika ada dan lebih rapat, selain itu level pyramid
+        
+        Return (peaks, range_start, range_end) dengan range sebagai fraksi timeline.
+        """
+        span = self.view_end - self.view_start
+        level = self.waveform_data.level_for_width(columns / span)
+        if self.detail is not None:
+            d_start, d_end, peaks = self.detail
+            covered = d_start <= self.view_start and self.view_end <= d_end
+            if covered and len(peaks) / (d_end - d_start) > len(level):
+                return peaks, d_start, d_end
+        return level, 0.0, 1.0
+    
+    def _column_peaks(self, columns: int):
+        """Min/max/RMS per kolom pixel untuk visible range
+        
+        Return (mins, maxs, rms, filled_columns). Cost hanya bergantung pada
+        jumlah kolom, bukan panjang track.
+        """
+        peaks, range_start, range_end = self._source_peaks(columns)
+        n = len(peaks)
+        lo = (self.view_start - range_start) / (range_end - range_start) * n
+        hi = (self.view_end - range_start) / (range_end - range_start) * n
+        
+        starts = np.floor(lo + np.arange(columns) * ((hi - lo) / columns)).astype(np.int64)
+        starts = np.clip(starts, 0, n - 1)
+        end = int(min(max(np.ceil(hi), starts[-1] + 1), n))
+        
+        # reduceat: jika starts[i] >= starts[i+1] (zoom melebihi resolusi data),
+        # kolom tersebut memakai satu bucket saja
+        mins = np.minimum.reduceat(peaks.mins[:end], starts)
+        maxs = np.maximum.reduceat(peaks.maxs[:end], starts)
+        rms = np.maximum.reduceat(peaks.rms[:end], starts)
+        
+        # Kolom yang masih berisi bucket belum lengkap (hasil parsial) tidak digambar
+        column_ends = np.maximum(np.append(starts[1:], end), starts + 1)
+        filled = int(np.searchsorted(column_ends, peaks.filled, side='right'))
+        return mins, maxs, rms, filled
+    
+    def _render_waveform(self) -> QPixmap:
+        """Render waveform ke pixmap dengan ukuran pixel fisik"""
+        dpr = self.devicePixelRatioF()
+        width_px = max(int(self.width() * dpr), 1)
+        height_px = max(int(self.height() * dpr), 1)
+        
+        pixmap = QPixmap(width_px, height_px)
+        pixmap.fill(self.bg_color)
+        
+        mins, maxs, rms, filled = self._column_peaks(width_px)
+        if filled > 0:
+            center_y = height_px / 2
+            # Normalisasi ke peak file, bukan ke level, supaya konsisten saat resize/zoom
+            scale = (height_px / 2 * 0.8) / max(self.waveform_data.base.peak(), 1e-6)
             
+            xs = np.arange(filled) + 0.5
+            tops = center_y - maxs[:filled] * scale
+            bottoms = center_y - mins[:filled] * scale
+            rms_half = rms[:filled] * scale
+            
+            painter = QPainter(pixmap)
+            painter.setPen(QPen(self.waveform_color, 1))
+            painter.drawLines([QLineF(x, t, x, b) for x, t, b in zip(xs, tops, bottoms)])
+            painter.setPen(QPen(self.rms_color, 1))
+            painter.drawLines([QLineF(x, center_y - r, x, center_y + r) for x, r in zip(xs, rms_half)])
+            painter.end()
+        
+        pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        
+        has_data = (self.waveform_data is not None and self.width() > 0
+                    and self.waveform_data.base.filled > 0)
+        if not has_data:
+            painter.fillRect(self.rect(), self.bg_color)
+            painter.setPen(self.text_color)
+            text = "Generating waveform..." if self.loading else "No audio data"
+            painter.drawText(self.rect(), Qt.AlignCenter, text)
+            return
+        
+        key = (id(self.waveform_data), id(self.detail), self.view_start, self.view_end,
+               self.width(), self.height(), self.devicePixelRatioF())
+        if self._pixmap is None or self._pixmap_key != key:
+            self._pixmap = self._render_waveform()
+            self._pixmap_key = key
+        
+        # Blit hanya area yang perlu di-repaint
+        painter.drawPixmap(QRectF(event.rect()), self._pixmap, self._source_rect(event.rect()))
+        
+        height = self.height()
+        
+        # Silence di awal/akhir digelapkan, onset pertama ditandai garis putus-putus
+        if self.markers is not None and self.duration > 0:
+            head_end, tail_start, onset = self.markers
+            head_x = self._position_to_x(head_end)
+            tail_x = self._position_to_x(tail_start)
+            if head_x > 0:
+                painter.fillRect(QRect(0, 0, head_x, height), self.silence_color)
+            if tail_x < self.width():
+                painter.fillRect(QRect(tail_x, 0, self.width() - tail_x, height), self.silence_color)
+            onset_x = self._position_to_x(onset)
+            painter.setPen(QPen(self.onset_color, 1, Qt.DashLine))
+            painter.drawLine(onset_x, 0, onset_x, height)
+        
+        # Draw playhead
+        if self.duration > 0:
+            pos_x = self._position_to_x(self.current_position)
+            painter.setPen(QPen(self.playhead_color, self.PLAYHEAD_WIDTH))
+            painter.drawLine(pos_x, 0, pos_x, height)
+        
+        # Draw time
+        painter.setPen(self.text_color)
+        current_time = str(timedelta(seconds=int(self.current_position)))[2:7]
+        total_time = str(timedelta(seconds=int(self.duration)))[2:7]
+        painter.drawText(10, 20, f"{current_time} / {total_time}")
+        if self.loading:
+            painter.drawText(self.rect().adjusted(0, 4, -10, 0), Qt.AlignRight | Qt.AlignTop,
+                             f"Generating waveform... {int(self.progress * 100)}%")
+        
+        # Visible range saat zoom
+        if self.view_end - self.view_start < 1.0:
+            view_text = (f"{self.view_start * self.duration:.3f}s – {self.view_end * self.duration:.3f}s"
+                         f"  (x{1.0 / (self.view_end - self.view_start):.0f})")
+            painter.drawText(self.rect().adjusted(10, 0, 0, -6), Qt.AlignLeft | Qt.AlignBottom, view_text)
+    
+    def _source_rect(self, rect: QRect) -> QRectF:
+        """Convert rect widget (logical) ke rect pixmap (physical)"""
+        dpr = self._pixmap.devicePixelRatioF()
+        return QRectF(rect.x() * dpr, rect.y() * dpr, rect.width() * dpr, rect.height() * dpr)
+
+
+# ============================================================================
+# BATCH AUDIO EXTRACTION
+# ============================================================================
+
+# Format output: (extension, argumen encoder ffmpeg, muxer)
+BATCH_EXTRACT_FORMATS = {
+    "WAV (16-bit PCM)": ("wav", ["-c:a", "pcm_s16le"], "wav"),
+    "FLAC": ("flac", ["-c:a", "flac"], "flac"),
+    "MP3 (VBR ~190 kbps)": ("mp3", ["-c:a", "libmp3lame", "-q:a", "2"], "mp3"),
+}
+# Preset convert untuk Quick Export (format seragam untuk NLE)
+EXPORT_TRANSCODE_FORMATS = {
+    "WAV 48 kHz / 24-bit": ("wav", ["-c:a", "pcm_s24le", "-ar", "48000"], "wav"),
+    "WAV 48 kHz / 16-bit": ("wav", ["-c:a", "pcm_s16le", "-ar", "48000"], "wav"),
+    "FLAC 48 kHz": ("flac", ["-c:a", "flac", "-ar", "48000"], "flac"),
+    "MP3 320 kbps": ("mp3", ["-c:a", "libmp3lame", "-b:a", "320k"], "mp3"),
+    "AAC 256 kbps (M4A)": ("m4a", ["-c:a", "aac", "-b:a", "256k"], "ipod"),
+}
+BATCH_EXTRACT_WORKERS = max(1, os.cpu_count() or 1)
+BATCH_PROGRESS_INTERVAL = 0.2
+
+
+@dataclass
+class BatchExtractJob:
+    """Satu file dalam batch extraction/convert"""
+    job_id: int
+    source_path: str
+    output_path: str
+    status: str = "Queued"       # Queued, Running, Done, Failed, Cancelled
+    progress: float = 0.0
+    message: str = ""
+
+
+class BatchExtractionManager(QObject):
+    """Extract audio dari banyak video sekaligus
+    
+    Setiap job adalah satu proses ffmpeg yang dijalankan sebagai task
+    indexing di TaskScheduler; max_workers membatasi berapa proses yang
+    berjalan bersamaan (default: jumlah core). Output ditulis ke file
+    sementara lalu di-rename saat selesai.
+    """
+    
+    job_started = pyqtSignal(int)
+    job_progress = pyqtSignal(int, float)
+    job_finished = pyqtSignal(int, str, str)   # job_id, status, message
+    all_finished = pyqtSignal()
+    
+    formats = BATCH_EXTRACT_FORMATS
+    task_label = "batch extract"
+    
+    def __init__(self, video_paths: List[str], target_folder: str, format_name: str,
+                 max_workers: int = BATCH_EXTRACT_WORKERS, parent=None):
+        super().__init__(parent)
+        self.target_folder = target_folder
+        self.format_name = format_name
+        self.max_workers = max_workers
+        self.cancel_token = CancelToken()
+        
+        ext = self.formats[format_name][0]
+        os.makedirs(target_folder, exist_ok=True)
+        try:
+            reserved = {name.lower() for name in os.listdir(target_folder)}
+        except OSError:
+            reserved = set()
+        self.jobs = [BatchExtractJob(i, path, unique_output_path(target_folder, Path(path).stem, ext, reserved))
+                     for i, path in enumerate(video_paths)]
+        
+        self._remaining = 0
+        self._lock = threading.Lock()
+    
+    def start(self):
+        self._remaining = len(self.jobs)
+        if not self.jobs:
+            self.all_finished.emit()
+            return
+        TaskLanes(self._run_job, self.jobs, self.max_workers, TASK_INDEXING, "cpu", self.task_label).start()
+    
+    def cancel(self):
+        """Batalkan job yang belum selesai; proses ffmpeg yang berjalan di-kill"""
+        self.cancel_token.cancel()
+    
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._remaining > 0
+    
+    def _run_job(self, job: BatchExtractJob):
+        try:
+            if self.cancel_token.is_cancelled():
+                job.status, job.message = "Cancelled", ""
+            else:
+                job.status = "Running"
+                self.job_started.emit(job.job_id)
+                self._extract(job)
+        except Exception as e:
+            job.status, job.message = "Failed", str(e)
+        
+        self.job_finished.emit(job.job_id, job.status, job.message)
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last:
+            self.all_finished.emit()
+    
+    def _extract(self, job: BatchExtractJob):
+        ext, codec_args, muxer = self.formats[self.format_name]
+        tmp_path = os.path.join(self.target_folder, f".{Path(job.output_path).name}.{os.getpid()}.part")
+        try:
+            if get_ffmpeg_exe():
+                ok = self._extract_ffmpeg(job, codec_args, muxer, tmp_path)
+            else:
+                ok = self._extract_moviepy(job, ext, tmp_path)
+            if ok:
+                os.replace(tmp_path, job.output_path)
+                job.status, job.progress = "Done", 1.0
+                job.message = Path(job.output_path).name
+        finally:
+            if job.status != "Done":
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    
+    def _extract_ffmpeg(self, job: BatchExtractJob, codec_args: List[str], muxer: str, tmp_path: str) -> bool:
+        # Audio yang sudah ada di extraction cache dipakai sebagai input WAV
+        # (16-bit PCM rate asli; bisa langsung dicopy jika formatnya sama)
+        source = get_extraction_cache().lookup(job.source_path) or job.source_path
+        if source != job.source_path and muxer == "wav" and codec_args == ["-c:a", "pcm_s16le"]:
+            shutil.copyfile(source, tmp_path)
+            return True
+        
+        duration = AudioAnalyzer.probe_duration(source)
+        args = ["-y", "-i", source, "-map", "0:a:0", "-vn", "-sn", "-dn",
+                *codec_args, "-f", muxer, "-progress", "pipe:1", "-nostats", tmp_path]
+        proc = popen_ffmpeg(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        # stderr dibaca di thread terpisah supaya pipe tidak penuh
+        stderr_tail = []
+        reader = threading.Thread(target=lambda: stderr_tail.extend(proc.stderr.read().splitlines()[-3:]),
+                                  daemon=True)
+        reader.start()
+        
+        last_emit = 0.0
+        try:
+            for line in proc.stdout:
+                if self.cancel_token.is_cancelled():
+                    proc.kill()
+                    break
+                if line.startswith(b"out_time_us=") and duration > 0:
+                    try:
+                        seconds = int(line.split(b"=", 1)[1]) / 1_000_000
+                    except ValueError:
+                        continue
+                    job.progress = min(max(seconds / duration, 0.0), 1.0)
+                    now = time.monotonic()
+                    if now - last_emit >= BATCH_PROGRESS_INTERVAL:
+                        last_emit = now
+                        self.job_progress.emit(job.job_id, job.progress)
+            proc.wait()
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            reader.join(timeout=1)
+        
+        if self.cancel_token.is_cancelled():
+            job.status = "Cancelled"
+            return False
+        if proc.returncode != 0:
+            job.status = "Failed"
+            detail = b" ".join(stderr_tail).decode("utf-8", "replace").strip()
+            # -map 0:a:0 gagal jika file tidak punya audio stream
+            job.message = "No audio track" if not detail or "0:a:0" in detail else detail
+            return False
+        return True
+    
+    def _extract_moviepy(self, job: BatchExtractJob, ext: str, tmp_path: str) -> bool:
+        # MoviePy memilih codec dari extension, jadi tulis ke nama dengan extension asli
+        tmp_named = f"{tmp_path}.{ext}"
+        try:
+            result = AudioAnalyzer.extract_audio_from_video(job.source_path, tmp_named)
+            if self.cancel_token.is_cancelled():
+                job.status = "Cancelled"
+                return False
+            if not result:
+                job.status, job.message = "Failed", "Audio extraction failed"
+                return False
+            os.replace(tmp_named, tmp_path)
+            return True
+        finally:
+            try:
+                os.remove(tmp_named)
+            except OSError:
+                pass
+
+
+class JobProgressDialog(QDialog):
+    """Dialog progress untuk job manager (batch extraction, export)
+    
+    Manager harus punya signal job_started(int), job_progress(int, float),
+    job_finished(int, str, str), all_finished() serta method cancel() dan
+    is_running().
+    """
+    
+    def __init__(self, title: str, names: List[str], parent=None):
+        super().__init__(parent)
+        self.names = names
+        self.manager = None
+        self.progress_bars = {}
+        self.started_at = time.time()
+        self.done_count = 0
+        self.failed_count = 0
+        self.cancelled_count = 0
+        self.skipped_count = 0
+        
+        self.setWindowTitle(title)
+        self.resize(720, 460)
+        self.main_layout = QVBoxLayout(self)
+        
+        # Daftar job
+        self.table = QTableWidget(len(names), 3)
+        self.table.setHorizontalHeaderLabels(["File", "Progress", "Status"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        for row, name in enumerate(names):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            bar = QProgressBar()
+            bar.setRange(0, 1000)
+            bar.setTextVisible(False)
+            bar.setMaximumHeight(14)
+            self.table.setCellWidget(row, 1, bar)
+            self.progress_bars[row] = bar
+            self.table.setItem(row, 2, QTableWidgetItem("Queued"))
+        self.main_layout.addWidget(self.table)
+        
+        # Progress total dan tombol
+        self.button_layout = QHBoxLayout()
+        self.overall_bar = QProgressBar()
+        self.overall_bar.setRange(0, max(len(names), 1))
+        self.overall_bar.setValue(0)
+        self.overall_bar.setFormat("%v / %m")
+        self.button_layout.addWidget(self.overall_bar, 1)
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.clicked.connect(self._cancel_or_close)
+        self.button_layout.addWidget(self.btn_cancel)
+        self.main_layout.addLayout(self.button_layout)
+        
+        self.lbl_summary = QLabel("")
+        self.lbl_summary.setStyleSheet("color: #888; font-style: italic;")
+        self.main_layout.addWidget(self.lbl_summary)
+    
+    def attach(self, manager):
+        """Hubungkan signal manager ke dialog lalu start manager"""
+        self.manager = manager
+        self.started_at = time.time()
+        manager.job_started.connect(self._on_job_started)
+        manager.job_progress.connect(self._on_job_progress)
+        manager.job_finished.connect(self._on_job_finished)
+        manager.all_finished.connect(self._on_all_finished)
+        self.btn_cancel.setText("Cancel")
+        manager.start()
+    
+    def _on_job_started(self, job_id: int):
+        self.table.item(job_id, 2).setText("Running")
+    
+    def _on_job_progress(self, job_id: int, progress: float):
+        self.progress_bars[job_id].setValue(int(progress * 1000))
+    
+    def _on_job_finished(self, job_id: int, status: str, message: str):
+        item = self.table.item(job_id, 2)
+        item.setText(status)
+        item.setToolTip(message)
+        if status == "Failed":
+            self.failed_count += 1
+            print(f"✗ {self.names[job_id]}: {message}")
+        elif status == "Cancelled":
+            self.cancelled_count += 1
+        elif status == "Skipped":
+            self.progress_bars[job_id].setValue(1000)
+            self.skipped_count += 1
+        else:
+            self.progress_bars[job_id].setValue(1000)
+            self.done_count += 1
+        self.overall_bar.setValue(self.overall_bar.value() + 1)
+    
+    def summary_text(self) -> str:
+        summary = f"{self.done_count} done, {self.failed_count} failed"
+        if self.skipped_count:
+            summary += f", {self.skipped_count} unchanged"
+        if self.cancelled_count:
+            summary += f", {self.cancelled_count} cancelled"
+        return summary
+    
+    def _on_all_finished(self):
+        elapsed = time.time() - self.started_at
+        summary = self.summary_text()
+        self.lbl_summary.setText(f"{summary} in {elapsed:.1f}s")
+        print(f"✓ {self.windowTitle()} finished: {summary}")
+        self.btn_cancel.setEnabled(True)
+        self.btn_cancel.setText("Close")
+    
+    def _cancel_or_close(self):
+        if self.manager is not None and self.manager.is_running():
+            self.manager.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.lbl_summary.setText("Cancelling...")
+            return
+        self.accept()
+    
+    def closeEvent(self, event):
+        if self.manager is not None and self.manager.is_running():
+            self.manager.cancel()
+        super().closeEvent(event)
+
+
+class BatchExtractDialog(JobProgressDialog):
+    """Dialog untuk extract audio dari banyak video dengan progress per file"""
+    
+    def __init__(self, video_paths: List[str], default_folder: str = "", parent=None):
+        super().__init__(f"Extract Audio - {len(video_paths)} video(s)",
+                         [Path(path).name for path in video_paths], parent)
+        self.video_paths = video_paths
+        
+        # Folder tujuan dan format
+        options = QHBoxLayout()
+        self.folder_input = QLineEdit(default_folder or str(Path.home()))
+        options.addWidget(QLabel("Target:"))
+        options.addWidget(self.folder_input, 1)
+        self.btn_browse = QPushButton("📁 Browse")
+        self.btn_browse.clicked.connect(self._browse_folder)
+        options.addWidget(self.btn_browse)
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(list(BATCH_EXTRACT_FORMATS.keys()))
+        options.addWidget(self.format_combo)
+        self.main_layout.insertLayout(0, options)
+        
+        self.btn_start = QPushButton("▶ Start")
+        self.btn_start.clicked.connect(self._start)
+        self.button_layout.insertWidget(1, self.btn_start)
+    
+    def _browse_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Target Folder", self.folder_input.text())
+        if folder:
+            self.folder_input.setText(folder)
+    
+    def _start(self):
+        folder = self.folder_input.text().strip()
+        if not folder or not os.path.isdir(folder):
+            QMessageBox.warning(self, "Extract Audio", "Please select an existing target folder")
+            return
+        
+        self.btn_start.setEnabled(False)
+        self.btn_browse.setEnabled(False)
+        self.folder_input.setEnabled(False)
+        self.format_combo.setEnabled(False)
+        
+        manager = BatchExtractionManager(self.video_paths, folder, self.format_combo.currentText(), parent=self)
+        print(f"Batch extraction: {len(self.video_paths)} file(s) -> {folder} "
+              f"({manager.max_workers} workers)")
+        self.attach(manager)
+    
+    def summary_text(self) -> str:
+        return super().summary_text().replace(" done,", " extracted,", 1)
+
+
+class TranscodeExportManager(BatchExtractionManager):
+    """Convert file audio/video ke satu format seragam (mis. WAV 48 kHz untuk NLE)
+    
+    Pakai pipeline yang sama dengan batch extraction: proses ffmpeg dibatasi
+    jumlah core, progress per file, output atomic lewat file .part.
+    """
+    
+    formats = EXPORT_TRANSCODE_FORMATS
+    task_label = "convert export"
+    
+    def _extract(self, job: BatchExtractJob):
+        # MoviePy fallback hanya bisa extract dari video, bukan convert
+        if not get_ffmpeg_exe():
+            job.status, job.message = "Failed", "ffmpeg not found"
+            return
+        super()._extract(job)
+
+
+class TranscodeExportDialog(JobProgressDialog):
+    """Dialog progress non-modal untuk TranscodeExportManager"""
+    
+    def __init__(self, manager: TranscodeExportManager, parent=None):
+        super().__init__(f"Convert Export ({manager.format_name}) - {len(manager.jobs)} file(s) "
+                         f"to {Path(manager.target_folder).name}",
+                         [Path(job.output_path).name for job in manager.jobs], parent)
+        self.setModal(False)
+    
+    def summary_text(self) -> str:
+        return super().summary_text().replace(" done,", " converted,", 1)
+
+
+# ============================================================================
+# EXPORT ENGINE
+# ============================================================================
+
+EXPORT_WORKERS = 4
+# Toleransi mtime untuk sync (FAT/exFAT menyimpan mtime dengan resolusi 2 detik)
+SYNC_MTIME_TOLERANCE_NS = 2_000_000_000
+
+
+class SyncManifest:
+    """Manifest per folder tujuan untuk sync export
+    
+    Menyimpan stat source dan file tujuan (plus hash opsional) per source path,
+    sehingga export ulang cukup stat pass untuk file yang tidak berubah.
+    Disimpan di cache dir, bukan di folder project.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, target_folder: str):
+        self.target_folder = os.path.abspath(target_folder)
+        key = hashlib.sha1(os.path.normcase(self.target_folder).encode("utf-8", "surrogatepass")).hexdigest()
+        self.path = get_cache_dir("export_manifests") / f"{key}.json"
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
         try:
-            print(f"Extracting audio from: {video_path}")
-            
-            # Buat temporary file untuk audio
-            temp_dir = tempfile.gettempdir()
-            video_name = Path(video_path).stem
-            safe_name = ''.join(c for c in video_name if c.isalnum() or c in '._- ')
-            audio_filename = f"extracted_{safe_name}_{int(time.time())}.wav"
-            audio_path = os.path.join(temp_dir, audio_filename)
-            
-            print(f"Output audio path: {audio_path}")
-            
-            # Extract audio menggunakan moviepy
-            video = mp.VideoFileClip(video_path)
-            if video.audio is not None:
-                print("✓ Video has audio track, extracting...")
-                video.audio.write_audiofile(audio_path, verbose=False, logger=None)
-                video.close()
-                print(f"✓ Audio extraction successful: {audio_path}")
-                return audio_path
-            else:
-                print("✗ Video has no audio track")
-                video.close()
-                return None
-        except Exception as e:
-            print(f"✗ Error extracting audio from video: {e}")
-            return None
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION and data.get("folder") == self.target_folder:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
     
-    @staticmethod
-    def get_audio_duration(file_path: str) -> float:
-        """Get duration dari file audio/video"""
+    def get(self, source_path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.entries.get(os.path.abspath(source_path))
+    
+    def owner_of(self, name: str) -> Optional[str]:
+        """Source path yang memiliki nama file tujuan ini"""
+        lower = name.lower()
+        with self._lock:
+            for source, entry in self.entries.items():
+                if entry.get("name", "").lower() == lower:
+                    return source
+        return None
+    
+    def record(self, source_path: str, name: str, src_stat: os.stat_result,
+               dst_stat: os.stat_result, content_hash: Optional[str] = None):
+        entry = {
+            "name": name,
+            "size": src_stat.st_size,
+            "mtime_ns": src_stat.st_mtime_ns,
+            "dst_size": dst_stat.st_size,
+            "dst_mtime_ns": dst_stat.st_mtime_ns,
+        }
+        if content_hash:
+            entry["hash"] = content_hash
+        with self._lock:
+            self.entries[os.path.abspath(source_path)] = entry
+            self._dirty = True
+    
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": self.VERSION, "folder": self.target_folder, "entries": self.entries}
+            self._dirty = False
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
         try:
-            tag = tinytag.TinyTag.get(file_path)
-            duration = tag.duration if tag.duration is not None else 0.0
-            return float(duration) if duration is not None else 0.0
-        except Exception as e:
-            print(f"Error getting duration for {file_path}: {e}")
-            return 0.0
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving sync manifest: {e}")
+
+
+@dataclass
+class ExportJob:
+    """Satu file dalam export"""
+    job_id: int
+    source_path: str
+    output_path: str
+    size: int = 0
+    status: str = "Queued"       # Queued, Running, Done, Skipped, Failed, Cancelled
+    method: str = ""
+    message: str = ""
+
+
+class ExportEngine(QObject):
+    """Export banyak file ke satu folder di background
     
-    @staticmethod
-    def generate_waveform_data(file_path: str, num_points: int = 800) -> List[Tuple[float, float]]:
-        """Generate waveform data dari file audio untuk visualisasi"""
+    Copy berjalan paralel sebagai task indexing di TaskScheduler (I/O melepas
+    GIL), ditulis ke file .part lalu di-rename. Nama tujuan dibuat unik dari satu listing folder.
+    Mode hardlink/symlink fallback ke copy jika filesystem tidak mendukung.
+    
+    Dengan sync=True file tujuan memakai nama source (atau nama di manifest)
+    dan hanya file yang belum ada atau berubah yang di-export; perbandingan
+    pakai size + mtime, ditambah hash isi jika verify_hash=True.
+    """
+    
+    job_started = pyqtSignal(int)
+    job_progress = pyqtSignal(int, float)
+    job_finished = pyqtSignal(int, str, str)   # job_id, status, message
+    all_finished = pyqtSignal()
+    
+    def __init__(self, source_paths: List[str], target_folder: str, mode: str = "copy",
+                 sync: bool = False, verify_hash: bool = False,
+                 max_workers: int = EXPORT_WORKERS, parent=None):
+        super().__init__(parent)
+        self.target_folder = target_folder
+        self.mode = mode if mode in EXPORT_MODES else "copy"
+        self.sync = sync
+        self.verify_hash = verify_hash and sync
+        self.max_workers = max_workers
+        self.cancel_token = CancelToken()
+        self.manifest = SyncManifest(target_folder) if sync else None
+        
+        os.makedirs(target_folder, exist_ok=True)
         try:
-            # Untuk video files
-            video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v'}
-            is_video = Path(file_path).suffix.lower() in video_extensions
-            
-            if is_video and MOVIEPY_AVAILABLE and mp is not None:
-                extracted_audio = AudioAnalyzer.extract_audio_from_video(file_path)
-                if extracted_audio and os.path.exists(extracted_audio):
-                    try:
-                        data = AudioAnalyzer._read_wav_file(extracted_audio, num_points)
-                        # Cleanup
-                        try:
-                            os.remove(extracted_audio)
-                        except:
-                            pass
-                        return data
-                    except:
-                        pass
-            
-            if file_path.lower().endswith('.wav'):
-                return AudioAnalyzer._read_wav_file(file_path, num_points)
+            reserved = {name.lower() for name in os.listdir(target_folder)}
+        except OSError:
+            reserved = set()
+        claimed = set()
+        self.jobs = []
+        for i, path in enumerate(source_paths):
+            source = Path(path)
+            if sync:
+                output_path = self._sync_output_path(path, reserved, claimed)
             else:
-                return AudioAnalyzer._generate_simplified_waveform(file_path, num_points)
-                
-        except Exception as e:
-            print(f"Error generating waveform data: {e}")
-            return AudioAnalyzer._generate_dummy_waveform(num_points)
+                output_path = unique_output_path(target_folder, source.stem, source.suffix[1:], reserved)
+            try:
+                size = source.stat().st_size
+            except OSError:
+                size = 0
+            self.jobs.append(ExportJob(i, path, output_path, size))
+        
+        self._remaining = 0
+        self._lock = threading.Lock()
+        self._link_fallback_reported = False
     
-    @staticmethod
-    def _read_wav_file(file_path: str, num_points: int) -> List[Tuple[float, float]]:
-        """Read WAV file dan generate waveform data"""
+    def _sync_output_path(self, source_path: str, reserved: set, claimed: set) -> str:
+        """Nama tujuan untuk sync: nama dari manifest, lalu nama source;
+        nama unik hanya jika bentrok dengan source lain"""
+        entry = self.manifest.get(source_path)
+        if entry and entry["name"].lower() not in claimed:
+            name = entry["name"]
+        else:
+            source = Path(source_path)
+            name = source.name
+            owner = self.manifest.owner_of(name)
+            taken = name.lower() in claimed or (owner is not None and owner != os.path.abspath(source_path))
+            if taken:
+                # reserved berisi listing folder + nama yang sudah dipakai batch ini
+                name = Path(unique_output_path(self.target_folder, source.stem, source.suffix[1:],
+                                               reserved | claimed)).name
+        claimed.add(name.lower())
+        return os.path.join(self.target_folder, name)
+    
+    @property
+    def total_bytes(self) -> int:
+        return sum(job.size for job in self.jobs)
+    
+    def start(self):
+        self._remaining = len(self.jobs)
+        if not self.jobs:
+            self.all_finished.emit()
+            return
+        TaskLanes(self._run_job, self.jobs, self.max_workers, TASK_INDEXING, "disk", "export").start()
+    
+    def cancel(self):
+        """Batalkan export; file .part yang belum selesai dihapus"""
+        self.cancel_token.cancel()
+    
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._remaining > 0
+    
+    def _run_job(self, job: ExportJob):
         try:
-            with wave.open(file_path, 'rb') as wav_file:
-                n_frames = wav_file.getnframes()
-                sample_width = wav_file.getsampwidth()
-                frames = wav_file.readframes(n_frames)
-                
-                if n_frames == 0:
-                    return AudioAnalyzer._generate_dummy_waveform(num_points)
-                
-                if sample_width == 1:
-                    fmt = f"{n_frames}B"
-                    data = struct.unpack(fmt, frames)
-                    data = [(x - 128) / 128.0 for x in data]
-                elif sample_width == 2:
-                    fmt = f"{n_frames}h"
-                    data = struct.unpack(fmt, frames)
-                    data = [x / 32768.0 for x in data]
-                else:
-                    return AudioAnalyzer._generate_dummy_waveform(num_points)
-                
-                # Downsample
-                if len(data) > num_points * 10:
-                    step = len(data) // num_points
-                    data = data[::step]
-                
-                # Normalize
-                if data:
-                    max_abs = max(abs(min(data)), abs(max(data)))
-                    if max_abs > 0:
-                        data = [x / max_abs for x in data]
-                    
-                    # Convert to points
-                    points = []
-                    for i, val in enumerate(data[:num_points]):
-                        x = i / len(data[:num_points])
-                        points.append((x, val))
-                    return points
-                else:
-                    return AudioAnalyzer._generate_dummy_waveform(num_points)
-                    
+            if self.cancel_token.is_cancelled():
+                job.status = "Cancelled"
+            else:
+                job.status = "Running"
+                self.job_started.emit(job.job_id)
+                self._export(job)
         except Exception as e:
-            print(f"Error reading WAV file: {e}")
-            return AudioAnalyzer._generate_dummy_waveform(num_points)
+            job.status, job.message = "Failed", str(e)
+        
+        self.job_finished.emit(job.job_id, job.status, job.message)
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last:
+            if self.manifest is not None:
+                self.manifest.save()
+            self.all_finished.emit()
     
-    @staticmethod
-    def _generate_simplified_waveform(file_path: str, num_points: int) -> List[Tuple[float, float]]:
-        """Generate simplified waveform untuk non-WAV files"""
+    def _export(self, job: ExportJob):
+        if not self.sync:
+            self._transfer(job)
+            return
+        
+        src_stat = os.stat(job.source_path)
+        content_hash = self._sync_unchanged(job, src_stat)
+        if content_hash is not False:
+            job.status, job.method = "Skipped", "unchanged"
+        else:
+            content_hash = None
+            self._transfer(job)
+            if job.status != "Done":
+                return
+            if self.verify_hash:
+                content_hash = file_content_hash(job.source_path, self.cancel_token)
+        self.manifest.record(job.source_path, Path(job.output_path).name, src_stat,
+                             os.stat(job.output_path), content_hash)
+    
+    def _sync_unchanged(self, job: ExportJob, src_stat: os.stat_result):
+        """Return False jika file tujuan perlu di-export ulang, selain itu
+        hash isi (atau None tanpa verify_hash)"""
         try:
-            duration = AudioAnalyzer.get_audio_duration(file_path)
-            
-            points = []
-            for i in range(num_points):
-                x = i / num_points
-                t = x * 20
-                y = (np.sin(t * np.pi * 2) * 0.5 + 
-                     np.sin(t * np.pi * 4) * 0.3 + 
-                     np.sin(t * np.pi * 8) * 0.2)
-                y += np.random.uniform(-0.1, 0.1)
-                points.append((x, y))
-            return points
-        except:
-            return AudioAnalyzer._generate_dummy_waveform(num_points)
+            dst_stat = os.stat(job.output_path)
+        except OSError:
+            return False
+        if dst_stat.st_size != src_stat.st_size:
+            return False
+        
+        entry = self.manifest.get(job.source_path)
+        if entry is not None and entry["name"] == Path(job.output_path).name:
+            # Stat di manifest exact; perubahan apa pun berarti export ulang
+            known = (entry["size"] == src_stat.st_size
+                     and entry["mtime_ns"] == src_stat.st_mtime_ns
+                     and entry["dst_size"] == dst_stat.st_size
+                     and entry["dst_mtime_ns"] == dst_stat.st_mtime_ns)
+            unchanged = known
+        else:
+            # File tujuan tanpa manifest (export lama): cocokkan mtime dari copystat
+            known = False
+            unchanged = abs(dst_stat.st_mtime_ns - src_stat.st_mtime_ns) <= SYNC_MTIME_TOLERANCE_NS
+        
+        if not self.verify_hash:
+            return None if unchanged else False
+        
+        # Verify: hash source selalu dihitung, file tujuan cukup dibandingkan
+        # dengan hash di manifest jika stat-nya masih sama
+        source_hash = file_content_hash(job.source_path, self.cancel_token)
+        if source_hash is None:
+            return False
+        if known and entry.get("hash"):
+            dest_hash = entry["hash"]
+        else:
+            dest_hash = file_content_hash(job.output_path, self.cancel_token)
+        return source_hash if source_hash == dest_hash else False
     
-    @staticmethod
-    def _generate_dummy_waveform(num_points: int) -> List[Tuple[float, float]]:
-        """Generate dummy waveform data sebagai fallback"""
-        points = []
-        for i in range(num_points):
-            x = i / num_points
-            y = np.sin(x * np.pi * 8) * 0.7 + random.uniform(-0.1, 0.1)
-            points.append((x, y))
-        return points
+    def _transfer(self, job: ExportJob):
+        last_emit = [0.0]
+        
+        def on_progress(copied: int):
+            now = time.monotonic()
+            if job.size and now - last_emit[0] >= 0.1:
+                last_emit[0] = now
+                self.job_progress.emit(job.job_id, min(copied / job.size, 1.0))
+        
+        def on_link_error(e: OSError):
+            with self._lock:
+                report = not self._link_fallback_reported
+                self._link_fallback_reported = True
+            if report:
+                print(f"✗ {EXPORT_MODES[self.mode]} not possible ({e}), falling back to copy")
+        
+        method = transfer_file(job.source_path, job.output_path, self.mode,
+                               on_progress, self.cancel_token, on_link_error)
+        if method is None:
+            job.status = "Cancelled"
+        else:
+            job.status, job.method = "Done", method
+
+
+class ExportDialog(JobProgressDialog):
+    """Dialog progress non-modal untuk ExportEngine"""
+    
+    def __init__(self, engine: ExportEngine, parent=None):
+        title = "Sync Export" if engine.sync else "Export"
+        super().__init__(f"{title} - {len(engine.jobs)} file(s) to {Path(engine.target_folder).name}",
+                         [Path(job.output_path).name for job in engine.jobs], parent)
+        self.engine = engine
+        self.setModal(False)
+    
+    def summary_text(self) -> str:
+        summary = super().summary_text().replace(" done,", " exported,", 1)
+        methods = {}
+        for job in self.engine.jobs:
+            if job.status == "Done":
+                methods[job.method] = methods.get(job.method, 0) + 1
+        if methods:
+            summary += " (" + ", ".join(f"{n} {m}" for m, n in sorted(methods.items())) + ")"
+        return summary
+
+
+# ============================================================================
+# STARTUP PROFILING
+# ============================================================================
+
+class StartupProfiler:
+    """Catat waktu tiap fase startup (aktif dengan --startup-profile)"""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.marks = [("module imports", time.perf_counter())]
+        self.reported = False
+    
+    def mark(self, phase: str):
+        """Tandai akhir dari sebuah fase"""
+        if self.enabled:
+            self.marks.append((phase, time.perf_counter()))
+    
+    def report(self):
+        """Print durasi per fase, dihitung dari awal import main.py"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        print("=" * 60)
+        print("Startup profile")
+        print("-" * 60)
+        previous = _STARTUP_T0
+        for phase, timestamp in self.marks:
+            print(f"  {phase:<32} {(timestamp - previous) * 1000:8.1f} ms"
+                  f"  (total {(timestamp - _STARTUP_T0) * 1000:8.1f} ms)")
+            previous = timestamp
+        print("=" * 60)
+
+
+STARTUP_PROFILER = StartupProfiler()
 
 
 # ============================================================================
@@ -1459,8 +5574,8 @@ class AudioEverythingApp(QMainWindow):
         
         # Initialize components
         self.database = AudioDatabase("media_index.db")
+        STARTUP_PROFILER.mark("window: database")
         self.scanner_worker = None
-        self.scanner_thread = None
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self._perform_search)
@@ -1469,21 +5584,91 @@ class AudioEverythingApp(QMainWindow):
         self.audio_player = EnhancedAudioPlayer()
         self.audio_player.timer.timeout.connect(self._update_playback_ui)
         
+        # Semua background task (waveform, prefetch, scan, export) lewat satu scheduler
+        self.task_scheduler = get_task_scheduler()
+        self.task_panel = None
+        # Analisis background (silence, loudness, fingerprint) lewat scheduler
+        self.analysis_signals = AnalysisSchedulerSignals(self)
+        self.analysis_signals.progress.connect(self._on_analysis_progress)
+        self.analysis_signals.stored.connect(self._on_analysis_stored)
+        self.analysis_signals.idle.connect(self._on_analysis_idle)
+        self.analysis_scheduler = AnalysisScheduler(
+            self.database,
+            on_progress=self.analysis_signals.progress.emit,
+            on_stored=self.analysis_signals.stored.emit,
+            on_idle=self.analysis_signals.idle.emit,
+        )
+        self.last_analysis_refresh = 0.0
+        self.visible_rows_timer = QTimer(self)
+        self.visible_rows_timer.setSingleShot(True)
+        self.visible_rows_timer.setInterval(200)
+        self.visible_rows_timer.timeout.connect(self._prioritize_visible_rows)
+        self.similarity_index = SimilarityIndex()
+        # Find similar (fingerprint + load index) jalan sebagai task interactive
+        self.similar_signals = SimilarSearchSignals(self)
+        self.similar_signals.finished.connect(self._on_similar_found)
+        self.similar_signals.not_analyzable.connect(self._on_similar_not_analyzable)
+        self.similar_signals.error.connect(self._on_similar_error)
+        self.similar_token = None
+        self.similar_path = None
+        self.waveform_worker = None
+        self.waveform_job_id = 0
+        self.waveform_detail_worker = None
+        self.peak_cache = PeakCache()
+        self.proxy_cache = ProxyCache()
+        self.proxy_builder = ProxyBuilder(self.proxy_cache, self)
+        self.proxy_builder.proxy_ready.connect(self._on_proxy_ready)
+        self.current_preview_path = None
+        self.prefetcher = NeighborPrefetcher(self.peak_cache, clip_cache=self.audio_player.clip_cache,
+                                             parent=self)
+        STARTUP_PROFILER.mark("window: player + caches")
+        
         self.current_media_file = None
         self.playback_updating = False
         self.last_folder = str(Path.home())
+        self.export_mode = "copy"
+        self.export_sync = False
+        self.export_verify_hash = False
+        self.export_format = ""
+        self.export_dialogs = []
+        self._first_paint_done = False
+        self._initial_data_loaded = False
         
         self._setup_ui()
+        STARTUP_PROFILER.mark("window: build ui")
         self._setup_connections()
         self._load_settings()
+        STARTUP_PROFILER.mark("window: settings")
+        
+        # Index dimuat setelah window pertama kali di-paint (lihat paintEvent);
+        # fallback jika window belum pernah di-paint
+        QTimer.singleShot(1000, self._load_initial_data)
+        
+        print("✓ Application initialized successfully")
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            STARTUP_PROFILER.mark("first paint")
+            QTimer.singleShot(0, self._load_initial_data)
+    
+    def _load_initial_data(self):
+        """Load file dari database setelah window tampil"""
+        if self._initial_data_loaded:
+            return
+        self._initial_data_loaded = True
         
         # Load existing files
         self._load_existing_files()
         
         # Update file count
         self._update_file_count()
+        STARTUP_PROFILER.mark("index loaded")
+        STARTUP_PROFILER.report()
         
-        print("✓ Application initialized successfully")
+        # Fingerprint dan analisis loudness file baru di background
+        self._start_background_analysis()
     
     def _setup_ui(self):
         """Setup user interface"""
@@ -1559,7 +5744,7 @@ class AudioEverythingApp(QMainWindow):
         search_layout.setContentsMargins(0, 0, 0, 0)
         
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search audio/video files (fuzzy search enabled)...")
+        self.search_input.setPlaceholderText("Search audio/video files (fuzzy search, filters: lufs:-23..-16 peak:..-1 rms:-30.. dur:0.5..3)...")
         self.search_input.setClearButtonEnabled(True)
         self.search_input.textChanged.connect(self._on_search_text_changed)
         search_layout.addWidget(self.search_input)
@@ -1568,6 +5753,13 @@ class AudioEverythingApp(QMainWindow):
         self.btn_advanced_search.setMinimumWidth(100)
         search_layout.addWidget(self.btn_advanced_search)
         
+        self.btn_duplicates = QPushButton("🧬 Duplicates")
+        self.btn_duplicates.setCheckable(True)
+        self.btn_duplicates.setMinimumWidth(110)
+        self.btn_duplicates.setToolTip("Show files with identical content, grouped together")
+        self.btn_duplicates.toggled.connect(lambda _checked: self._perform_search())
+        search_layout.addWidget(self.btn_duplicates)
+        
         main_layout.addWidget(search_container)
         
         # 4. Progress bar
@@ -1590,78 +5782,15 @@ class AudioEverythingApp(QMainWindow):
             self._on_selection_changed
         )
         
+        # Baris yang terlihat diprioritaskan oleh analysis scheduler
+        self.table_view.verticalScrollBar().valueChanged.connect(self._schedule_visible_rows)
+        self.table_model.modelReset.connect(self._schedule_visible_rows)
+        
         main_layout.addWidget(self.table_view, 1)
         
         # 6. Waveform widget
-        class SimpleWaveformWidget(QWidget):
-            def __init__(self, parent=None):
-                super().__init__(parent)
-                self.waveform_data = []
-                self.duration = 0
-                self.current_position = 0
-                self.setMinimumHeight(100)
-                
-                # Colors
-                self.bg_color = QColor(25, 25, 30)
-                self.waveform_color = QColor(100, 180, 255, 200)
-                self.playhead_color = QColor(255, 50, 50, 220)
-                self.text_color = QColor(200, 200, 200)
-            
-            def set_audio_data(self, waveform_data, duration):
-                self.waveform_data = waveform_data
-                self.duration = max(float(duration), 0.1)
-                self.current_position = 0
-                self.update()
-            
-            def set_position(self, position):
-                self.current_position = max(0.0, min(float(position), self.duration))
-                self.update()
-            
-            def paintEvent(self, event):
-                painter = QPainter(self)
-                painter.setRenderHint(QPainter.Antialiasing)
-                painter.fillRect(self.rect(), self.bg_color)
-                
-                if not self.waveform_data or self.width() <= 0:
-                    painter.setPen(self.text_color)
-                    painter.drawText(self.rect(), Qt.AlignCenter, "No audio data")
-                    return
-                
-                height = self.height()
-                width = self.width()
-                center_y = height // 2
-                half_height = height // 2 * 0.8
-                
-                # Draw waveform
-                painter.setPen(QPen(self.waveform_color, 1.5))
-                path = QPainterPath()
-                
-                first = True
-                for x_ratio, amplitude in self.waveform_data:
-                    x = x_ratio * width
-                    y = center_y + (amplitude * half_height)
-                    
-                    if first:
-                        path.moveTo(x, y)
-                        first = False
-                    else:
-                        path.lineTo(x, y)
-                
-                painter.drawPath(path)
-                
-                # Draw playhead
-                if self.duration > 0:
-                    pos_x = int((self.current_position / self.duration) * width)
-                    painter.setPen(QPen(self.playhead_color, 2))
-                    painter.drawLine(pos_x, 0, pos_x, height)
-                
-                # Draw time
-                painter.setPen(self.text_color)
-                current_time = str(timedelta(seconds=int(self.current_position)))[2:7]
-                total_time = str(timedelta(seconds=int(self.duration)))[2:7]
-                painter.drawText(10, 20, f"{current_time} / {total_time}")
-        
         self.waveform_widget = SimpleWaveformWidget()
+        self.waveform_widget.detail_requested.connect(self._on_waveform_detail_requested)
         main_layout.addWidget(self.waveform_widget)
         
         # 7. Playback controls
@@ -1684,7 +5813,16 @@ class AudioEverythingApp(QMainWindow):
         self.chk_repeat.setToolTip("Repeat the current track")
         self.chk_repeat.stateChanged.connect(self._on_repeat_changed)
         
-        if MOVIEPY_AVAILABLE:
+        self.chk_proxy = QCheckBox("Preview Proxy")
+        self.chk_proxy.setChecked(True)
+        self.chk_proxy.setToolTip("Play long files from a small cached preview copy "
+                                  "(drag and export still use the original)")
+        
+        self.chk_skip_silence = QCheckBox("Skip Silence")
+        self.chk_skip_silence.setChecked(True)
+        self.chk_skip_silence.setToolTip("Start playback at the first onset instead of leading silence")
+        
+        if audio_extraction_available():
             self.btn_extract_audio = QPushButton("🎵 Extract Audio")
             self.btn_extract_audio.setToolTip("Extract audio from video files")
             playback_layout.addWidget(self.btn_extract_audio)
@@ -1703,12 +5841,23 @@ class AudioEverythingApp(QMainWindow):
         playback_layout.addWidget(self.btn_stop)
         playback_layout.addWidget(self.chk_autoplay)
         playback_layout.addWidget(self.chk_repeat)
+        playback_layout.addWidget(self.chk_proxy)
+        playback_layout.addWidget(self.chk_skip_silence)
         playback_layout.addWidget(self.playback_slider)
         playback_layout.addWidget(self.lbl_playback_time)
         
         main_layout.addWidget(playback_bar)
         
         # Status bar
+        self.btn_tasks = QPushButton("⚙ Tasks")
+        self.btn_tasks.setFlat(True)
+        self.btn_tasks.setToolTip("Show background task queues and throughput")
+        self.btn_tasks.clicked.connect(self._show_task_panel)
+        self.statusBar().addPermanentWidget(self.btn_tasks)
+        self.task_status_timer = QTimer(self)
+        self.task_status_timer.setInterval(1000)
+        self.task_status_timer.timeout.connect(self._update_task_status)
+        self.task_status_timer.start()
         self.statusBar().showMessage("Ready - Select files and drag to export")
         
         # Setup shortcuts
@@ -1735,7 +5884,7 @@ class AudioEverythingApp(QMainWindow):
         self.btn_pause.clicked.connect(self.pause_audio)
         self.btn_stop.clicked.connect(self.stop_audio)
         
-        if MOVIEPY_AVAILABLE and hasattr(self, 'btn_extract_audio'):
+        if hasattr(self, 'btn_extract_audio'):
             self.btn_extract_audio.clicked.connect(self._extract_current_audio)
     
     def _on_autoplay_changed(self, state):
@@ -1769,6 +5918,9 @@ class AudioEverythingApp(QMainWindow):
         1. Right-click on selected files
         2. Choose "🚀 Quick Export To"
         3. Select destination (Desktop, Documents, or Custom Folder)
+        4. Optional: "Export Mode" → Hard link / Symbolic link for near-instant export on the same drive
+        5. Optional: "Export Mode" → Sync to copy only new or changed files when re-exporting
+        6. Optional: "Convert To" → export in one format (e.g. WAV 48 kHz) instead of the originals
         
         <b>Supported Applications:</b>
         • Capcut (video editing)
@@ -1798,12 +5950,30 @@ class AudioEverythingApp(QMainWindow):
         
         # Last folder
         self.last_folder = settings.value("last_folder", str(Path.home()))
+        self.last_extract_folder = settings.value("last_extract_folder", "")
+        self.export_mode = settings.value("export_mode", "copy")
+        if self.export_mode not in EXPORT_MODES:
+            self.export_mode = "copy"
+        self.export_sync = settings.value("export_sync", False, type=bool)
+        self.export_verify_hash = settings.value("export_verify_hash", False, type=bool)
+        self.export_format = settings.value("export_format", "")
+        if self.export_format not in EXPORT_TRANSCODE_FORMATS:
+            self.export_format = ""
+        self.chk_proxy.setChecked(settings.value("use_proxies", True, type=bool))
+        self.chk_skip_silence.setChecked(settings.value("skip_silence", True, type=bool))
     
     def _save_settings(self):
         """Save application settings"""
         settings = QSettings("AudioEverythingPro", "AudioEverything")
         settings.setValue("geometry", self.saveGeometry())
         settings.setValue("last_folder", self.last_folder)
+        settings.setValue("last_extract_folder", self.last_extract_folder)
+        settings.setValue("export_mode", self.export_mode)
+        settings.setValue("export_sync", self.export_sync)
+        settings.setValue("export_verify_hash", self.export_verify_hash)
+        settings.setValue("export_format", self.export_format)
+        settings.setValue("use_proxies", self.chk_proxy.isChecked())
+        settings.setValue("skip_silence", self.chk_skip_silence.isChecked())
     
     def _load_existing_files(self):
         """Load existing files dari database saat startup"""
@@ -1826,8 +5996,12 @@ class AudioEverythingApp(QMainWindow):
     def _perform_search(self):
         """Perform search"""
         query = self.search_input.text().strip()
+        # Hasil find similar yang masih berjalan tidak boleh menimpa hasil search
+        self._cancel_similar_search()
         
-        if not query:
+        if self.btn_duplicates.isChecked():
+            self._show_duplicates(query)
+        elif not query:
             files = self.database.get_all_files()
             self.table_model.set_files(files)
         else:
@@ -1836,6 +6010,166 @@ class AudioEverythingApp(QMainWindow):
         
         self._update_file_count()
     
+    def _show_duplicates(self, query: str = ""):
+        """Tampilkan grup file dengan isi identik; query memfilter grup berdasarkan nama"""
+        files = self.database.get_duplicate_files()
+        if query:
+            needle = query.lower()
+            matching = {f.content_hash for f in files if needle in f.filename.lower()}
+            files = [f for f in files if f.content_hash in matching]
+        
+        groups = {}
+        for media_file in files:
+            groups.setdefault(media_file.content_hash, []).append(media_file)
+        wasted = sum(members[0].size * (len(members) - 1) for members in groups.values())
+        
+        self.table_model.set_files(files, grouped=True)
+        self.lbl_status.setText(f"{len(groups)} duplicate group(s), "
+                                f"{wasted / (1024 * 1024):.1f} MB in redundant copies")
+    
+    def _start_background_analysis(self):
+        """Antrikan analisis untuk file baru/berubah (dispatcher dimulai saat pertama kali)"""
+        if self.analysis_scheduler.is_running():
+            self.analysis_scheduler.enqueue()
+        else:
+            self.analysis_scheduler.start()
+        self._prioritize_visible_rows()
+    
+    def _schedule_visible_rows(self, *args):
+        self.visible_rows_timer.start()
+    
+    def _prioritize_visible_rows(self):
+        """Baris yang sedang terlihat (dan file yang dipilih) dianalisis lebih dulu"""
+        rows = self.table_model.rowCount()
+        if rows == 0:
+            return
+        viewport = self.table_view.viewport()
+        first = self.table_view.rowAt(0)
+        last = self.table_view.rowAt(viewport.height() - 1)
+        first = 0 if first < 0 else first
+        last = rows - 1 if last < 0 else last
+        paths = [self.table_model.media_files[row].path for row in range(first, last + 1)]
+        if self.current_media_file is not None:
+            paths.insert(0, self.current_media_file.path)
+        self.analysis_scheduler.prioritize(paths)
+    
+    def _on_analysis_progress(self, analyzer: str, done: int, total: int):
+        self.statusBar().showMessage(f"Analyzing ({analyzer}): {done}/{total}", 2000)
+    
+    def _on_analysis_stored(self, analyzer: str, paths: List[str]):
+        if analyzer == FingerprintAnalyzer.name:
+            self.similarity_index.invalidate()
+        if time.monotonic() - self.last_analysis_refresh >= ANALYSIS_REFRESH_INTERVAL:
+            self._refresh_analysis_columns()
+    
+    def _on_analysis_idle(self):
+        self._refresh_analysis_columns()
+        self.statusBar().showMessage("Background analysis up to date", 3000)
+    
+    def _refresh_analysis_columns(self):
+        """Muat ulang hasil analisis untuk baris yang sedang ditampilkan"""
+        self.last_analysis_refresh = time.monotonic()
+        paths = [f.path for f in self.table_model.media_files]
+        if paths:
+            fresh = {f.path: f for f in self.database.get_files_by_paths(paths)}
+            self.table_model.update_analysis(fresh)
+    
+    def _show_task_panel(self):
+        """Tampilkan panel antrian background task (non-modal)"""
+        if self.task_panel is None:
+            self.task_panel = TaskPanel(self.task_scheduler, self)
+        self.task_panel.show()
+        self.task_panel.raise_()
+        self.task_panel.activateWindow()
+    
+    def _update_task_status(self):
+        stats = self.task_scheduler.stats()
+        running = sum(info["running"] for info in stats["classes"])
+        queued = sum(info["queued"] for info in stats["classes"])
+        if running or queued:
+            self.btn_tasks.setText(f"⚙ {running} running · {queued} queued")
+        else:
+            self.btn_tasks.setText("⚙ Tasks")
+    
+    def find_similar(self, file_path: str):
+        """Tampilkan file yang suaranya paling mirip dengan file_path
+        
+        Fingerprint (jika belum ada) dan loading index berjalan di background
+        task; tabel diisi di _on_similar_found.
+        """
+        self._cancel_similar_search()
+        token = CancelToken()
+        self.similar_token = token
+        self.similar_path = file_path
+        database, index, signals = self.database, self.similarity_index, self.similar_signals
+        
+        def search():
+            try:
+                blob = database.get_fingerprint(file_path)
+                if blob:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                else:
+                    # Belum di-fingerprint batch job: hitung sekarang untuk file ini saja
+                    vector = fingerprint_file(file_path)
+                    if vector is None:
+                        signals.not_analyzable.emit(file_path)
+                        return
+                    database.set_fingerprints([(file_path, vector.tobytes())])
+                    database.complete_analysis_jobs(FingerprintAnalyzer.name, FingerprintAnalyzer.version,
+                                                    [file_path])
+                    index.invalidate()
+                if token.is_cancelled():
+                    return
+                
+                index.ensure_loaded(database)
+                start = time.perf_counter()
+                results = index.query(vector, SIMILAR_RESULTS + 1)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                files = database.get_files_by_paths([path for path, _ in results])
+                if not token.is_cancelled():
+                    signals.finished.emit(file_path, files, len(index.paths), elapsed_ms)
+            except Exception as e:
+                print(f"Error finding similar sounds: {e}")
+                signals.error.emit(file_path, str(e))
+        
+        self.lbl_status.setText(f"Finding sounds similar to {Path(file_path).name}...")
+        self.task_scheduler.submit(search, TASK_INTERACTIVE, "cpu", "find similar", token)
+    
+    def _cancel_similar_search(self):
+        if self.similar_token is not None:
+            self.similar_token.cancel()
+            self.lbl_status.setText("")
+        self.similar_token = None
+        self.similar_path = None
+    
+    def _is_current_similar_search(self, file_path: str) -> bool:
+        return (self.similar_token is not None and not self.similar_token.is_cancelled()
+                and file_path == self.similar_path)
+    
+    def _on_similar_found(self, file_path: str, files: List[MediaFile], searched: int, elapsed_ms: float):
+        if not self._is_current_similar_search(file_path):
+            return
+        self.similar_token = None
+        self.similar_path = None
+        self.btn_duplicates.blockSignals(True)
+        self.btn_duplicates.setChecked(False)
+        self.btn_duplicates.blockSignals(False)
+        self.table_model.set_files(files)
+        self.lbl_status.setText(f"{max(len(files) - 1, 0)} closest matches to {Path(file_path).name} "
+                                f"({searched} searched in {elapsed_ms:.1f} ms)")
+    
+    def _on_similar_not_analyzable(self, file_path: str):
+        if not self._is_current_similar_search(file_path):
+            return
+        self._cancel_similar_search()
+        QMessageBox.information(self, "Find Similar", "Could not analyze the audio of this file.")
+    
+    def _on_similar_error(self, file_path: str, message: str):
+        if not self._is_current_similar_search(file_path):
+            return
+        self._cancel_similar_search()
+        QMessageBox.critical(self, "Find Similar", message)
+    
     def _browse_folder(self):
         """Browse folder untuk scanning"""
         folder = QFileDialog.getExistingDirectory(
@@ -1858,11 +6192,12 @@ class AudioEverythingApp(QMainWindow):
     
     def _start_scanning(self, paths: List[str]):
         """Start scanning files"""
-        # Stop scanner sebelumnya jika masih running
-        if self.scanner_thread and self.scanner_thread.isRunning():
+        # Stop scanner sebelumnya jika masih running; hasilnya tidak dipakai lagi
+        if self.scanner_worker is not None:
+            self.scanner_worker.progress.disconnect()
+            self.scanner_worker.finished.disconnect()
+            self.scanner_worker.error.disconnect()
             self.scanner_worker.stop()
-            self.scanner_thread.quit()
-            self.scanner_thread.wait()
         
         # Setup UI untuk scanning
         self.progress_bar.setVisible(True)
@@ -1872,21 +6207,14 @@ class AudioEverythingApp(QMainWindow):
         self.btn_select_folder.setEnabled(False)
         self.btn_select_files.setEnabled(False)
         
-        # Create worker dan thread
+        # Create worker dan connect signals
         self.scanner_worker = ScannerWorker(paths, self.database)
-        self.scanner_thread = QThread()
-        
-        # Move worker ke thread
-        self.scanner_worker.moveToThread(self.scanner_thread)
-        
-        # Connect signals
-        self.scanner_thread.started.connect(self.scanner_worker.scan)
         self.scanner_worker.progress.connect(self._on_scan_progress)
         self.scanner_worker.finished.connect(self._on_scan_finished)
         self.scanner_worker.error.connect(self._on_scan_error)
         
-        # Start thread
-        self.scanner_thread.start()
+        # Scan berjalan sebagai task indexing (di bawah waveform/prefetch)
+        self.task_scheduler.submit(self.scanner_worker.scan, TASK_INDEXING, "disk", "scan")
     
     def _on_scan_progress(self, percent, total, message):
         """Handle scan progress"""
@@ -1903,20 +6231,20 @@ class AudioEverythingApp(QMainWindow):
         self.btn_select_files.setEnabled(True)
         
         # Update table
-        self.table_model.set_files(files)
+        if self.btn_duplicates.isChecked():
+            self._show_duplicates(self.search_input.text().strip())
+        else:
+            self.table_model.set_files(files)
         self._update_file_count()
-        
-        # Cleanup thread
-        if self.scanner_thread:
-            self.scanner_thread.quit()
-            self.scanner_thread.wait()
-            self.scanner_thread = None
+        self._start_background_analysis()
+        self.scanner_worker = None
         
         # Show notification
         self.statusBar().showMessage(f"Indexed {len(files)} media files", 3000)
     
     def _on_scan_error(self, error_msg):
         """Handle scan error"""
+        self.scanner_worker = None
         self.progress_bar.setVisible(False)
         self.lbl_status.setText(f"Scan error: {error_msg}")
         self.btn_rescan.setEnabled(True)
@@ -1965,16 +6293,37 @@ class AudioEverythingApp(QMainWindow):
             if media_file:
                 self.current_media_file = media_file
                 
+                # Warm row di sekitar row ini untuk navigasi berikutnya
+                prefetched = self.prefetcher.get(media_file.path)
+                self.prefetcher.set_current(self.table_model, row)
+                
                 # Load media file dengan autoplay setting
                 autoplay = self.chk_autoplay.isChecked()
                 repeat = self.chk_repeat.isChecked()
+                duration = prefetched.duration if prefetched else media_file.duration
                 
-                if self.audio_player.load_file(media_file.path, autoplay, repeat):
-                    # Generate waveform data
-                    waveform_data = AudioAnalyzer.generate_waveform_data(media_file.path)
-                    
-                    # Update waveform widget
-                    self.waveform_widget.set_audio_data(waveform_data, media_file.duration)
+                # File panjang diputar dari preview proxy; build di background jika belum ada
+                self.current_preview_path = None
+                if self.chk_proxy.isChecked() and ProxyCache.needs_proxy(media_file):
+                    self.current_preview_path = self.proxy_cache.lookup(media_file.path)
+                    if self.current_preview_path is None:
+                        self.proxy_builder.request(media_file.path)
+                
+                # Preview mulai di onset pertama (silence awal dilewati)
+                start = 0.0
+                if self.chk_skip_silence.isChecked() and media_file.onset_time is not None:
+                    start = max(media_file.onset_time - ONSET_PREROLL, 0.0)
+                
+                if self.audio_player.load_file(media_file.path, autoplay, repeat, duration,
+                                               self.current_preview_path, start_position=start):
+                    # Generate waveform data di background
+                    self._start_waveform_job(media_file)
+                    if media_file.effective_duration is not None:
+                        self.waveform_widget.set_markers(
+                            media_file.silence_head,
+                            max(media_file.duration - media_file.silence_tail, media_file.silence_head),
+                            media_file.onset_time)
+                    self.waveform_widget.set_position(start)
                     
                     # Update UI
                     file_type = "Video" if media_file.is_video else "Audio"
@@ -1984,8 +6333,8 @@ class AudioEverythingApp(QMainWindow):
                     )
                     
                     # Reset playback UI
-                    self.playback_slider.setValue(0)
-                    self._update_playback_time(0, media_file.duration)
+                    self.playback_slider.setValue(int(start / media_file.duration * 1000) if media_file.duration > 0 else 0)
+                    self._update_playback_time(start, media_file.duration)
                     
                     # Update status bar
                     self.statusBar().showMessage(f"Loaded: {media_file.filename} - Ready to drag")
@@ -2005,6 +6354,74 @@ class AudioEverythingApp(QMainWindow):
         except Exception as e:
             print(f"Error in selection changed: {e}")
     
+    def _start_waveform_job(self, media_file: MediaFile):
+        """Start waveform job baru dan batalkan job sebelumnya"""
+        if self.waveform_worker is not None:
+            self.waveform_worker.cancel()
+        if self.waveform_detail_worker is not None:
+            self.waveform_detail_worker.cancel()
+            self.waveform_detail_worker = None
+        
+        self.waveform_job_id += 1
+        self.waveform_widget.set_loading(media_file.duration)
+        
+        # Peak pyramid yang sudah di-prefetch langsung ditampilkan
+        prefetched = self.prefetcher.get(media_file.path)
+        if prefetched is not None and prefetched.pyramid is not None:
+            self.waveform_worker = None
+            self.waveform_widget.update_waveform_data(prefetched.pyramid, complete=True)
+            return
+        
+        self.waveform_worker = WaveformWorker(self.waveform_job_id, media_file.path, self.peak_cache,
+                                              source_path=self.current_preview_path)
+        self.waveform_worker.signals.partial.connect(self._on_waveform_partial)
+        self.waveform_worker.signals.progress.connect(self._on_waveform_progress)
+        self.waveform_worker.signals.finished.connect(self._on_waveform_finished)
+        self.task_scheduler.submit(self.waveform_worker.run, TASK_INTERACTIVE, "cpu", "waveform",
+                                   self.waveform_worker.cancel_token)
+    
+    def _on_waveform_partial(self, job_id, data):
+        """Handle hasil parsial waveform"""
+        if job_id == self.waveform_job_id:
+            self.waveform_widget.update_waveform_data(data)
+    
+    def _on_waveform_progress(self, job_id, progress):
+        """Handle progress waveform job"""
+        if job_id == self.waveform_job_id:
+            self.waveform_widget.set_progress(progress)
+    
+    def _on_waveform_finished(self, job_id, data):
+        """Handle waveform selesai"""
+        if job_id == self.waveform_job_id:
+            self.waveform_widget.update_waveform_data(data, complete=True)
+            self.waveform_worker = None
+    
+    def _on_waveform_detail_requested(self, start, end, num_buckets):
+        """Decode detail range untuk waveform yang di-zoom"""
+        if not self.current_media_file:
+            return
+        if self.waveform_detail_worker is not None:
+            self.waveform_detail_worker.cancel()
+        
+        self.waveform_detail_worker = WaveformDetailWorker(
+            self.waveform_job_id, self.current_preview_path or self.current_media_file.path,
+            start, end, num_buckets
+        )
+        self.waveform_detail_worker.signals.finished.connect(self._on_waveform_detail_finished)
+        self.task_scheduler.submit(self.waveform_detail_worker.run, TASK_INTERACTIVE, "cpu", "waveform detail",
+                                   self.waveform_detail_worker.cancel_token)
+    
+    def _on_proxy_ready(self, file_path: str, proxy_path: str):
+        """Proxy selesai dibuat; dipakai saat file dipilih berikutnya"""
+        if self.current_media_file and self.current_media_file.path == file_path:
+            self.statusBar().showMessage(f"Preview proxy ready: {self.current_media_file.filename}", 3000)
+    
+    def _on_waveform_detail_finished(self, job_id, result):
+        """Handle detail range selesai"""
+        if job_id == self.waveform_job_id:
+            start, end, peaks = result
+            self.waveform_widget.set_detail(start, end, peaks)
+    
     def _toggle_play_pause(self):
         """Toggle play/pause"""
         if self.audio_player.is_playing:
@@ -2036,8 +6453,12 @@ class AudioEverythingApp(QMainWindow):
         self.btn_play.setEnabled(True)
         self.btn_pause.setEnabled(False)
         self.btn_stop.setEnabled(False)
-        self.playback_slider.setValue(0)
-        self._update_playback_time(0, self.audio_player.duration)
+        # Stop kembali ke start_position (onset pertama jika silence dilewati)
+        start = self.audio_player.start_position
+        duration = self.audio_player.duration
+        self.playback_slider.setValue(int(start / duration * 1000) if duration > 0 else 0)
+        self._update_playback_time(start, duration)
+        self.waveform_widget.set_position(start)
     
     def _update_playback_ui(self):
         """Update playback UI"""
@@ -2079,47 +6500,84 @@ class AudioEverythingApp(QMainWindow):
             QMessageBox.warning(self, "Extract Audio", "Please select a video file first")
             return
         
-        if not MOVIEPY_AVAILABLE:
-            QMessageBox.warning(self, "Extract Audio", "MoviePy is not available. Cannot extract audio.")
+        if not audio_extraction_available():
+            QMessageBox.warning(self, "Extract Audio", "Neither ffmpeg nor MoviePy is available. Cannot extract audio.")
             return
         
         self.extract_audio_from_video(self.current_media_file.path)
     
     def extract_audio_from_video(self, video_path: str):
         """Extract audio dari video file"""
-        if not MOVIEPY_AVAILABLE:
+        self.extract_audio_batch([video_path])
+    
+    def extract_audio_batch(self, video_paths: List[str]):
+        """Extract audio dari beberapa video di background dengan dialog progress"""
+        if not audio_extraction_available() or not video_paths:
             return
         
         try:
-            save_path, _ = QFileDialog.getSaveFileName(
-                self, "Save Extracted Audio",
-                str(Path(video_path).with_suffix('.wav')),
-                "Audio Files (*.wav *.mp3);;All Files (*.*)"
-            )
-            
-            if not save_path:
-                return
-            
-            temp_audio = AudioAnalyzer.extract_audio_from_video(video_path)
-            if temp_audio and os.path.exists(temp_audio):
-                import shutil
-                shutil.copy2(temp_audio, save_path)
-                
-                try:
-                    os.remove(temp_audio)
-                except:
-                    pass
-                
-                QMessageBox.information(self, "Success", 
-                    f"Audio extracted successfully to:\n{save_path}")
-            else:
-                QMessageBox.warning(self, "Error", "Failed to extract audio")
-                
+            default_folder = self.last_extract_folder or str(Path(video_paths[0]).parent)
+            dialog = BatchExtractDialog(video_paths, default_folder, self)
+            dialog.exec_()
+            if dialog.manager is not None:
+                self.last_extract_folder = dialog.manager.target_folder
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error extracting audio:\n{str(e)}")
     
+    def export_files(self, file_paths: List[str], folder: str):
+        """Export file ke folder di background dengan dialog progress non-modal"""
+        if not file_paths:
+            return
+        
+        try:
+            if self.export_format in EXPORT_TRANSCODE_FORMATS and get_ffmpeg_exe():
+                engine = TranscodeExportManager(file_paths, folder, self.export_format, parent=self)
+                dialog = TranscodeExportDialog(engine, self)
+                print(f"Convert export: {len(file_paths)} file(s) -> {folder} "
+                      f"({self.export_format}, {engine.max_workers} workers)")
+            else:
+                engine = ExportEngine(file_paths, folder, self.export_mode, sync=self.export_sync,
+                                      verify_hash=self.export_verify_hash, parent=self)
+                dialog = ExportDialog(engine, self)
+                print(f"Export: {len(file_paths)} file(s) -> {folder} "
+                      f"({EXPORT_MODES[engine.mode].lower()}{', sync' if engine.sync else ''}, "
+                      f"{engine.total_bytes / (1024 * 1024):.1f} MB)")
+            self.export_dialogs.append(dialog)
+            dialog.finished.connect(lambda _result, d=dialog: self._on_export_dialog_closed(d))
+            dialog.show()
+            dialog.attach(engine)
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Error exporting files:\n{str(e)}")
+    
+    def _on_export_dialog_closed(self, dialog: 'JobProgressDialog'):
+        engine = dialog.manager
+        if engine.is_running():
+            # Hapus engine setelah semua worker selesai membatalkan job
+            engine.all_finished.connect(engine.deleteLater)
+            engine.cancel()
+        else:
+            engine.deleteLater()
+        if dialog in self.export_dialogs:
+            self.export_dialogs.remove(dialog)
+        dialog.deleteLater()
+    
     def closeEvent(self, event):
         """Handle application close"""
+        for dialog in list(self.export_dialogs):
+            dialog.manager.cancel()
+        if self.scanner_worker is not None:
+            self.scanner_worker.stop()
+        if self.waveform_worker is not None:
+            self.waveform_worker.cancel()
+        if self.waveform_detail_worker is not None:
+            self.waveform_detail_worker.cancel()
+        self.task_status_timer.stop()
+        self._cancel_similar_search()
+        self.analysis_scheduler.shutdown(2.0)
+        self.prefetcher.shutdown()
+        self.proxy_builder.shutdown()
+        get_extraction_cache().cancel_all()
+        self.task_scheduler.shutdown(2.0)
         self.audio_player.stop()
         self.audio_player.cleanup()
         self._save_settings()
@@ -2136,16 +6594,20 @@ def main():
         app = QApplication(sys.argv)
         app.setApplicationName("Audio Everything Pro")
         app.setOrganizationName("AudioEverythingPro")
+        STARTUP_PROFILER.mark("QApplication")
         
         # Apply dark theme
         try:
+            import qdarkstyle
             app.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
         except Exception as e:
             print(f"Error applying dark theme: {e}")
             app.setStyle("Fusion")
+        STARTUP_PROFILER.mark("dark theme")
         
         window = AudioEverythingApp()
         window.show()
+        STARTUP_PROFILER.mark("window shown")
         
         sys.exit(app.exec_())
     except Exception as e:
@@ -2159,33 +6621,26 @@ if __name__ == "__main__":
     print("Audio Everything Pro - Starting...")
     print("=" * 60)
     
-    # Check dependencies
-    dependencies = ["moviepy", "numpy", "tinytag", "rapidfuzz", "PyQt5", "qdarkstyle"]
+    if "--startup-profile" in sys.argv:
+        sys.argv.remove("--startup-profile")
+        STARTUP_PROFILER.enabled = True
+    
+    # Headless: jalankan semua analisis yang tertunda lalu keluar (tanpa UI)
+    if "--analyze" in sys.argv:
+        sys.exit(run_headless_analysis())
+    
+    # Check dependencies (tanpa import; module di-load saat pertama dipakai)
+    dependencies = ["moviepy", "imageio_ffmpeg", "numpy", "tinytag", "rapidfuzz", "PyQt5", "qdarkstyle"]
     
     for dep in dependencies:
-        try:
-            if dep == "moviepy":
-                __import__("moviepy.editor")
-                print(f"✓ {dep} is available")
-            elif dep == "numpy":
-                __import__("numpy")
-                print(f"✓ {dep} is available")
-            elif dep == "tinytag":
-                __import__("tinytag")
-                print(f"✓ {dep} is available")
-            elif dep == "rapidfuzz":
-                __import__("rapidfuzz")
-                print(f"✓ {dep} is available")
-            elif dep == "PyQt5":
-                from PyQt5.QtWidgets import QApplication
-                print(f"✓ {dep} is available")
-            elif dep == "qdarkstyle":
-                __import__("qdarkstyle")
-                print(f"✓ {dep} is available")
-        except ImportError:
+        if module_available(dep):
+            print(f"✓ {dep} is available")
+        else:
             print(f"✗ {dep} is not available")
             if dep == "moviepy":
                 print("   Install with: pip install moviepy")
+            elif dep == "imageio_ffmpeg":
+                print("   Install with: pip install imageio-ffmpeg")
     
     print("=" * 60)
     
@@ -0,0 +1,1355 @@
+"""Index media tanpa Qt: database, scanner, content hash dan copy file export
+
+Dipakai oleh main.py (GUI) dan cli.py (headless), jadi module ini tidak boleh
+meng-import PyQt5.
+"""
+import sys
+import os
+import sqlite3
+from pathlib import Path
+import threading
+import re
+import hashlib
+import shutil
+from typing import List, Tuple, Optional, Dict, Any, Callable
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+import tinytag
+from rapidfuzz import fuzz, process
+
+
+# ============================================================================
+# CANCELLATION
+# ============================================================================
+
+class CancelToken:
+    """Token untuk membatalkan background job dari thread lain"""
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self):
+        """Tandai job sebagai dibatalkan"""
+        self._event.set()
+    
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+# ============================================================================
+# DATABASE MODEL - DIPERBAIKI
+# ============================================================================
+
+@dataclass
+class MediaFile:
+    """Data class untuk menyimpan informasi file media"""
+    path: str
+    filename: str
+    extension: str
+    is_video: bool
+    duration: float
+    size: int
+    last_modified: float
+    title: str = ""
+    artist: str = ""
+    album: str = ""
+    genre: str = ""
+    bitrate: int = 0
+    sample_rate: int = 0
+    channels: int = 0
+    content_hash: str = ""
+    loudness_lufs: Optional[float] = None
+    true_peak_db: Optional[float] = None
+    sample_peak_db: Optional[float] = None
+    rms_db: Optional[float] = None
+    silence_head: Optional[float] = None
+    silence_tail: Optional[float] = None
+    onset_time: Optional[float] = None
+    effective_duration: Optional[float] = None
+
+
+@dataclass
+class LoudnessResult:
+    """Hasil analisis loudness satu file (dB / LUFS)"""
+    lufs: float
+    true_peak_db: float
+    sample_peak_db: float
+    rms_db: float
+
+
+@dataclass
+class SilenceMarkers:
+    """Marker hasil analisis silence (detik)"""
+    head: float               # durasi silence di awal
+    tail: float               # durasi silence di akhir
+    onset: float              # onset pertama
+    effective_duration: float # durasi bagian yang tidak sunyi
+
+
+class AudioDatabase:
+    """Database untuk menyimpan index file audio/video"""
+    
+    def __init__(self, db_path: str = "media_index.db"):
+        self.db_path = db_path
+        self._init_database()
+    
+    # Kolom untuk MediaFile (tanpa BLOB analisis seperti fingerprint)
+    ROW_COLUMNS = ("path, filename, extension, is_video, duration, size, last_modified, title, artist, "
+                   "album, genre, bitrate, sample_rate, channels, content_hash, "
+                   "loudness_lufs, true_peak_db, sample_peak_db, rms_db, "
+                   "silence_head, silence_tail, onset_time, effective_duration")
+    
+    # Filter range di query search, mis. "lufs:-23..-16 peak:..-1 dur:0.5..3": (key -> kolom)
+    RANGE_FILTERS = {
+        "lufs": "loudness_lufs",
+        "peak": "true_peak_db",
+        "rms": "rms_db",
+        "dur": "effective_duration",
+    }
+    RANGE_FILTER_PATTERN = re.compile(
+        r'\b(lufs|peak|rms|dur):(-?\d+(?:\.\d+)?)?\.\.(-?\d+(?:\.\d+)?)?', re.IGNORECASE)
+    
+    # Kolom yang ditambahkan setelah schema awal: (nama, deklarasi)
+    MIGRATION_COLUMNS = [
+        ("partial_hash", "TEXT"),
+        ("content_hash", "TEXT"),
+        ("fingerprint", "BLOB"),
+        ("loudness_lufs", "REAL"),
+        ("true_peak_db", "REAL"),
+        ("sample_peak_db", "REAL"),
+        ("rms_db", "REAL"),
+        ("silence_head", "REAL"),
+        ("silence_tail", "REAL"),
+        ("onset_time", "REAL"),
+        ("effective_duration", "REAL"),
+    ]
+    
+    def _init_database(self):
+        """Initialize database tables dengan error handling
+        
+        Table dibuat jika belum ada dan kolom baru ditambahkan lewat ALTER TABLE,
+        jadi index (dan hash yang sudah dihitung) tetap ada setelah restart.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                # WAL: reader (QueryService, UI) tidak terblokir selama scanner/analisis commit.
+                # Tersimpan di file database; filesystem yang tidak mendukung tetap di mode lama
+                cursor.execute('PRAGMA journal_mode=WAL')
+                
+                existing = {row[1] for row in cursor.execute('PRAGMA table_info(media_files)')}
+                required = {'path', 'filename', 'extension', 'is_video', 'duration', 'size', 'last_modified'}
+                if existing and not required <= existing:
+                    # Schema lama yang tidak kompatibel: backup lalu buat ulang
+                    self._backup_database()
+                    cursor.execute('DROP TABLE media_files')
+                    existing = set()
+                
+                # Create table dengan schema yang lengkap
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS media_files (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        path TEXT UNIQUE NOT NULL,
+                        filename TEXT NOT NULL,
+                        extension TEXT NOT NULL,
+                        is_video INTEGER NOT NULL,
+                        duration REAL NOT NULL,
+                        size INTEGER NOT NULL,
+                        last_modified REAL NOT NULL,
+                        title TEXT,
+                        artist TEXT,
+                        album TEXT,
+                        genre TEXT,
+                        bitrate INTEGER,
+                        sample_rate INTEGER,
+                        channels INTEGER,
+                        indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        partial_hash TEXT,
+                        content_hash TEXT,
+                        fingerprint BLOB,
+                        loudness_lufs REAL,
+                        true_peak_db REAL,
+                        sample_peak_db REAL,
+                        rms_db REAL,
+                        silence_head REAL,
+                        silence_tail REAL,
+                        onset_time REAL,
+                        effective_duration REAL
+                    )
+                ''')
+                
+                # Migrasi: tambahkan kolom yang belum ada di database lama
+                if existing:
+                    missing = [(name, decl) for name, decl in self.MIGRATION_COLUMNS if name not in existing]
+                    if missing:
+                        self._backup_database()
+                    for name, decl in missing:
+                        cursor.execute(f'ALTER TABLE media_files ADD COLUMN {name} {decl}')
+                        print(f"Database migrated: added column {name}")
+                
+                # Create indexes
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_filename ON media_files(filename)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_extension ON media_files(extension)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_is_video ON media_files(is_video)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_title ON media_files(title)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_artist ON media_files(artist)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_size ON media_files(size)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_hash ON media_files(content_hash)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_loudness ON media_files(loudness_lufs)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_true_peak ON media_files(true_peak_db)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_rms ON media_files(rms_db)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_effective_duration ON media_files(effective_duration)')
+                
+                # Job table untuk AnalysisScheduler: satu baris per (file, analyzer)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS analysis_jobs (
+                        path TEXT NOT NULL,
+                        analyzer TEXT NOT NULL,
+                        status TEXT NOT NULL DEFAULT 'pending',
+                        priority INTEGER NOT NULL DEFAULT 0,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        version INTEGER NOT NULL DEFAULT 0,
+                        last_error TEXT,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (path, analyzer)
+                    )
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_queue ON analysis_jobs(status, priority DESC)')
+                # File berubah (size/mtime): semua analisisnya dijadwalkan ulang
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_jobs_invalidate
+                    AFTER UPDATE OF size, last_modified ON media_files
+                    WHEN OLD.size IS NOT NEW.size OR OLD.last_modified IS NOT NEW.last_modified
+                    BEGIN
+                        UPDATE analysis_jobs SET status = 'pending', attempts = 0, last_error = NULL
+                        WHERE path = NEW.path;
+                    END
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_jobs_delete
+                    AFTER DELETE ON media_files
+                    BEGIN
+                        DELETE FROM analysis_jobs WHERE path = OLD.path;
+                    END
+                ''')
+                
+                conn.commit()
+                print("Database initialized successfully with correct schema")
+                
+        except Exception as e:
+            print(f"Error initializing database: {e}")
+            # Jika error, hapus database dan buat ulang
+            try:
+                if os.path.exists(self.db_path):
+                    self._backup_database()
+                    os.remove(self.db_path)
+                self._init_database()
+            except Exception as e2:
+                print(f"Failed to recreate database: {e2}")
+    
+    def _backup_database(self):
+        """Backup database sebelum schema diubah"""
+        if os.path.exists(self.db_path):
+            backup_path = self.db_path + ".backup"
+            try:
+                # Backup API, bukan copy file: di mode WAL data terbaru bisa masih di file -wal
+                with sqlite3.connect(self.db_path) as source, sqlite3.connect(backup_path) as target:
+                    source.backup(target)
+                print(f"Backed up old database to: {backup_path}")
+            except (OSError, sqlite3.Error):
+                pass
+    
+    def add_media_file(self, media_file: MediaFile):
+        """Add atau update media file di database"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                # Upsert: hash yang sudah dihitung dipertahankan selama size/mtime sama
+                cursor.execute('''
+                    INSERT INTO media_files 
+                    (path, filename, extension, is_video, duration, size, last_modified,
+                     title, artist, album, genre, bitrate, sample_rate, channels)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        filename = excluded.filename,
+                        extension = excluded.extension,
+                        is_video = excluded.is_video,
+                        duration = excluded.duration,
+                        title = excluded.title,
+                        artist = excluded.artist,
+                        album = excluded.album,
+                        genre = excluded.genre,
+                        bitrate = excluded.bitrate,
+                        sample_rate = excluded.sample_rate,
+                        channels = excluded.channels,
+                        indexed_at = CURRENT_TIMESTAMP,
+                        partial_hash = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                            THEN partial_hash END,
+                        content_hash = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                            THEN content_hash END,
+                        fingerprint = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                           THEN fingerprint END,
+                        loudness_lufs = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                             THEN loudness_lufs END,
+                        true_peak_db = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                            THEN true_peak_db END,
+                        sample_peak_db = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                              THEN sample_peak_db END,
+                        rms_db = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                      THEN rms_db END,
+                        silence_head = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                            THEN silence_head END,
+                        silence_tail = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                            THEN silence_tail END,
+                        onset_time = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                          THEN onset_time END,
+                        effective_duration = CASE WHEN size = excluded.size AND last_modified = excluded.last_modified
+                                                  THEN effective_duration END,
+                        size = excluded.size,
+                        last_modified = excluded.last_modified
+                ''', (
+                    media_file.path,
+                    media_file.filename,
+                    media_file.extension,
+                    1 if media_file.is_video else 0,
+                    media_file.duration,
+                    media_file.size,
+                    media_file.last_modified,
+                    media_file.title,
+                    media_file.artist,
+                    media_file.album,
+                    media_file.genre,
+                    media_file.bitrate,
+                    media_file.sample_rate,
+                    media_file.channels
+                ))
+                
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error adding media file to database: {e}")
+            return False
+    
+    def get_all_files(self) -> List[MediaFile]:
+        """Get semua files dari database"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                
+                cursor.execute(f'SELECT {self.ROW_COLUMNS} FROM media_files ORDER BY filename')
+                rows = cursor.fetchall()
+                
+                return [self._row_to_media_file(row) for row in rows]
+        except Exception as e:
+            print(f"Error getting all files from database: {e}")
+            return []
+    
+    def get_files_after(self, after: str, limit: int,
+                        connection: Optional[sqlite3.Connection] = None,
+                        raise_errors: bool = False) -> List[MediaFile]:
+        """Halaman file berurutan path, mulai setelah path `after` (keyset pagination)"""
+        try:
+            with (connection or sqlite3.connect(self.db_path)) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute(f'''
+                    SELECT {self.ROW_COLUMNS} FROM media_files
+                    WHERE path > ? ORDER BY path LIMIT ?
+                ''', (after, limit))
+                return [self._row_to_media_file(row) for row in cursor.fetchall()]
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error getting files page: {e}")
+            return []
+    
+    @classmethod
+    def parse_range_filters(cls, query: str) -> Tuple[str, List[Tuple[str, Optional[float], Optional[float]]]]:
+        """Pisahkan filter range ("lufs:-23..-16", "peak:..-1", "rms:-30..") dari teks query
+        
+        Return (sisa teks, list of (kolom, min, max)); batas yang kosong berarti terbuka.
+        """
+        filters = []
+        for match in cls.RANGE_FILTER_PATTERN.finditer(query):
+            low = float(match.group(2)) if match.group(2) else None
+            high = float(match.group(3)) if match.group(3) else None
+            if low is not None and high is not None and low > high:
+                low, high = high, low
+            filters.append((cls.RANGE_FILTERS[match.group(1).lower()], low, high))
+        text = " ".join(cls.RANGE_FILTER_PATTERN.sub(" ", query).split())
+        return text, filters
+    
+    def search_files(self, query: str, limit: int = 100,
+                     connection: Optional[sqlite3.Connection] = None,
+                     raise_errors: bool = False) -> List[MediaFile]:
+        """Search files dengan fuzzy matching dan filter range loudness
+        
+        connection: koneksi yang sudah terbuka (reader pool QueryService),
+        default buka koneksi baru. raise_errors: teruskan error database
+        (mis. "database is locked") ke caller, bukan hasil kosong.
+        """
+        try:
+            query, filters = self.parse_range_filters(query)
+            conditions, params = [], []
+            for column, low, high in filters:
+                # File yang belum dianalisis (NULL) tidak lolos filter
+                conditions.append(f'{column} IS NOT NULL')
+                if low is not None:
+                    conditions.append(f'{column} >= ?')
+                    params.append(low)
+                if high is not None:
+                    conditions.append(f'{column} <= ?')
+                    params.append(high)
+            
+            with (connection or sqlite3.connect(self.db_path)) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                
+                if query:
+                    # Search di multiple fields
+                    search_term = f'%{query}%'
+                    conditions.insert(0, '''(LOWER(filename) LIKE LOWER(?)
+                                           OR LOWER(title) LIKE LOWER(?)
+                                           OR LOWER(artist) LIKE LOWER(?)
+                                           OR LOWER(album) LIKE LOWER(?))''')
+                    params[:0] = [search_term] * 4
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(f'''
+                    SELECT {self.ROW_COLUMNS} FROM media_files
+                    {where}
+                    ORDER BY filename
+                    LIMIT ?
+                ''', params + [limit])
+                
+                rows = cursor.fetchall()
+                files = [self._row_to_media_file(row) for row in rows]
+                
+                # Fuzzy matching dengan RapidFuzz jika ada query
+                if query and files:
+                    try:
+                        choices = [f"{f.filename} {f.title} {f.artist} {f.album}" for f in files]
+                        results = process.extract(query, choices, limit=limit, scorer=fuzz.partial_ratio)
+                        
+                        # Sort berdasarkan similarity score
+                        scored_files = []
+                        for file, score in zip(files, [r[1] for r in results]):
+                            if score > 30:  # Lower threshold
+                                scored_files.append((file, score))
+                        
+                        scored_files.sort(key=lambda x: x[1], reverse=True)
+                        files = [f for f, _ in scored_files]
+                    except Exception as e:
+                        print(f"Fuzzy search error (non-critical): {e}")
+                        # Tetap gunakan hasil SQL jika fuzzy search gagal
+                
+                return files
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error searching files: {e}")
+            return []
+    
+    def get_hash_candidates(self) -> List[Tuple[str, int, Optional[str], Optional[str]]]:
+        """File yang size-nya sama dengan file lain: (path, size, partial_hash, content_hash)"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT path, size, partial_hash, content_hash FROM media_files
+                    WHERE size IN (SELECT size FROM media_files WHERE size > 0
+                                   GROUP BY size HAVING COUNT(*) > 1)
+                    ORDER BY size
+                ''')
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting hash candidates: {e}")
+            return []
+    
+    def set_partial_hashes(self, hashes: List[Tuple[str, str]]):
+        """Simpan partial hash: list of (path, hash)"""
+        self._set_column_values('partial_hash', hashes)
+    
+    def set_content_hashes(self, hashes: List[Tuple[str, str]]):
+        """Simpan full content hash: list of (path, hash)"""
+        self._set_column_values('content_hash', hashes)
+    
+    def _set_column_values(self, column: str, hashes: List[Tuple[str, Any]]):
+        if not hashes:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(f'UPDATE media_files SET {column} = ? WHERE path = ?',
+                                 [(value, path) for path, value in hashes])
+                conn.commit()
+        except Exception as e:
+            print(f"Error saving {column}: {e}")
+    
+    def set_fingerprints(self, fingerprints: List[Tuple[str, bytes]]):
+        """Simpan fingerprint: list of (path, float32 bytes)"""
+        self._set_column_values('fingerprint', fingerprints)
+    
+    def set_loudness(self, results: List[Tuple[str, LoudnessResult]]):
+        """Simpan hasil analisis loudness: list of (path, LoudnessResult)"""
+        if not results:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany('''
+                    UPDATE media_files
+                    SET loudness_lufs = ?, true_peak_db = ?, sample_peak_db = ?, rms_db = ?
+                    WHERE path = ?
+                ''', [(r.lufs, r.true_peak_db, r.sample_peak_db, r.rms_db, path) for path, r in results])
+                conn.commit()
+        except Exception as e:
+            print(f"Error saving loudness: {e}")
+    
+    def set_silence_markers(self, results: List[Tuple[str, SilenceMarkers]]):
+        """Simpan marker silence/onset: list of (path, SilenceMarkers)"""
+        if not results:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany('''
+                    UPDATE media_files
+                    SET silence_head = ?, silence_tail = ?, onset_time = ?, effective_duration = ?
+                    WHERE path = ?
+                ''', [(m.head, m.tail, m.onset, m.effective_duration, path) for path, m in results])
+                conn.commit()
+        except Exception as e:
+            print(f"Error saving silence markers: {e}")
+    
+    # ------------------------------------------------------------------
+    # Analysis job queue (dipakai AnalysisScheduler)
+    # ------------------------------------------------------------------
+    
+    def enqueue_analysis_jobs(self, analyzer: str, version: int, done_column: str, priority: int) -> int:
+        """Buat job untuk file yang belum punya job analyzer ini; return jumlah job pending
+        
+        File yang hasilnya sudah ada di done_column (dari sebelum ada job table)
+        langsung dicatat sebagai done. Job dari versi analyzer lama dijadwalkan ulang.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(f'''
+                    INSERT OR IGNORE INTO analysis_jobs (path, analyzer, status, priority, version)
+                    SELECT path, ?, CASE WHEN {done_column} IS NOT NULL THEN 'done' ELSE 'pending' END, ?, ?
+                    FROM media_files
+                ''', (analyzer, priority, version))
+                conn.execute('''
+                    UPDATE analysis_jobs SET status = 'pending', attempts = 0, last_error = NULL
+                    WHERE analyzer = ? AND version < ? AND status IN ('done', 'failed')
+                ''', (analyzer, version))
+                conn.commit()
+                row = conn.execute("SELECT COUNT(*) FROM analysis_jobs WHERE analyzer = ? AND status = 'pending'",
+                                   (analyzer,)).fetchone()
+                return row[0] if row else 0
+        except Exception as e:
+            print(f"Error enqueueing {analyzer} jobs: {e}")
+            return 0
+    
+    def claim_analysis_job(self, analyzers: List[str],
+                           preferred_paths: Optional[List[str]] = None) -> Optional[Tuple[str, str]]:
+        """Ambil satu job pending (path, analyzer) dan tandai running
+        
+        Job untuk preferred_paths (mis. baris yang terlihat) diambil lebih dulu,
+        lalu sisanya berdasarkan priority.
+        """
+        if not analyzers:
+            return None
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                names = ",".join("?" * len(analyzers))
+                row = None
+                for i in range(0, len(preferred_paths or []), 500):
+                    chunk = preferred_paths[i:i + 500]
+                    row = conn.execute(f'''
+                        SELECT path, analyzer FROM analysis_jobs
+                        WHERE status = 'pending' AND analyzer IN ({names})
+                          AND path IN ({",".join("?" * len(chunk))})
+                        ORDER BY priority DESC LIMIT 1
+                    ''', analyzers + chunk).fetchone()
+                    if row:
+                        break
+                if row is None:
+                    row = conn.execute(f'''
+                        SELECT path, analyzer FROM analysis_jobs
+                        WHERE status = 'pending' AND analyzer IN ({names})
+                        ORDER BY priority DESC, rowid LIMIT 1
+                    ''', analyzers).fetchone()
+                if row is None:
+                    return None
+                conn.execute('''
+                    UPDATE analysis_jobs SET status = 'running', updated_at = CURRENT_TIMESTAMP
+                    WHERE path = ? AND analyzer = ?
+                ''', row)
+                conn.commit()
+                return row[0], row[1]
+        except Exception as e:
+            print(f"Error claiming analysis job: {e}")
+            return None
+    
+    def complete_analysis_jobs(self, analyzer: str, version: int, paths: List[str]):
+        """Tandai job selesai (hasilnya sudah disimpan analyzer)"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany('''
+                    UPDATE analysis_jobs
+                    SET status = 'done', version = ?, last_error = NULL, updated_at = CURRENT_TIMESTAMP
+                    WHERE analyzer = ? AND path = ?
+                ''', [(version, analyzer, path) for path in paths])
+                conn.commit()
+        except Exception as e:
+            print(f"Error completing {analyzer} jobs: {e}")
+    
+    def fail_analysis_job(self, analyzer: str, path: str, error: str, max_attempts: int, retry_penalty: int) -> bool:
+        """Catat kegagalan; job dicoba lagi (dengan priority lebih rendah) sampai max_attempts.
+        Return True jika job sudah gagal permanen."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    UPDATE analysis_jobs
+                    SET attempts = attempts + 1, last_error = ?, priority = priority - ?,
+                        status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE analyzer = ? AND path = ? AND status = 'running'
+                ''', (error[:500], retry_penalty, max_attempts, analyzer, path))
+                row = conn.execute("SELECT status FROM analysis_jobs WHERE analyzer = ? AND path = ?",
+                                   (analyzer, path)).fetchone()
+                conn.commit()
+                return row is None or row[0] == 'failed'
+        except Exception as e:
+            print(f"Error recording failed {analyzer} job: {e}")
+            return True
+    
+    def release_analysis_jobs(self, jobs: Optional[List[Tuple[str, str]]] = None):
+        """Kembalikan job running ke pending (semua jika jobs None, mis. setelah crash)"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if jobs is None:
+                    conn.execute("UPDATE analysis_jobs SET status = 'pending' WHERE status = 'running'")
+                else:
+                    conn.executemany('''
+                        UPDATE analysis_jobs SET status = 'pending'
+                        WHERE path = ? AND analyzer = ? AND status = 'running'
+                    ''', jobs)
+                conn.commit()
+        except Exception as e:
+            print(f"Error releasing analysis jobs: {e}")
+    
+    def get_analysis_counts(self) -> Dict[str, Dict[str, int]]:
+        """{analyzer: {status: jumlah}} untuk status/progress"""
+        counts: Dict[str, Dict[str, int]] = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                for analyzer, status, count in conn.execute(
+                        'SELECT analyzer, status, COUNT(*) FROM analysis_jobs GROUP BY analyzer, status'):
+                    counts.setdefault(analyzer, {})[status] = count
+        except Exception as e:
+            print(f"Error getting analysis counts: {e}")
+        return counts
+    
+    def get_fingerprint(self, file_path: str) -> Optional[bytes]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('SELECT fingerprint FROM media_files WHERE path = ?', (file_path,)).fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            print(f"Error getting fingerprint: {e}")
+            return None
+    
+    def get_fingerprints(self) -> List[Tuple[str, bytes]]:
+        """Semua (path, fingerprint) untuk similarity index"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT path, fingerprint FROM media_files WHERE fingerprint IS NOT NULL')
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"Error getting fingerprints: {e}")
+            return []
+    
+    def get_files_by_paths(self, paths: List[str],
+                           connection: Optional[sqlite3.Connection] = None,
+                           raise_errors: bool = False) -> List[MediaFile]:
+        """MediaFile untuk paths, dengan urutan yang sama"""
+        if not paths:
+            return []
+        try:
+            with (connection or sqlite3.connect(self.db_path)) as conn:
+                conn.row_factory = sqlite3.Row
+                by_path = {}
+                # Batas jumlah parameter SQLite
+                for i in range(0, len(paths), 500):
+                    chunk = paths[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    for row in conn.execute(f'SELECT {self.ROW_COLUMNS} FROM media_files WHERE path IN ({placeholders})', chunk):
+                        by_path[row['path']] = self._row_to_media_file(row)
+                return [by_path[path] for path in paths if path in by_path]
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error getting files by path: {e}")
+            return []
+    
+    def get_duplicate_files(self, connection: Optional[sqlite3.Connection] = None,
+                            raise_errors: bool = False) -> List[MediaFile]:
+        """Semua file yang isinya identik dengan file lain, berurutan per grup
+        (grup dengan file terbesar lebih dulu)"""
+        try:
+            with (connection or sqlite3.connect(self.db_path)) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT {self.ROW_COLUMNS} FROM media_files
+                    WHERE content_hash IN (SELECT content_hash FROM media_files
+                                           WHERE content_hash IS NOT NULL
+                                           GROUP BY content_hash HAVING COUNT(*) > 1)
+                    ORDER BY size DESC, content_hash, path
+                ''')
+                return [self._row_to_media_file(row) for row in cursor.fetchall()]
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error getting duplicate files: {e}")
+            return []
+    
+    def delete_file(self, file_path: str):
+        """Delete file dari database"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM media_files WHERE path = ?', (file_path,))
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error deleting file from database: {e}")
+            return False
+    
+    def clear_all(self):
+        """Clear semua data dari database"""
+        try:
+            # Step 1: Delete all records
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM media_files')
+                conn.commit()
+            
+            # Step 2: VACUUM di connection terpisah
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('VACUUM')
+                conn.commit()
+            
+            print("Database cleared and vacuumed successfully")
+            return True
+        except Exception as e:
+            print(f"Error clearing database: {e}")
+            # Fallback: recreate database
+            try:
+                for path in (self.db_path, self.db_path + "-wal", self.db_path + "-shm"):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._init_database()
+                return True
+            except Exception as e2:
+                print(f"Failed to recreate database: {e2}")
+                return False
+    
+    def get_file_count(self) -> int:
+        """Get total file count"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT COUNT(*) FROM media_files')
+                result = cursor.fetchone()
+                return result[0] if result else 0
+        except Exception as e:
+            print(f"Error getting file count: {e}")
+            return 0
+    
+    def get_stats(self, connection: Optional[sqlite3.Connection] = None,
+                  raise_errors: bool = False) -> Dict[str, Any]:
+        """Ringkasan index: jumlah file, total ukuran/durasi, jumlah per
+        extension dan duplikat"""
+        try:
+            with (connection or sqlite3.connect(self.db_path)) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT COUNT(*), COALESCE(SUM(is_video), 0),
+                           COALESCE(SUM(size), 0), COALESCE(SUM(duration), 0)
+                    FROM media_files
+                ''')
+                files, videos, total_size, total_duration = cursor.fetchone()
+                
+                cursor.execute('''
+                    SELECT extension, COUNT(*) FROM media_files
+                    GROUP BY extension ORDER BY COUNT(*) DESC, extension
+                ''')
+                extensions = dict(cursor.fetchall())
+                
+                cursor.execute('''
+                    SELECT COALESCE(SUM(n), 0), COUNT(*) FROM
+                        (SELECT COUNT(*) AS n FROM media_files
+                         WHERE content_hash IS NOT NULL
+                         GROUP BY content_hash HAVING COUNT(*) > 1)
+                ''')
+                duplicate_files, duplicate_groups = cursor.fetchone()
+                
+                return {
+                    "files": files,
+                    "audio": files - videos,
+                    "video": videos,
+                    "total_size": total_size,
+                    "total_duration": total_duration,
+                    "extensions": extensions,
+                    "duplicate_files": duplicate_files,
+                    "duplicate_groups": duplicate_groups,
+                }
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error getting index stats: {e}")
+            return {}
+    
+    def _row_to_media_file(self, row) -> MediaFile:
+        """Convert database row ke MediaFile object"""
+        try:
+            # Safe extraction dari row dengan default values
+            def get_value(key, default):
+                if key in row.keys():
+                    val = row[key]
+                    return val if val is not None else default
+                return default
+            
+            return MediaFile(
+                path=get_value('path', ''),
+                filename=get_value('filename', ''),
+                extension=get_value('extension', ''),
+                is_video=bool(get_value('is_video', 0)),
+                duration=float(get_value('duration', 0.0)),
+                size=int(get_value('size', 0)),
+                last_modified=float(get_value('last_modified', 0.0)),
+                title=str(get_value('title', '')),
+                artist=str(get_value('artist', '')),
+                album=str(get_value('album', '')),
+                genre=str(get_value('genre', '')),
+                bitrate=int(get_value('bitrate', 0)),
+                sample_rate=int(get_value('sample_rate', 0)),
+                channels=int(get_value('channels', 0)),
+                content_hash=str(get_value('content_hash', '')),
+                loudness_lufs=get_value('loudness_lufs', None),
+                true_peak_db=get_value('true_peak_db', None),
+                sample_peak_db=get_value('sample_peak_db', None),
+                rms_db=get_value('rms_db', None),
+                silence_head=get_value('silence_head', None),
+                silence_tail=get_value('silence_tail', None),
+                onset_time=get_value('onset_time', None),
+                effective_duration=get_value('effective_duration', None)
+            )
+        except Exception as e:
+            print(f"Error converting row to MediaFile: {e}")
+            # Return minimal valid MediaFile
+            return MediaFile(
+                path='',
+                filename='',
+                extension='',
+                is_video=False,
+                duration=0.0,
+                size=0,
+                last_modified=0.0,
+                title='',
+                artist='',
+                album='',
+                genre='',
+                bitrate=0,
+                sample_rate=0,
+                channels=0
+            )
+
+
+# ============================================================================
+# SCANNER
+# ============================================================================
+
+def is_under(path: str, root: str) -> bool:
+    """True jika path berada di dalam folder root (atau sama dengan root)"""
+    try:
+        return os.path.commonpath([os.path.abspath(path), root]) == root
+    except ValueError:
+        # Beda drive di Windows
+        return False
+
+
+class MediaScanner:
+    """Scan file/folder ke database tanpa Qt (dipakai ScannerWorker dan CLI)
+    
+    progress_callback dipanggil dengan (persen, total file, pesan).
+    """
+    
+    def __init__(self, paths: List[str], database: AudioDatabase,
+                 progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                 hash_duplicates: bool = True):
+        self.paths = paths
+        self.database = database
+        self.progress_callback = progress_callback
+        self.hash_duplicates = hash_duplicates
+        self._is_running = True
+        self.scanned_count = 0
+        self.total_files = 0
+    
+    def scan(self) -> List[MediaFile]:
+        """Scan semua files di paths yang diberikan, return file yang ter-index"""
+        all_files = []
+        
+        # Count total files first untuk progress bar
+        self.total_files = self._count_total_files()
+        
+        for i, path in enumerate(self.paths):
+            if not self._is_running:
+                break
+            
+            if os.path.isfile(path):
+                media_file = self._scan_file(path)
+                if media_file:
+                    all_files.append(media_file)
+                    self.database.add_media_file(media_file)
+                    self.scanned_count += 1
+                    
+                    # Update progress
+                    if self.scanned_count % 5 == 0:
+                        progress_percent = int((self.scanned_count / max(self.total_files, 1)) * 100)
+                        self._report(progress_percent, self.total_files,
+                                     f"Scanned {self.scanned_count}/{self.total_files} files...")
+            else:
+                self._scan_directory(path, all_files)
+        
+        if self._is_running and self.hash_duplicates:
+            self._hash_duplicates()
+        
+        return all_files
+    
+    def refresh(self) -> Dict[str, int]:
+        """Periksa ulang file yang sudah ter-index di bawah paths (semua file
+        jika paths kosong): file yang berubah di-scan ulang, file yang hilang
+        dihapus dari index
+        
+        File yang folder induknya juga hilang (mis. drive belum di-mount)
+        hanya dihitung sebagai unavailable, tidak dihapus.
+        """
+        roots = [os.path.abspath(path) for path in self.paths]
+        indexed = [f for f in self.database.get_all_files()
+                   if not roots or any(is_under(f.path, root) for root in roots)]
+        counts = {"checked": 0, "updated": 0, "removed": 0, "unavailable": 0}
+        self.total_files = max(len(indexed), 1)
+        
+        for media_file in indexed:
+            if not self._is_running:
+                break
+            counts["checked"] += 1
+            
+            try:
+                stat = os.stat(media_file.path)
+            except OSError:
+                stat = None
+                if os.path.isdir(os.path.dirname(media_file.path)):
+                    self.database.delete_file(media_file.path)
+                    counts["removed"] += 1
+                else:
+                    counts["unavailable"] += 1
+            
+            if stat is not None and (stat.st_size != media_file.size
+                                     or stat.st_mtime != media_file.last_modified):
+                fresh = self._scan_file(media_file.path)
+                if fresh:
+                    self.database.add_media_file(fresh)
+                    counts["updated"] += 1
+            
+            if counts["checked"] % 50 == 0:
+                self._report(int(counts["checked"] / self.total_files * 100), self.total_files,
+                             f"Checked {counts['checked']}/{len(indexed)} files...")
+        
+        if self._is_running and self.hash_duplicates and counts["updated"]:
+            self._hash_duplicates()
+        
+        return counts
+    
+    def _report(self, percent: int, total: int, message: str):
+        if self.progress_callback is not None:
+            self.progress_callback(percent, total, message)
+    
+    def _hash_duplicates(self):
+        """Tahap akhir scan: hash kandidat duplikat di seluruh index"""
+        def on_progress(done: int, total: int):
+            self._report(int(done / max(total, 1) * 100), total,
+                         f"Hashing duplicate candidates {done}/{total}...")
+        
+        try:
+            update_duplicate_hashes(self.database, on_progress, lambda: self._is_running)
+        except Exception as e:
+            print(f"Error hashing duplicates: {e}")
+    
+    def _count_total_files(self) -> int:
+        """Count total files untuk progress estimation"""
+        count = 0
+        audio_exts = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
+        video_exts = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v', '.webm'}
+        supported_exts = audio_exts | video_exts
+        
+        for path in self.paths:
+            if os.path.isfile(path):
+                if Path(path).suffix.lower() in supported_exts:
+                    count += 1
+            else:
+                try:
+                    for root, dirs, files in os.walk(path):
+                        for file in files:
+                            if Path(file).suffix.lower() in supported_exts:
+                                count += 1
+                except:
+                    pass
+        
+        return max(count, 1)  # Minimal 1 untuk menghindari division by zero
+    
+    def _scan_directory(self, directory: str, all_files: list):
+        """Scan semua files di directory"""
+        try:
+            audio_exts = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
+            video_exts = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v', '.webm'}
+            supported_exts = audio_exts | video_exts
+            
+            for root, dirs, files in os.walk(directory):
+                if not self._is_running:
+                    break
+                
+                for file in files:
+                    if not self._is_running:
+                        break
+                    
+                    file_path = os.path.join(root, file)
+                    ext = Path(file_path).suffix.lower()
+                    
+                    # Hanya proses file dengan extension yang didukung
+                    if ext in supported_exts:
+                        media_file = self._scan_file(file_path)
+                        if media_file:
+                            all_files.append(media_file)
+                            self.database.add_media_file(media_file)
+                            self.scanned_count += 1
+                            
+                            # Update progress setiap 5 files
+                            if self.scanned_count % 5 == 0:
+                                progress_percent = int((self.scanned_count / max(self.total_files, 1)) * 100)
+                                self._report(progress_percent, self.total_files,
+                                             f"Scanned {self.scanned_count}/{self.total_files} files...")
+        
+        except Exception as e:
+            print(f"Error scanning directory {directory}: {e}")
+    
+    def _scan_file(self, file_path: str) -> Optional[MediaFile]:
+        """Scan single file dan extract metadata"""
+        try:
+            # Check extension
+            ext = Path(file_path).suffix.lower()
+            audio_exts = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
+            video_exts = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.m4v', '.webm'}
+            
+            if ext not in audio_exts | video_exts:
+                return None
+            
+            is_video = ext in video_exts
+            
+            # Get file stats
+            try:
+                stat = os.stat(file_path)
+                file_size = stat.st_size
+                last_modified = stat.st_mtime
+            except:
+                file_size = 0
+                last_modified = 0
+            
+            # Get metadata dengan TinyTag
+            try:
+                tag = tinytag.TinyTag.get(file_path)
+                duration = tag.duration or 0.0
+                title = tag.title or Path(file_path).stem
+                artist = tag.artist or ""
+                album = tag.album or ""
+                genre = tag.genre or ""
+                bitrate = tag.bitrate or 0
+                sample_rate = tag.samplerate or 0
+                channels = getattr(tag, 'channels', 0)
+            except Exception:
+                # Tag tidak terbaca: pakai nama file dan nilai default
+                duration = 0.0
+                title = Path(file_path).stem
+                artist = ""
+                album = ""
+                genre = ""
+                bitrate = 0
+                sample_rate = 0
+                channels = 0
+            
+            return MediaFile(
+                path=file_path,
+                filename=Path(file_path).name,
+                extension=ext[1:],  # Remove dot
+                is_video=is_video,
+                duration=float(duration),
+                size=file_size,
+                last_modified=last_modified,
+                title=title,
+                artist=artist,
+                album=album,
+                genre=genre,
+                bitrate=bitrate,
+                sample_rate=sample_rate,
+                channels=channels
+            )
+            
+        except Exception:
+            # File tidak bisa dibaca: lewati
+            return None
+    
+    def stop(self):
+        """Stop scanning"""
+        self._is_running = False
+
+
+# ============================================================================
+# CONTENT HASH & DUPLICATE DETECTION
+# ============================================================================
+
+# Partial hash: blok awal dan akhir file (plus size) untuk menyaring kandidat
+PARTIAL_HASH_BYTES = 64 * 1024
+HASH_WORKERS = 4
+
+
+def file_content_hash(path: str, cancel_token: Optional[CancelToken] = None) -> Optional[str]:
+    """Hash isi file (blake2b 128-bit), None jika dibatalkan"""
+    digest = hashlib.blake2b(digest_size=16)
+    buffer = bytearray(1024 * 1024)
+    view = memoryview(buffer)
+    with open(path, 'rb') as f:
+        while True:
+            if cancel_token is not None and cancel_token.is_cancelled():
+                return None
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def partial_content_hash(path: str) -> str:
+    """Hash dari size + PARTIAL_HASH_BYTES awal + PARTIAL_HASH_BYTES akhir"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(size.to_bytes(8, "little"))
+        digest.update(f.read(PARTIAL_HASH_BYTES))
+        if size > 2 * PARTIAL_HASH_BYTES:
+            f.seek(-PARTIAL_HASH_BYTES, os.SEEK_END)
+            digest.update(f.read(PARTIAL_HASH_BYTES))
+        elif size > PARTIAL_HASH_BYTES:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def update_duplicate_hashes(database: AudioDatabase,
+                            progress_callback: Optional[Callable[[int, int], None]] = None,
+                            is_running: Optional[Callable[[], bool]] = None) -> int:
+    """Hitung hash bertahap untuk deteksi duplikat, return jumlah file yang di-hash
+    
+    Tahap 1: hanya file dengan size yang sama dengan file lain yang jadi kandidat.
+    Tahap 2: partial hash (awal/akhir file) untuk kandidat yang belum punya.
+    Tahap 3: full hash hanya untuk file yang size + partial hash-nya bentrok.
+    Hash di database dihapus saat size/mtime berubah, jadi scan berikutnya
+    hanya meng-hash file baru atau yang berubah.
+    """
+    candidates = database.get_hash_candidates()
+    need_partial = [path for path, _size, partial, _full in candidates if not partial]
+    
+    groups: Dict[Tuple[int, str], List[Tuple[str, Optional[str]]]] = {}
+    for path, size, partial, full in candidates:
+        if partial:
+            groups.setdefault((size, partial), []).append((path, full))
+    sizes = {path: size for path, size, _partial, _full in candidates}
+    
+    def hash_all(paths: List[str], hash_func, done_offset: int, total: int) -> List[Tuple[str, str]]:
+        results = []
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="hash") as executor:
+            def safe_hash(path):
+                if is_running is not None and not is_running():
+                    return None
+                try:
+                    return hash_func(path)
+                except OSError:
+                    # File sudah dipindah/dihapus sejak di-index
+                    return None
+            for i, (path, value) in enumerate(zip(paths, executor.map(safe_hash, paths))):
+                if value:
+                    results.append((path, value))
+                if progress_callback is not None and (i + 1) % 20 == 0:
+                    progress_callback(done_offset + i + 1, total)
+        return results
+    
+    hashed = 0
+    if need_partial:
+        partial_hashes = hash_all(need_partial, partial_content_hash, 0, len(need_partial))
+        database.set_partial_hashes(partial_hashes)
+        hashed += len(partial_hashes)
+        for path, partial in partial_hashes:
+            groups.setdefault((sizes[path], partial), []).append((path, None))
+    
+    if is_running is not None and not is_running():
+        return hashed
+    
+    need_full = [path for members in groups.values() if len(members) > 1
+                 for path, full in members if not full]
+    if need_full:
+        full_hashes = hash_all(need_full, file_content_hash, len(need_partial),
+                               len(need_partial) + len(need_full))
+        database.set_content_hashes(full_hashes)
+        hashed += len(full_hashes)
+    
+    print(f"✓ Duplicate hashing: {len(candidates)} candidate(s), "
+          f"{len(need_partial)} partial, {len(need_full)} full hash(es)")
+    return hashed
+
+
+# ============================================================================
+# FILE EXPORT
+# ============================================================================
+
+# Mode export: copy (reflink/copy_file_range jika didukung), hard link, symbolic link
+EXPORT_MODES = {
+    "copy": "Copy",
+    "hardlink": "Hard link",
+    "symlink": "Symbolic link",
+}
+EXPORT_CHUNK_BYTES = 16 * 1024 * 1024
+# ioctl FICLONE (Linux btrfs/xfs): clone seluruh file tanpa menyalin data
+FICLONE = 0x40049409
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        import fcntl
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+def fast_copy_file(src: str, dst: str,
+                   progress_callback: Optional[Callable[[int], None]] = None,
+                   cancel_token: Optional[CancelToken] = None) -> Optional[str]:
+    """Copy isi file src ke dst, pakai cara tercepat yang didukung filesystem
+    
+    Urutan: reflink (FICLONE), os.copy_file_range (di kernel, tanpa lewat
+    user space), lalu read/write per chunk. Return nama metode, None jika dibatalkan.
+    progress_callback dipanggil dengan jumlah byte yang sudah dicopy.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        
+        if size and _try_reflink(src_fd, dst_fd):
+            if progress_callback is not None:
+                progress_callback(size)
+            return "reflink"
+        
+        copied = 0
+        method = "copy"
+        if hasattr(os, "copy_file_range"):
+            try:
+                while True:
+                    if cancel_token is not None and cancel_token.is_cancelled():
+                        return None
+                    n = os.copy_file_range(src_fd, dst_fd, EXPORT_CHUNK_BYTES)
+                    if n == 0:
+                        break
+                    copied += n
+                    method = "copy_file_range"
+                    if progress_callback is not None:
+                        progress_callback(copied)
+                if copied == size:
+                    return method
+            except OSError:
+                # Filesystem/kernel tidak mendukung; lanjut dari offset sekarang
+                pass
+        
+        buffer = bytearray(min(EXPORT_CHUNK_BYTES, max(size, 1)))
+        view = memoryview(buffer)
+        while True:
+            if cancel_token is not None and cancel_token.is_cancelled():
+                return None
+            n = fsrc.readinto(buffer)
+            if not n:
+                break
+            fdst.write(view[:n])
+            copied += n
+            if progress_callback is not None:
+                progress_callback(copied)
+        return "copy"
+
+
+def unique_output_path(folder: str, stem: str, ext: str, reserved: set) -> str:
+    """Nama file unik di folder tujuan; reserved berisi nama yang sudah dipakai batch ini"""
+    suffix = f".{ext}" if ext else ""
+    name = f"{stem}{suffix}"
+    counter = 1
+    while name.lower() in reserved:
+        name = f"{stem} ({counter}){suffix}"
+        counter += 1
+    reserved.add(name.lower())
+    return os.path.join(folder, name)
+
+
+def transfer_file(source_path: str, output_path: str, mode: str = "copy",
+                  progress_callback: Optional[Callable[[int], None]] = None,
+                  cancel_token: Optional[CancelToken] = None,
+                  link_error_callback: Optional[Callable[[OSError], None]] = None) -> Optional[str]:
+    """Copy/link source_path ke output_path lewat file .part lalu rename
+    
+    Mode hardlink/symlink fallback ke copy jika link gagal; link_error_callback
+    dipanggil dengan error-nya. Return metode yang dipakai, None jika dibatalkan.
+    """
+    tmp_path = os.path.join(os.path.dirname(output_path),
+                            f".{Path(output_path).name}.{os.getpid()}.part")
+    if mode in ("hardlink", "symlink"):
+        try:
+            if mode == "hardlink":
+                os.link(source_path, tmp_path)
+            else:
+                os.symlink(os.path.abspath(source_path), tmp_path)
+            os.replace(tmp_path, output_path)
+            return mode
+        except OSError as e:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            # Hard link beda volume (EXDEV), symlink di Windows butuh Developer Mode/admin
+            if link_error_callback is not None:
+                link_error_callback(e)
+    
+    try:
+        method = fast_copy_file(source_path, tmp_path, progress_callback, cancel_token)
+        if method is None:
+            return None
+        shutil.copystat(source_path, tmp_path)
+        os.replace(tmp_path, output_path)
+        return method
+    finally:
+        # .part tertinggal jika dibatalkan atau gagal
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
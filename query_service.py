@@ -0,0 +1,528 @@
+"""Service HTTP/JSON lokal untuk query index dari tool lain (plugin NLE, script)
+
+Satu proses asyncio (stdlib saja, tanpa Qt) melayani banyak client sekaligus
+lewat TCP localhost atau Unix socket, jadi setiap tool tidak perlu membuka
+file SQLite sendiri. Query berjalan di pool koneksi read-only; scan memakai
+AudioDatabase biasa di thread terpisah. Dijalankan lewat `python cli.py serve`.
+
+Endpoint (GET kecuali disebut lain):
+    /search?q=...&limit=100&offset=0   hasil search_files (syntax sama dengan search box)
+    /files?after=PATH&limit=N          seluruh index berurutan path (keyset pagination)
+    /file?path=PATH                    satu file
+    /duplicates                        file dengan isi identik
+    /stats                             ringkasan index
+    /scan                              status scan; POST {"paths": [...], "refresh": false}
+    /metrics                           histogram latency request per endpoint
+
+Response list di-stream sebagai JSONL (chunked): satu record "file" per baris,
+diakhiri record "page" dengan next_offset/next_after untuk halaman berikutnya.
+"""
+import os
+import json
+import time
+import signal
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from urllib.parse import urlsplit, parse_qsl
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable
+
+from media_index import AudioDatabase, MediaFile, MediaScanner
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_READERS = 4
+# Record per chunk saat streaming; writer.drain() di antara chunk memberi backpressure
+STREAM_CHUNK_RECORDS = 200
+SEARCH_MAX_LIMIT = 5000
+MAX_REQUEST_BODY = 1024 * 1024
+MAX_REQUEST_HEADERS = 100
+KEEP_ALIVE_TIMEOUT = 30.0
+# Reader menunggu selama ini jika database sedang dikunci (checkpoint/recovery) sebelum error
+READER_BUSY_TIMEOUT = 5.0
+# Batas atas bucket histogram latency (ms); sisanya masuk "+inf"
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+HTTP_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(Exception):
+    """Error yang dikembalikan ke client sebagai response JSON dengan status HTTP"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class StreamAborted(Exception):
+    """Error setelah header 200 terkirim; koneksi ditutup tanpa chunk penutup
+    supaya client tahu response-nya terpotong"""
+
+
+@dataclass
+class Request:
+    """Satu request HTTP yang sudah di-parse"""
+    method: str
+    path: str
+    params: Dict[str, str]
+    body: bytes
+    keep_alive: bool
+    
+    def int_param(self, name: str, default: Optional[int], minimum: int = 0,
+                  maximum: Optional[int] = None) -> Optional[int]:
+        value = self.params.get(name)
+        if value is None or value == "":
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise RequestError(400, f"{name} must be an integer")
+        if number < minimum or (maximum is not None and number > maximum):
+            raise RequestError(400, f"{name} out of range")
+        return number
+    
+    def json_body(self) -> Dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise RequestError(400, "invalid JSON body")
+        if not isinstance(data, dict):
+            raise RequestError(400, "JSON body must be an object")
+        return data
+
+
+# ============================================================================
+# READER POOL & METRICS
+# ============================================================================
+
+class ReaderPool:
+    """Pool koneksi SQLite read-only; query dijalankan di thread pool
+    supaya event loop tidak terblokir
+    
+    Koneksi dibuat sekali dan dipakai ulang, jadi tidak ada biaya open/parse
+    schema per request. Jumlah koneksi = jumlah query yang bisa berjalan
+    bersamaan; request lain menunggu di antrian.
+    """
+    
+    def __init__(self, db_path: str, size: int = SERVICE_READERS):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="query-reader")
+        self._connections: List[sqlite3.Connection] = []
+        self._idle: Optional[asyncio.Queue] = None
+    
+    def open(self):
+        """Buka koneksi; dipanggil dari event loop yang akan memakai pool"""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=READER_BUSY_TIMEOUT)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON")
+            self._connections.append(conn)
+            self._idle.put_nowait(conn)
+    
+    def idle_count(self) -> int:
+        return self._idle.qsize() if self._idle is not None else 0
+    
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Jalankan func(connection, *args) di thread reader dengan koneksi dari pool"""
+        conn = await self._idle.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, conn, *args)
+        finally:
+            self._idle.put_nowait(conn)
+    
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for conn in self._connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._connections.clear()
+
+
+class LatencyHistogram:
+    """Histogram latency request dengan bucket tetap (LATENCY_BUCKETS_MS)"""
+    
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, seconds: float):
+        ms = seconds * 1000.0
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Batas atas bucket yang memuat percentile (estimasi), None jika kosong"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else round(self.max_ms, 3)
+        return round(self.max_ms, 3)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound}ms": n for bound, n in zip(LATENCY_BUCKETS_MS, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": buckets,
+        }
+
+
+class JsonLinesStream:
+    """Response HTTP chunked berisi satu record JSON per baris"""
+    
+    def __init__(self, writer: asyncio.StreamWriter, keep_alive: bool):
+        self.writer = writer
+        self.keep_alive = keep_alive
+    
+    async def start(self, status: int = 200):
+        self.writer.write((f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                           "Content-Type: application/x-ndjson; charset=utf-8\r\n"
+                           "Transfer-Encoding: chunked\r\n"
+                           f"Connection: {'keep-alive' if self.keep_alive else 'close'}\r\n"
+                           "\r\n").encode("latin-1"))
+    
+    async def write(self, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+        self.writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+        await self.writer.drain()
+    
+    async def finish(self):
+        self.writer.write(b"0\r\n\r\n")
+        await self.writer.drain()
+
+
+def file_record(media_file: MediaFile) -> Dict[str, Any]:
+    return {"type": "file", **asdict(media_file)}
+
+
+# ============================================================================
+# QUERY SERVICE
+# ============================================================================
+
+class QueryService:
+    """Service HTTP/JSON asyncio di atas AudioDatabase dan MediaScanner"""
+    
+    def __init__(self, database: AudioDatabase, readers: int = SERVICE_READERS):
+        self.database = database
+        self.pool = ReaderPool(database.db_path, readers)
+        self.metrics: Dict[str, LatencyHistogram] = {}
+        self.started_at = time.time()
+        self._scanner: Optional[MediaScanner] = None
+        self._scan_status: Dict[str, Any] = {"running": False}
+        self._scan_lock = threading.Lock()
+        self._routes = {
+            "/search": ("GET", self._search),
+            "/files": ("GET", self._files),
+            "/file": ("GET", self._file),
+            "/duplicates": ("GET", self._duplicates),
+            "/stats": ("GET", self._stats),
+            "/scan": ("GET POST", self._scan),
+            "/metrics": ("GET", self._metrics),
+        }
+    
+    async def serve(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+                    unix_socket: Optional[str] = None,
+                    ready_callback: Optional[Callable[[str], None]] = None):
+        """Listen sampai dibatalkan (Ctrl+C / task cancel)"""
+        self.pool.open()
+        if unix_socket:
+            server = await asyncio.start_unix_server(self._handle_client, unix_socket)
+            address = f"unix:{unix_socket}"
+        else:
+            server = await asyncio.start_server(self._handle_client, host, port)
+            bound = server.sockets[0].getsockname()
+            address = f"http://{bound[0]}:{bound[1]}"
+        try:
+            # SIGTERM (systemd, kill) berhenti sama seperti Ctrl+C; tidak ada di Windows,
+            # dan hanya bisa dari main thread (service di thread lain dihentikan lewat cancel)
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, AttributeError, RuntimeError):
+            pass
+        print(f"✓ Query service listening on {address} ({self.pool.size} reader(s))")
+        if ready_callback is not None:
+            ready_callback(address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self._scanner is not None:
+                self._scanner.stop()
+            self.pool.close()
+            if unix_socket:
+                try:
+                    os.remove(unix_socket)
+                except OSError:
+                    pass
+    
+    # ------------------------------------------------------------------ HTTP
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except RequestError as e:
+                    await self._send_json(writer, e.status, {"type": "error", "message": str(e)}, False)
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                
+                start = time.perf_counter()
+                route = request.path if request.path in self._routes else "other"
+                try:
+                    await self._dispatch(request, writer)
+                except StreamAborted:
+                    break
+                finally:
+                    self.metrics.setdefault(route, LatencyHistogram()).observe(time.perf_counter() - start)
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            # Client putus, atau service berhenti saat koneksi keep-alive masih terbuka
+            pass
+        except Exception as e:
+            print(f"✗ Query service connection error: {e}")
+        finally:
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        except ValueError:
+            raise RequestError(400, "malformed request line")
+        
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_REQUEST_HEADERS:
+                raise RequestError(400, "too many headers")
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise RequestError(400, "invalid Content-Length")
+        if length > MAX_REQUEST_BODY:
+            raise RequestError(413, "request body too large")
+        body = await reader.readexactly(length) if length > 0 else b""
+        
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        url = urlsplit(target)
+        return Request(method.upper(), url.path.rstrip("/") or "/", dict(parse_qsl(url.query)),
+                       body, keep_alive)
+    
+    async def _dispatch(self, request: Request, writer: asyncio.StreamWriter):
+        try:
+            route = self._routes.get(request.path)
+            if route is None:
+                raise RequestError(404, f"unknown endpoint {request.path}")
+            methods, handler = route
+            if request.method not in methods.split():
+                raise RequestError(405, f"{request.method} not allowed on {request.path}")
+            await handler(request, writer)
+        except RequestError as e:
+            await self._send_json(writer, e.status, {"type": "error", "message": str(e)}, request.keep_alive)
+        except (ConnectionError, StreamAborted):
+            raise
+        except sqlite3.Error as e:
+            # Jangan jadi "hasil kosong": client harus tahu query gagal (503 = coba lagi)
+            print(f"✗ Query service database error on {request.path}: {e}")
+            busy = isinstance(e, sqlite3.OperationalError) and ("locked" in str(e) or "busy" in str(e))
+            await self._send_json(writer, 503 if busy else 500,
+                                  {"type": "error", "message": f"database error: {e}"}, request.keep_alive)
+        except Exception as e:
+            print(f"✗ Query service error on {request.path}: {e}")
+            await self._send_json(writer, 500, {"type": "error", "message": str(e)}, request.keep_alive)
+    
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, record: Dict[str, Any],
+                         keep_alive: bool):
+        body = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        writer.write((f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                      "Content-Type: application/json; charset=utf-8\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                      "\r\n").encode("latin-1") + body)
+        await writer.drain()
+    
+    async def _stream_files(self, request: Request, writer: asyncio.StreamWriter,
+                            files: List[MediaFile], page: Dict[str, Any]):
+        stream = JsonLinesStream(writer, request.keep_alive)
+        await stream.start()
+        for i in range(0, len(files), STREAM_CHUNK_RECORDS):
+            await stream.write([file_record(f) for f in files[i:i + STREAM_CHUNK_RECORDS]])
+        await stream.write([{"type": "page", "count": len(files), **page}])
+        await stream.finish()
+    
+    # ------------------------------------------------------------------ endpoints
+    
+    async def _search(self, request: Request, writer: asyncio.StreamWriter):
+        query = request.params.get("q", "")
+        limit = request.int_param("limit", 100, 1, SEARCH_MAX_LIMIT)
+        offset = request.int_param("offset", 0, 0, SEARCH_MAX_LIMIT)
+        # Urutan fuzzy bergantung pada seluruh hasil, jadi ambil sampai offset+limit
+        # (+1 untuk tahu apakah masih ada halaman berikutnya) lalu potong
+        files = await self.pool.run(
+            lambda conn: self.database.search_files(query, limit=offset + limit + 1,
+                                                  connection=conn, raise_errors=True))
+        more = len(files) > offset + limit
+        await self._stream_files(request, writer, files[offset:offset + limit], {
+            "query": query, "offset": offset, "next_offset": offset + limit if more else None})
+    
+    async def _files(self, request: Request, writer: asyncio.StreamWriter):
+        after = request.params.get("after", "")
+        limit = request.int_param("limit", None, 1)
+        stream = None
+        
+        # Satu halaman kecil per query; koneksi kembali ke pool di antara halaman
+        # supaya client lain tidak menunggu selama streaming seluruh index
+        count, last_path = 0, after
+        while limit is None or count < limit:
+            size = STREAM_CHUNK_RECORDS if limit is None else min(STREAM_CHUNK_RECORDS, limit - count)
+            try:
+                files = await self.pool.run(
+                    lambda conn: self.database.get_files_after(last_path, size, connection=conn,
+                                                               raise_errors=True))
+            except sqlite3.Error as e:
+                if stream is None:
+                    raise
+                print(f"✗ Query service database error on {request.path}: {e}")
+                await stream.write([{"type": "error", "message": f"database error: {e}"}])
+                raise StreamAborted(str(e))
+            if stream is None:
+                # Header dikirim setelah halaman pertama berhasil, jadi error awal tetap jadi 5xx
+                stream = JsonLinesStream(writer, request.keep_alive)
+                await stream.start()
+            if files:
+                await stream.write([file_record(f) for f in files])
+                count += len(files)
+                last_path = files[-1].path
+            if len(files) < size:
+                last_path = None
+                break
+        
+        await stream.write([{"type": "page", "count": count, "after": after, "next_after": last_path}])
+        await stream.finish()
+    
+    async def _file(self, request: Request, writer: asyncio.StreamWriter):
+        path = request.params.get("path")
+        if not path:
+            raise RequestError(400, "path is required")
+        files = await self.pool.run(lambda conn: self.database.get_files_by_paths([path], connection=conn, raise_errors=True))
+        if not files:
+            raise RequestError(404, "file not in index")
+        await self._send_json(writer, 200, file_record(files[0]), request.keep_alive)
+    
+    async def _duplicates(self, request: Request, writer: asyncio.StreamWriter):
+        files = await self.pool.run(lambda conn: self.database.get_duplicate_files(connection=conn, raise_errors=True))
+        await self._stream_files(request, writer, files, {})
+    
+    async def _stats(self, request: Request, writer: asyncio.StreamWriter):
+        stats = await self.pool.run(lambda conn: self.database.get_stats(connection=conn, raise_errors=True))
+        await self._send_json(writer, 200, {"type": "stats", **stats}, request.keep_alive)
+    
+    async def _scan(self, request: Request, writer: asyncio.StreamWriter):
+        if request.method == "POST":
+            data = request.json_body()
+            paths = data.get("paths") or []
+            if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+                raise RequestError(400, "paths must be a list of strings")
+            refresh = bool(data.get("refresh", False))
+            if not paths and not refresh:
+                raise RequestError(400, "paths is required unless refresh is true")
+            self._start_scan([os.path.abspath(p) for p in paths], refresh,
+                             bool(data.get("hash_duplicates", True)))
+            status = 202
+        else:
+            status = 200
+        with self._scan_lock:
+            record = {"type": "scan", **self._scan_status}
+        await self._send_json(writer, status, record, request.keep_alive)
+    
+    def _start_scan(self, paths: List[str], refresh: bool, hash_duplicates: bool):
+        """Jalankan scan/refresh di thread sendiri; satu scan pada satu waktu"""
+        with self._scan_lock:
+            if self._scan_status["running"]:
+                raise RequestError(409, "a scan is already running")
+            self._scan_status = {"running": True, "paths": paths, "refresh": refresh,
+                                 "percent": 0, "message": "Starting...", "started_at": time.time()}
+        
+        def on_progress(percent: int, total: int, message: str):
+            with self._scan_lock:
+                self._scan_status.update(percent=percent, total=total, message=message)
+        
+        scanner = MediaScanner(paths, self.database, on_progress, hash_duplicates=hash_duplicates)
+        self._scanner = scanner
+        
+        def run():
+            result: Dict[str, Any] = {}
+            try:
+                if refresh:
+                    result = scanner.refresh()
+                else:
+                    result = {"indexed": len(scanner.scan())}
+                result["message"] = "Done"
+            except Exception as e:
+                print(f"✗ Service scan error: {e}")
+                result = {"error": str(e), "message": "Failed"}
+            with self._scan_lock:
+                self._scan_status.update(running=False, finished_at=time.time(), **result)
+            self._scanner = None
+        
+        threading.Thread(target=run, name="service-scan", daemon=True).start()
+    
+    async def _metrics(self, request: Request, writer: asyncio.StreamWriter):
+        await self._send_json(writer, 200, {
+            "type": "metrics",
+            "uptime": round(time.time() - self.started_at, 1),
+            "readers": {"size": self.pool.size, "idle": self.pool.idle_count()},
+            "endpoints": {route: histogram.snapshot() for route, histogram in sorted(self.metrics.items())},
+        }, request.keep_alive)
@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+from media_index import AudioDatabase
+
+
+@pytest.fixture
+def database(tmp_path):
+    """AudioDatabase kosong di folder sementara"""
+    return AudioDatabase(str(tmp_path / "index.db"))
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """QCoreApplication untuk QTimer dan signal antar thread (tanpa display)"""
+    from PyQt5.QtCore import QCoreApplication
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def process_events(qt_app):
+    """process_events(predicate): jalankan event loop Qt sampai predicate() true"""
+    def run(predicate, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            assert time.monotonic() < deadline, "timeout"
+            qt_app.processEvents()
+            time.sleep(0.005)
+    return run
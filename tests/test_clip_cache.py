@@ -0,0 +1,63 @@
+import threading
+
+import numpy as np
+import pytest
+
+import main
+
+
+@pytest.fixture
+def wav_file(tmp_path):
+    samples = (0.25 * np.sin(np.linspace(0, 200, 4800))).astype('<f4').reshape(-1, 2)
+    raw = samples.tobytes()
+    header = bytearray(main.build_wav_header(48000, 2, 32, len(raw)))
+    header[20:22] = (3).to_bytes(2, "little")  # IEEE float
+    path = tmp_path / "float.wav"
+    path.write_bytes(bytes(header) + raw)
+    return str(path)
+
+
+def test_decode_float_wav_to_int16(wav_file):
+    clip = main.ClipCache().get_or_decode(wav_file)
+    assert (clip.sample_rate, clip.channels, clip.n_frames) == (48000, 2, 2400)
+    assert clip.duration == pytest.approx(0.05)
+
+
+def test_concurrent_decodes_of_same_file_run_once(wav_file, monkeypatch):
+    calls = []
+    release = threading.Event()
+    decode = main.DecodedClip.decode
+    
+    def slow_decode(path):
+        calls.append(path)
+        release.wait(5.0)
+        return decode(path)
+    
+    monkeypatch.setattr(main.DecodedClip, "decode", staticmethod(slow_decode))
+    cache = main.ClipCache()
+    results = []
+    # Prefetch dan player meminta clip yang sama bersamaan
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_decode(wav_file)))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5.0)
+    
+    assert calls == [wav_file]
+    assert len(results) == 3 and results[0] is not None
+    assert all(clip is results[0] for clip in results)
+
+
+def test_failed_decode_is_retried(wav_file, monkeypatch):
+    monkeypatch.setattr(main.DecodedClip, "decode", staticmethod(lambda path: None))
+    cache = main.ClipCache()
+    assert cache.get_or_decode(wav_file) is None
+    monkeypatch.undo()
+    assert cache.get_or_decode(wav_file) is not None
+    assert cache.get(wav_file) is not None
+
+
+def test_missing_file_is_none(tmp_path):
+    assert main.ClipCache().get_or_decode(str(tmp_path / "missing.wav")) is None
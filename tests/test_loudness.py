@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import main
+
+SAMPLE_RATE = main.LOUDNESS_SAMPLE_RATE
+# Sinus 997 Hz di satu channel: LUFS = 20*log10(amplitudo) - 3.01 (BS.1770)
+SINE_OFFSET_LU = -3.01
+
+
+def tone(seconds: float, amplitude: float = 0.5, channels: int = 1) -> np.ndarray:
+    t = np.arange(int(round(SAMPLE_RATE * seconds))) / SAMPLE_RATE
+    signal = (amplitude * np.sin(2 * np.pi * 997 * t)).astype(np.float32)
+    return np.repeat(signal[:, None], channels, axis=1)
+
+
+def measure(audio: np.ndarray, chunk: int = 4096) -> main.LoudnessResult:
+    meter = main.LoudnessMeter(SAMPLE_RATE, audio.shape[1])
+    for i in range(0, len(audio), chunk):
+        meter.feed(audio[i:i + chunk])
+    return meter.result()
+
+
+def expected_lufs(amplitude: float) -> float:
+    return 20 * np.log10(amplitude) + SINE_OFFSET_LU
+
+
+@pytest.mark.parametrize("seconds", [0.05, 0.3, 1.0, 2.55])
+def test_sine_level_independent_of_length(seconds):
+    # Termasuk file lebih pendek dari satu sub-block (100 ms) dan gating block (400 ms)
+    result = measure(tone(seconds))
+    assert result.lufs == pytest.approx(expected_lufs(0.5), abs=0.1)
+
+
+def test_short_click_is_not_silence():
+    click = np.full((100, 1), 0.5, dtype=np.float32)
+    result = measure(click)
+    assert result.lufs > -20.0
+    assert result.sample_peak_db == pytest.approx(-6.02, abs=0.01)
+
+
+def test_chunk_size_does_not_change_result():
+    audio = tone(1.37, 0.25)
+    assert measure(audio, 1000).lufs == pytest.approx(measure(audio, 48000).lufs, abs=1e-6)
+
+
+def test_stereo_sums_channel_power():
+    mono = measure(tone(1.0, 0.5, channels=1))
+    stereo = measure(tone(1.0, 0.5, channels=2))
+    assert stereo.lufs - mono.lufs == pytest.approx(3.01, abs=0.05)
+
+
+def test_peaks_and_rms():
+    result = measure(tone(1.0, 0.5))
+    assert result.sample_peak_db == pytest.approx(-6.02, abs=0.01)
+    assert result.true_peak_db >= result.sample_peak_db - 0.01
+    assert result.rms_db == pytest.approx(-9.03, abs=0.05)
+
+
+def test_silence_is_floor_and_empty_is_none():
+    assert measure(np.zeros((SAMPLE_RATE, 1), dtype=np.float32)).lufs == main.LOUDNESS_FLOOR_DB
+    assert main.LoudnessMeter(SAMPLE_RATE, 1).result() is None
+
+
+def test_quiet_tail_is_gated_out():
+    # Nada keras 1 detik lalu 2 detik sangat pelan: relative gate membuang bagian
+    # pelan (tanpa gating rata-ratanya sekitar -13.8 LUFS); hanya block di
+    # perbatasan yang ikut menurunkan hasil
+    audio = np.concatenate([tone(1.0, 0.5), tone(2.0, 0.0005)])
+    assert measure(audio).lufs == pytest.approx(expected_lufs(0.5), abs=1.0)
@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pytest
+
+import main
+
+
+def noise_peaks(num_buckets: int, amplitude: float = 0.8, seed: int = 0) -> main.WaveformPeaks:
+    rng = np.random.default_rng(seed)
+    samples = rng.uniform(-amplitude, amplitude, (num_buckets * 64, 1)).astype(np.float32)
+    accumulator = main.PeakAccumulator(len(samples), num_buckets)
+    accumulator.feed(samples)
+    return accumulator.finish()
+
+
+def assert_quantized_equal(actual: main.WaveformPeaks, expected: main.WaveformPeaks, scale: float):
+    # mins/maxs disimpan sebagai int8 (step scale/127), rms sebagai uint8 (step scale/255)
+    n = expected.filled
+    assert len(actual) == len(expected) and actual.filled == n
+    np.testing.assert_allclose(actual.mins[:n], expected.mins[:n], atol=scale / 254 + 1e-6)
+    np.testing.assert_allclose(actual.maxs[:n], expected.maxs[:n], atol=scale / 254 + 1e-6)
+    np.testing.assert_allclose(actual.rms[:n], expected.rms[:n], atol=scale / 510 + 1e-6)
+
+
+# ============================================================================
+# PEAK PYRAMID
+# ============================================================================
+
+def test_levels_halve_down_to_minimum():
+    pyramid = main.PeakPyramid.from_peaks(noise_peaks(1000))
+    assert [len(level) for level in pyramid.levels] == [1000, 500, 250, 125]
+    level = pyramid.levels[1]
+    base = pyramid.base
+    np.testing.assert_array_equal(level.mins, np.minimum(base.mins[0::2], base.mins[1::2]))
+    np.testing.assert_array_equal(level.maxs, np.maximum(base.maxs[0::2], base.maxs[1::2]))
+    # Level terakhir masih >= MIN_LEVEL_BUCKETS, tapi tidak bisa dibagi dua lagi
+    assert len(pyramid.levels[-1]) < 2 * main.PeakPyramid.MIN_LEVEL_BUCKETS
+
+
+def test_halving_preserves_energy():
+    pyramid = main.PeakPyramid.from_peaks(noise_peaks(512))
+    for level in pyramid.levels:
+        assert np.mean(np.square(level.rms)) == pytest.approx(np.mean(np.square(pyramid.base.rms)), rel=1e-4)
+
+
+@pytest.mark.parametrize("width, expected", [
+    (1, 125), (64, 125), (125, 125), (300, 500), (500, 500), (501, 1000), (5000, 1000),
+])
+def test_level_for_width(width, expected):
+    pyramid = main.PeakPyramid.from_peaks(noise_peaks(1000))
+    level = pyramid.level_for_width(width)
+    assert len(level) == expected
+    assert len(level) >= min(width, len(pyramid.base))
+
+
+def test_bytes_round_trip():
+    pyramid = main.PeakPyramid.from_peaks(noise_peaks(1000, amplitude=0.3))
+    restored = main.PeakPyramid.from_bytes(pyramid.to_bytes())
+    scale = pyramid.base.peak()
+    assert len(restored.levels) == len(pyramid.levels)
+    for actual, expected in zip(restored.levels, pyramid.levels):
+        assert_quantized_equal(actual, expected, scale)
+    assert restored.base.peak() == pytest.approx(scale, rel=1e-6)
+
+
+def test_bytes_round_trip_partial():
+    # Hasil parsial: hanya bucket yang sudah terisi yang disimpan
+    base = noise_peaks(256)
+    base.filled = 100
+    pyramid = main.PeakPyramid.from_peaks(base)
+    restored = main.PeakPyramid.from_bytes(pyramid.to_bytes())
+    assert [level.filled for level in restored.levels] == [level.filled for level in pyramid.levels]
+    scale = max(np.max(np.abs(base.mins[:100])), np.max(np.abs(base.maxs[:100])))
+    assert_quantized_equal(restored.base, base, scale)
+    assert np.all(restored.base.maxs[100:] == 0.0)
+
+
+def test_from_bytes_rejects_foreign_data():
+    data = main.PeakPyramid.from_peaks(noise_peaks(128)).to_bytes()
+    assert main.PeakPyramid.from_bytes(b"") is None
+    assert main.PeakPyramid.from_bytes(b"RIFF" + data[4:]) is None
+    assert main.PeakPyramid.from_bytes(data[:4] + b"\x63\x00" + data[6:]) is None
+
+
+# ============================================================================
+# PEAK CACHE
+# ============================================================================
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    path = tmp_path / "cache"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "take.wav"
+    path.write_bytes(b"RIFF" + bytes(1000))
+    return str(path)
+
+
+def test_cache_round_trip_through_disk(cache_dir, audio_file):
+    pyramid = main.PeakPyramid.from_peaks(noise_peaks(1000))
+    main.PeakCache(cache_dir).put(audio_file, pyramid)
+    
+    # Instance baru (aplikasi di-restart): memory kosong, dibaca dari disk
+    cache = main.PeakCache(cache_dir)
+    restored = cache.get(audio_file)
+    assert restored is not None
+    assert_quantized_equal(restored.base, pyramid.base, pyramid.base.peak())
+    assert cache.get(audio_file) is restored
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 0
+
+
+def test_changed_file_misses(tmp_path, cache_dir, audio_file):
+    cache = main.PeakCache(cache_dir)
+    cache.put(audio_file, main.PeakPyramid.from_peaks(noise_peaks(128)))
+    with open(audio_file, "ab") as f:
+        f.write(b"more")
+    assert cache.get(audio_file) is None
+    assert cache.get(str(tmp_path / "missing.wav")) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_eviction_keeps_newest(tmp_path, cache_dir):
+    pyramid = main.PeakPyramid.from_peaks(noise_peaks(1000))
+    entry_size = len(pyramid.to_bytes())
+    cache = main.PeakCache(cache_dir, max_bytes=entry_size * 2)
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"file{i}.wav"
+        path.write_bytes(bytes([i]) * 10)
+        cache.put(str(path), pyramid)
+        # mtime entry dipakai sebagai urutan LRU
+        os.utime(cache._entry_path(main.file_cache_key(str(path))), (i, i))
+        paths.append(str(path))
+    cache.put(paths[-1], pyramid)
+    
+    remaining = sorted(os.listdir(cache_dir))
+    assert len(remaining) == 2
+    assert f"{main.file_cache_key(paths[0])}.pk" not in remaining
+    assert f"{main.file_cache_key(paths[-1])}.pk" in remaining
@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+import main
+
+
+def ramp(frames: int, channels: int = 1) -> np.ndarray:
+    signal = np.linspace(-1.0, 1.0, frames, dtype=np.float32)
+    return np.repeat(signal[:, None], channels, axis=1)
+
+
+def accumulate(samples: np.ndarray, num_buckets: int, chunk: int, total_frames=None):
+    accumulator = main.PeakAccumulator(total_frames or len(samples), num_buckets)
+    for i in range(0, len(samples), chunk):
+        accumulator.feed(samples[i:i + chunk])
+    return accumulator
+
+
+def reference_peaks(samples: np.ndarray, num_buckets: int):
+    # Bucket b berisi frame [ceil(b*N/B), ceil((b+1)*N/B)), sama dengan PeakAccumulator
+    n = len(samples)
+    bounds = [-(-b * n // num_buckets) for b in range(num_buckets + 1)]
+    mins, maxs, rms = [], [], []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        block = samples[lo:hi].astype(np.float64)
+        mins.append(block.min())
+        maxs.append(block.max())
+        rms.append(np.sqrt(np.mean(np.square(block))))
+    return np.array(mins), np.array(maxs), np.array(rms)
+
+
+# ============================================================================
+# PEAK ACCUMULATOR
+# ============================================================================
+
+def test_buckets_match_reference():
+    rng = np.random.default_rng(1)
+    samples = rng.uniform(-1.0, 1.0, (10007, 2)).astype(np.float32)
+    peaks = accumulate(samples, 64, 4096).finish()
+    mins, maxs, rms = reference_peaks(samples, 64)
+    assert peaks.filled == 64
+    np.testing.assert_allclose(peaks.mins, mins, atol=1e-6)
+    np.testing.assert_allclose(peaks.maxs, maxs, atol=1e-6)
+    np.testing.assert_allclose(peaks.rms, rms, rtol=1e-4)
+
+
+@pytest.mark.parametrize("chunk", [1, 97, 1000, 10007])
+def test_chunk_boundaries_do_not_change_peaks(chunk):
+    # Chunk boundary tidak sejajar dengan bucket boundary
+    samples = ramp(10007, 2)
+    expected = accumulate(samples, 100, len(samples)).finish()
+    peaks = accumulate(samples, 100, chunk).finish()
+    np.testing.assert_allclose(peaks.mins, expected.mins, atol=1e-7)
+    np.testing.assert_allclose(peaks.maxs, expected.maxs, atol=1e-7)
+    np.testing.assert_allclose(peaks.rms, expected.rms, rtol=1e-5)
+
+
+def test_partial_progress_and_filled():
+    samples = ramp(1000)
+    accumulator = accumulate(samples[:500], 10, 128, total_frames=1000)
+    assert accumulator.progress == pytest.approx(0.5)
+    assert accumulator.peaks.filled == 5
+    accumulator.feed(samples[500:])
+    assert accumulator.progress == 1.0
+    assert accumulator.peaks.filled == 10
+
+
+def test_short_stream_is_trimmed_or_padded():
+    # Estimasi 1000 frame, tapi stream berhenti di 300 frame
+    samples = ramp(300)
+    trimmed = accumulate(samples, 10, 64, total_frames=1000).finish(trim=True)
+    assert len(trimmed) == 3 and trimmed.filled == 3
+    
+    padded = accumulate(samples, 10, 64, total_frames=1000).finish(trim=False)
+    assert len(padded) == 10 and padded.filled == 3
+    assert np.all(padded.mins[3:] == 0.0) and np.all(padded.maxs[3:] == 0.0)
+
+
+def test_more_buckets_than_frames():
+    peaks = accumulate(ramp(5), 100, 2).finish()
+    assert len(peaks) == 5
+    np.testing.assert_allclose(peaks.mins, peaks.maxs)
+
+
+def test_empty_stream_returns_none():
+    assert main.PeakAccumulator(1000, 10).finish() is None
+
+
+# ============================================================================
+# WAV DECODING
+# ============================================================================
+
+def encode(samples: np.ndarray, format_tag: int, bits: int) -> bytes:
+    if format_tag == 3:
+        return samples.astype('<f4' if bits == 32 else '<f8').tobytes()
+    # Skala integer sama dengan decoder: full scale = 2^(bits-1)
+    scale = float(1 << (bits - 1))
+    ints = np.clip(np.round(samples.astype(np.float64) * scale), -scale, scale - 1).astype(np.int64)
+    if bits == 8:
+        return (ints + 128).astype(np.uint8).tobytes()
+    if bits == 24:
+        return ints.astype('<i4').reshape(-1, 1).view(np.uint8)[:, :3].tobytes()
+    return ints.astype(f'<i{bits // 8}').tobytes()
+
+
+@pytest.mark.parametrize("format_tag, bits, tolerance", [
+    (1, 8, 1 / 256), (1, 16, 1 / 65536), (1, 24, 1e-7), (1, 32, 1e-7), (3, 32, 0), (3, 64, 1e-7),
+])
+def test_decode_pcm_formats(format_tag, bits, tolerance):
+    samples = (0.9 * np.sin(np.linspace(0, 20, 2000))).astype(np.float32).reshape(-1, 2)
+    raw = encode(samples, format_tag, bits)
+    info = main.WavInfo(format_tag, 2, 44100, bits, 0, len(raw))
+    decoded = main.AudioAnalyzer.decode_pcm(raw, info)
+    assert decoded.dtype == np.float32 and decoded.shape == (1000, 2)
+    np.testing.assert_allclose(decoded, samples, atol=tolerance)
+
+
+def test_decode_pcm_24bit_sign_extension():
+    raw = bytes([0x00, 0x00, 0x80, 0xFF, 0xFF, 0x7F, 0xFF, 0xFF, 0xFF])
+    info = main.WavInfo(1, 1, 48000, 24, 0, len(raw))
+    decoded = main.AudioAnalyzer.decode_pcm(raw, info)[:, 0]
+    np.testing.assert_allclose(decoded, [-1.0, 8388607 / 8388608, -1 / 8388608])
+
+
+def test_decode_pcm_drops_partial_frame_and_rejects_unknown_format():
+    info = main.WavInfo(1, 2, 44100, 16, 0, 10)
+    assert main.AudioAnalyzer.decode_pcm(bytes(10), info).shape == (2, 2)
+    assert main.AudioAnalyzer.decode_pcm(bytes(12), main.WavInfo(1, 1, 44100, 12, 0, 12)) is None
+    assert main.AudioAnalyzer.decode_pcm(bytes(8), main.WavInfo(2, 1, 44100, 16, 0, 8)) is None
+
+
+def test_read_wav_info_round_trip(tmp_path):
+    raw = encode(ramp(4410, 2), 1, 16)
+    path = tmp_path / "ramp.wav"
+    path.write_bytes(main.build_wav_header(44100, 2, 16, len(raw)) + raw)
+    info = main.AudioAnalyzer.read_wav_info(str(path))
+    assert (info.format_tag, info.channels, info.sample_rate, info.bits_per_sample) == (1, 2, 44100, 16)
+    assert info.data_offset == main.WAV_HEADER_SIZE
+    assert info.n_frames == 4410 and info.duration == pytest.approx(0.1)
+
+
+def test_read_wav_info_fixes_missing_data_size(tmp_path):
+    # Recorder yang terputus menulis data size 0 di header
+    raw = bytes(400)
+    path = tmp_path / "stream.wav"
+    path.write_bytes(main.build_wav_header(8000, 1, 16, 0) + raw)
+    assert main.AudioAnalyzer.read_wav_info(str(path)).data_size == 400
+
+
+def test_read_wav_info_rejects_non_wav(tmp_path):
+    path = tmp_path / "noise.wav"
+    path.write_bytes(b"ID3" + bytes(100))
+    assert main.AudioAnalyzer.read_wav_info(str(path)) is None
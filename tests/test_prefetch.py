@@ -0,0 +1,87 @@
+import pytest
+
+import main
+from media_index import MediaFile
+
+
+class FakeModel:
+    """Pengganti MediaTableModel: hanya get_file_at()"""
+    
+    def __init__(self, files):
+        self.files = files
+    
+    def get_file_at(self, row: int):
+        return self.files[row] if 0 <= row < len(self.files) else None
+
+
+class FakeExtractionCache:
+    """Extraction yang tidak pernah selesai sampai dibatalkan"""
+    
+    def __init__(self):
+        self.streams = {}
+    
+    def start_stream(self, path: str) -> main.StreamingExtraction:
+        return self.streams.setdefault(path, main.StreamingExtraction(path))
+
+
+@pytest.fixture
+def videos(tmp_path, monkeypatch):
+    extraction = FakeExtractionCache()
+    monkeypatch.setattr(main, "get_extraction_cache", lambda: extraction)
+    monkeypatch.setattr(main, "get_ffmpeg_exe", lambda: "ffmpeg")
+    files = []
+    for i in range(40):
+        path = tmp_path / f"clip{i:02d}.mp4"
+        path.write_bytes(b"\0" * 16)
+        files.append(MediaFile(str(path), path.name, "mp4", True, 30.0, 16, 1.0))
+    return FakeModel(files), extraction
+
+
+@pytest.fixture
+def prefetcher(qt_app):
+    prefetcher = main.NeighborPrefetcher(None, radius=2)
+    yield prefetcher
+    prefetcher.shutdown()
+    for stream in list(main.get_extraction_cache().streams.values()):
+        stream.cancel_token.cancel()
+
+
+def move_to(prefetcher, model, row, process_events):
+    prefetcher.set_current(model, row)
+    process_events(lambda: not prefetcher._timer.isActive())
+
+
+def watch_finished(prefetcher, paths):
+    """Path yang job-nya sudah emit finished (setelah slot NeighborPrefetcher jalan)"""
+    finished = []
+    for path in paths:
+        prefetcher._jobs[path].signals.finished.connect(lambda p, entry: finished.append(p))
+    return finished
+
+
+def test_distant_rows_cancel_their_extraction(videos, prefetcher, process_events):
+    model, extraction = videos
+    move_to(prefetcher, model, 10, process_events)
+    process_events(lambda: extraction.streams)
+    started = list(extraction.streams)
+    finished = watch_finished(prefetcher, started)
+    
+    # Job dibatalkan saat masih menunggu extraction; stream yang dimulainya ikut dibatalkan
+    move_to(prefetcher, model, 30, process_events)
+    process_events(lambda: len(finished) == len(started))
+    assert all(extraction.streams[path].cancel_token.is_cancelled() for path in started)
+    assert not any(path in prefetcher._entries for path in started)
+
+
+def test_row_that_becomes_active_keeps_its_extraction(videos, prefetcher, process_events):
+    model, extraction = videos
+    active = model.files[11].path
+    move_to(prefetcher, model, 10, process_events)
+    process_events(lambda: active in extraction.streams)
+    finished = watch_finished(prefetcher, [active])
+    
+    # Row 11 jadi row aktif: job prefetch-nya dibatalkan, tapi stream dipakai player
+    move_to(prefetcher, model, 11, process_events)
+    process_events(lambda: finished)
+    assert not extraction.streams[active].cancel_token.is_cancelled()
+    assert active not in prefetcher._entries and active not in prefetcher._jobs
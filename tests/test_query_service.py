@@ -0,0 +1,194 @@
+import gc
+import json
+import sqlite3
+import asyncio
+import threading
+import http.client
+
+import pytest
+
+import query_service
+from media_index import MediaFile, LoudnessResult
+from query_service import QueryService
+
+
+def add_files(database, count: int):
+    for i in range(count):
+        name = f"rain_{i:02d}.wav" if i % 2 else f"door_{i:02d}.wav"
+        path = f"/library/{name}"
+        database.add_media_file(MediaFile(path, name, "wav", False, 1.0 + i, 1000 + i, 1.0))
+        database.set_loudness([(path, LoudnessResult(-30.0 + i, -1.0, -1.0, -30.0 + i))])
+
+
+class ServiceClient:
+    """QueryService di event loop thread sendiri plus client HTTP sederhana"""
+    
+    def __init__(self, database, readers: int = 2):
+        self.service = QueryService(database, readers)
+        self.address = None
+        self._ready = threading.Event()
+        self._loop = None
+        self._task = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        assert self._ready.wait(5.0), "service did not start"
+        host, port = self.address[len("http://"):].rsplit(":", 1)
+        self.connection = http.client.HTTPConnection(host, int(port), timeout=10)
+    
+    def _run(self):
+        def ready(address):
+            self.address = address
+            self._ready.set()
+        
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.current_task()
+            await self.service.serve(port=0, ready_callback=ready)
+        
+        # asyncio.run juga membatalkan handler koneksi keep-alive yang masih terbuka
+        try:
+            asyncio.run(main())
+        except asyncio.CancelledError:
+            pass
+    
+    def request(self, method: str, target: str, body=None):
+        """Return (status, body JSON atau list record JSONL)"""
+        data = json.dumps(body).encode() if body is not None else None
+        self.connection.request(method, target, body=data)
+        response = self.connection.getresponse()
+        text = response.read().decode("utf-8")
+        if response.getheader("Content-Type", "").startswith("application/x-ndjson"):
+            return response.status, [json.loads(line) for line in text.splitlines()]
+        return response.status, json.loads(text)
+    
+    def close(self):
+        self.connection.close()
+        self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(5.0)
+
+
+@pytest.fixture
+def client(database):
+    add_files(database, 12)
+    client = ServiceClient(database)
+    yield client
+    client.close()
+
+
+def split_page(records):
+    assert records[-1]["type"] == "page"
+    return [r["path"] for r in records[:-1]], records[-1]
+
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+
+def test_search_pagination(client):
+    status, records = client.request("GET", "/search?q=&limit=5")
+    assert status == 200
+    first, page = split_page(records)
+    assert len(first) == 5 and page["next_offset"] == 5
+    
+    seen = list(first)
+    while page["next_offset"] is not None:
+        status, records = client.request("GET", f"/search?q=&limit=5&offset={page['next_offset']}")
+        paths, page = split_page(records)
+        seen += paths
+    assert len(seen) == 12 and len(set(seen)) == 12
+
+
+def test_search_with_range_filter(client):
+    status, records = client.request("GET", "/search?q=lufs:-20..0")
+    paths, page = split_page(records)
+    assert status == 200 and page["next_offset"] is None
+    assert len(paths) == 2
+
+
+def test_files_keyset_pagination(client, monkeypatch):
+    # Chunk kecil supaya satu response terdiri dari beberapa query ke reader pool
+    monkeypatch.setattr(query_service, "STREAM_CHUNK_RECORDS", 3)
+    status, records = client.request("GET", "/files?limit=7")
+    paths, page = split_page(records)
+    assert status == 200 and len(paths) == 7 and paths == sorted(paths)
+    assert page["next_after"] == paths[-1]
+    
+    status, records = client.request("GET", f"/files?after={page['next_after']}")
+    rest, page = split_page(records)
+    assert len(rest) == 5 and rest[0] > paths[-1]
+    assert page["next_after"] is None
+
+
+def test_file_and_stats(client):
+    status, record = client.request("GET", "/file?path=/library/rain_01.wav")
+    assert status == 200 and record["filename"] == "rain_01.wav"
+    status, stats = client.request("GET", "/stats")
+    assert status == 200 and stats["type"] == "stats"
+
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+@pytest.mark.parametrize("method, target, status", [
+    ("GET", "/nope", 404),
+    ("GET", "/file?path=/library/missing.wav", 404),
+    ("GET", "/file", 400),
+    ("GET", "/search?limit=abc", 400),
+    ("GET", "/search?limit=0", 400),
+    ("GET", "/files?limit=-1", 400),
+    ("DELETE", "/search", 405),
+    ("POST", "/stats", 405),
+])
+def test_request_errors(client, method, target, status):
+    actual, record = client.request(method, target)
+    assert actual == status
+    assert record["type"] == "error" and record["message"]
+
+
+def test_scan_body_errors(client):
+    assert client.request("POST", "/scan", {"paths": "not-a-list"})[0] == 400
+    assert client.request("POST", "/scan", {})[0] == 400
+    # Koneksi keep-alive tetap bisa dipakai setelah error
+    assert client.request("GET", "/scan")[0] == 200
+
+
+def test_database_error_is_5xx_not_empty_page(client, database):
+    with sqlite3.connect(database.db_path) as conn:
+        conn.execute("ALTER TABLE media_files RENAME TO media_files_old")
+    for target in ("/search?q=rain", "/files", "/file?path=/library/rain_01.wav", "/duplicates"):
+        status, record = client.request("GET", target)
+        assert status == 500, target
+        assert record["type"] == "error" and "database error" in record["message"]
+
+
+def test_locked_database_is_503(database, monkeypatch):
+    monkeypatch.setattr(query_service, "READER_BUSY_TIMEOUT", 0.1)
+    add_files(database, 3)
+    # Koneksi AudioDatabase yang sudah tidak dipakai baru tertutup setelah GC;
+    # exclusive lock butuh tidak ada koneksi lain ke file ini
+    gc.collect()
+    writer = sqlite3.connect(database.db_path)
+    client = None
+    try:
+        # Exclusive lock di mode WAL (diambil sebelum reader pool dibuka): reader ikut terblokir
+        writer.execute("PRAGMA locking_mode = EXCLUSIVE")
+        writer.execute("UPDATE media_files SET size = size + 1")
+        writer.commit()
+        client = ServiceClient(database)
+        status, record = client.request("GET", "/search?q=rain")
+        assert status == 503
+        assert "locked" in record["message"]
+    finally:
+        if client is not None:
+            client.close()
+        writer.close()
+
+
+def test_metrics_count_requests(client):
+    client.request("GET", "/stats")
+    client.request("GET", "/nope")
+    status, metrics = client.request("GET", "/metrics")
+    assert status == 200
+    assert metrics["endpoints"]["/stats"]["count"] == 1
+    assert metrics["endpoints"]["other"]["count"] == 1
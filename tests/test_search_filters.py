@@ -0,0 +1,73 @@
+import pytest
+
+from media_index import AudioDatabase, MediaFile, LoudnessResult, SilenceMarkers
+
+
+def add_file(database: AudioDatabase, name: str, lufs=None, peak=None, duration=None) -> str:
+    path = f"/library/{name}.wav"
+    database.add_media_file(MediaFile(path, f"{name}.wav", "wav", False, 5.0, 1000, 1.0))
+    if lufs is not None:
+        database.set_loudness([(path, LoudnessResult(lufs, peak, peak, lufs))])
+    if duration is not None:
+        database.set_silence_markers([(path, SilenceMarkers(0.0, 0.0, 0.0, duration))])
+    return path
+
+
+@pytest.fixture
+def library(database):
+    add_file(database, "rain_soft", lufs=-32.0, peak=-12.0, duration=30.0)
+    add_file(database, "rain_heavy", lufs=-18.0, peak=-1.5, duration=20.0)
+    add_file(database, "door_slam", lufs=-14.0, peak=-0.2, duration=0.8)
+    add_file(database, "rain_unanalyzed")
+    return database
+
+
+def names(files):
+    return sorted(f.filename[:-4] for f in files)
+
+
+# ============================================================================
+# PARSE RANGE FILTERS
+# ============================================================================
+
+@pytest.mark.parametrize("query, text, filters", [
+    ("rain", "rain", []),
+    ("rain lufs:-23..-16", "rain", [("loudness_lufs", -23.0, -16.0)]),
+    ("peak:..-1 door", "door", [("true_peak_db", None, -1.0)]),
+    ("rms:-30..", "", [("rms_db", -30.0, None)]),
+    ("DUR:0.5..3 LUFS:-16..-23", "", [("effective_duration", 0.5, 3.0), ("loudness_lufs", -23.0, -16.0)]),
+    ("big  lufs:-20..-10   hit", "big hit", [("loudness_lufs", -20.0, -10.0)]),
+])
+def test_parse_range_filters(query, text, filters):
+    assert AudioDatabase.parse_range_filters(query) == (text, filters)
+
+
+def test_unknown_keys_and_times_stay_in_text():
+    # "bpm:" bukan filter; "12:30" bukan range
+    assert AudioDatabase.parse_range_filters("bpm:120..130 take 12:30") == ("bpm:120..130 take 12:30", [])
+
+
+# ============================================================================
+# SEARCH WITH FILTERS
+# ============================================================================
+
+def test_range_filter_only(library):
+    assert names(library.search_files("lufs:-20..-10")) == ["door_slam", "rain_heavy"]
+    assert names(library.search_files("lufs:-20..")) == ["door_slam", "rain_heavy"]
+    assert names(library.search_files("lufs:..-20")) == ["rain_soft"]
+
+
+def test_unanalyzed_files_do_not_pass_filters(library):
+    assert "rain_unanalyzed" in names(library.search_files("rain"))
+    assert "rain_unanalyzed" not in names(library.search_files("rain lufs:-100..0"))
+
+
+def test_text_and_multiple_filters_combine(library):
+    assert names(library.search_files("rain peak:..-6")) == ["rain_soft"]
+    assert names(library.search_files("dur:..1 peak:-1..0")) == ["door_slam"]
+    assert library.search_files("door lufs:-40..-30") == []
+
+
+def test_limit_applies_after_filters(library):
+    assert len(library.search_files("lufs:-40..0", limit=2)) == 2
+    assert len(library.search_files("", limit=10)) == 4
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+import main
+
+FRAME = main.SILENCE_FRAME_SECONDS
+
+
+def energy(*segments) -> np.ndarray:
+    """Mean square per frame dari segmen (detik, level dB); None = digital silence"""
+    parts = []
+    for seconds, level_db in segments:
+        value = 0.0 if level_db is None else 10.0 ** (level_db / 10.0)
+        parts.append(np.full(int(round(seconds / FRAME)), value))
+    return np.concatenate(parts)
+
+
+def markers(frame_energy: np.ndarray) -> main.SilenceMarkers:
+    return main.compute_silence_markers(frame_energy, FRAME, len(frame_energy) * FRAME)
+
+
+# ============================================================================
+# COMPUTE SILENCE MARKERS
+# ============================================================================
+
+def test_head_and_tail_silence():
+    result = markers(energy((0.5, None), (2.0, -10.0), (1.5, None)))
+    assert result.head == pytest.approx(0.5)
+    assert result.tail == pytest.approx(1.5)
+    assert result.onset == pytest.approx(0.5)
+    assert result.effective_duration == pytest.approx(2.0)
+
+
+def test_threshold_is_relative_to_loudest_frame():
+    # -50 dB lolos floor -60 dB, tapi 48 dB di bawah frame terkeras (-0 dB) tetap sunyi
+    result = markers(energy((1.0, -50.0), (1.0, 0.0), (1.0, -50.0)))
+    assert (result.head, result.tail) == pytest.approx((1.0, 1.0))
+
+
+def test_absolute_floor_for_quiet_files():
+    # File pelan: threshold tidak turun di bawah SILENCE_FLOOR_DB
+    result = markers(energy((1.0, -65.0), (1.0, -40.0), (1.0, -65.0)))
+    assert (result.head, result.tail) == pytest.approx((1.0, 1.0))
+    result = markers(energy((1.0, -55.0), (1.0, -40.0)))
+    assert result.head == 0.0
+
+
+def test_onset_after_room_tone():
+    # Room tone langsung dari awal lalu hit 30 dB lebih keras: head 0, onset di hit
+    result = markers(energy((1.2, -40.0), (0.5, -10.0), (0.3, -40.0)))
+    assert result.head == 0.0
+    assert result.onset == pytest.approx(1.2)
+    assert result.tail == 0.0
+
+
+def test_fade_in_has_onset_at_end_of_silence():
+    # Naik 1 dB per frame: tidak ada lonjakan ONSET_RISE_DB dalam ONSET_HISTORY_FRAMES
+    fade = 10.0 ** (np.arange(-50.0, 0.0, 1.0) / 10.0)
+    result = markers(np.concatenate([energy((0.3, None)), fade, energy((1.0, 0.0))]))
+    assert result.onset == pytest.approx(result.head)
+    # Threshold -48 dB: frame -50, -49, -48 masih dianggap sunyi
+    assert result.head == pytest.approx(0.3 + 3 * FRAME)
+
+
+def test_tail_clamped_to_total_duration():
+    # Frame terakhir bisa lebih pendek dari FRAME (sisa sample)
+    frames = energy((0.2, None), (0.5, -10.0))
+    result = main.compute_silence_markers(frames, FRAME, 0.695)
+    assert result.tail == 0.0
+    assert result.effective_duration == pytest.approx(0.495)
+
+
+@pytest.mark.parametrize("frames", [np.zeros(0), np.zeros(300)])
+def test_all_silent_or_empty(frames):
+    result = main.compute_silence_markers(frames, FRAME, 3.0)
+    assert result == main.SilenceMarkers(head=3.0, tail=0.0, onset=0.0, effective_duration=0.0)
+
+
+# ============================================================================
+# DETECT SILENCE (WAV)
+# ============================================================================
+
+def test_detect_silence_from_wav(tmp_path):
+    rate = 8000
+    t = np.arange(rate) / rate
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+    samples = np.concatenate([np.zeros(rate // 4), tone, np.zeros(rate // 2)])
+    stereo = np.repeat(samples[:, None], 2, axis=1)
+    raw = np.round(stereo * 32767).astype('<i2').tobytes()
+    path = tmp_path / "hit.wav"
+    path.write_bytes(main.build_wav_header(rate, 2, 16, len(raw)) + raw)
+    
+    result = main.detect_silence(str(path))
+    assert result.head == pytest.approx(0.25, abs=FRAME)
+    assert result.tail == pytest.approx(0.5, abs=FRAME)
+    assert result.onset == pytest.approx(0.25, abs=FRAME)
+    assert result.effective_duration == pytest.approx(1.0, abs=2 * FRAME)
+
+
+def test_detect_silence_unreadable_file(tmp_path):
+    path = tmp_path / "broken.wav"
+    path.write_bytes(b"RIFF")
+    assert main.detect_silence(str(path)) is None
@@ -0,0 +1,145 @@
+import threading
+import time
+
+import pytest
+
+import main
+from main import TASK_INTERACTIVE, TASK_PREFETCH, TASK_INDEXING, TASK_ANALYSIS
+
+
+def wait_until(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timeout"
+        time.sleep(0.005)
+
+
+def class_stats(scheduler: main.TaskScheduler, priority: int) -> dict:
+    return scheduler.stats()["classes"][priority]
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = main.TaskScheduler(limits={"cpu": 1, "disk": 2}, reserve={})
+    yield scheduler
+    scheduler.shutdown()
+
+
+@pytest.fixture
+def blocker(scheduler):
+    """Task yang memegang satu-satunya slot cpu sampai di-set"""
+    release = threading.Event()
+    scheduler.submit(release.wait, TASK_INDEXING, "cpu", "blocker")
+    wait_until(lambda: class_stats(scheduler, TASK_INDEXING)["running"] == 1)
+    yield release
+    release.set()
+
+
+# ============================================================================
+# ORDERING
+# ============================================================================
+
+def test_priority_then_fifo(scheduler, blocker):
+    order = []
+    for priority, name in [(TASK_ANALYSIS, "a1"), (TASK_INDEXING, "x1"), (TASK_PREFETCH, "p1"),
+                           (TASK_INTERACTIVE, "i1"), (TASK_ANALYSIS, "a2"), (TASK_INTERACTIVE, "i2")]:
+        scheduler.submit(lambda name=name: order.append(name), priority, "cpu", name)
+    assert class_stats(scheduler, TASK_ANALYSIS)["queued"] == 2
+    blocker.set()
+    wait_until(lambda: len(order) == 6)
+    assert order == ["i1", "i2", "p1", "x1", "a1", "a2"]
+
+
+def test_other_resource_is_not_blocked(scheduler, blocker):
+    done = threading.Event()
+    scheduler.submit(done.set, TASK_ANALYSIS, "disk")
+    assert done.wait(5.0)
+
+
+def test_lower_priority_does_not_overtake_waiting_task(scheduler, blocker):
+    scheduler.submit(lambda: None, TASK_INTERACTIVE, "cpu")
+    assert not scheduler.has_capacity(TASK_ANALYSIS, "cpu")
+    assert scheduler.has_capacity(TASK_ANALYSIS, "disk")
+
+
+# ============================================================================
+# SLOT ACCOUNTING
+# ============================================================================
+
+def test_try_acquire_respects_limit_and_interactive_reserve():
+    scheduler = main.TaskScheduler(limits={"cpu": 3}, reserve={"cpu": 1})
+    try:
+        assert scheduler.try_acquire(TASK_ANALYSIS, "cpu")
+        assert scheduler.try_acquire(TASK_INDEXING, "cpu")
+        # Slot terakhir hanya untuk task interactive
+        assert not scheduler.try_acquire(TASK_ANALYSIS, "cpu")
+        assert scheduler.try_acquire(TASK_INTERACTIVE, "cpu")
+        assert not scheduler.try_acquire(TASK_INTERACTIVE, "cpu")
+        assert scheduler.stats()["resources"]["cpu"] == (3, 3)
+        assert class_stats(scheduler, TASK_ANALYSIS)["running"] == 1
+        
+        scheduler.release(TASK_ANALYSIS, "cpu", "failed")
+        scheduler.release(TASK_INDEXING, "cpu")
+        assert scheduler.stats()["resources"]["cpu"] == (1, 3)
+        assert class_stats(scheduler, TASK_ANALYSIS)["failed"] == 1
+        assert class_stats(scheduler, TASK_INDEXING)["done"] == 1
+        assert scheduler.try_acquire(TASK_ANALYSIS, "cpu")
+    finally:
+        scheduler.shutdown()
+
+
+def test_slots_released_after_tasks(scheduler):
+    for _ in range(5):
+        scheduler.submit(lambda: None, TASK_INDEXING, "disk")
+    wait_until(lambda: class_stats(scheduler, TASK_INDEXING)["done"] == 5)
+    assert scheduler.stats()["resources"]["disk"] == (0, 2)
+    assert class_stats(scheduler, TASK_INDEXING)["running"] == 0
+    assert scheduler.stats()["threads"] <= 3
+
+
+def test_failing_task_is_counted_and_worker_survives(scheduler):
+    def fail():
+        raise RuntimeError("boom")
+    
+    scheduler.submit(fail, TASK_PREFETCH)
+    done = threading.Event()
+    scheduler.submit(done.set, TASK_PREFETCH)
+    assert done.wait(5.0)
+    wait_until(lambda: class_stats(scheduler, TASK_PREFETCH)["done"] == 1)
+    assert class_stats(scheduler, TASK_PREFETCH)["failed"] == 1
+    assert scheduler.stats()["resources"]["cpu"] == (0, 1)
+
+
+def test_backlog_is_added_to_queued(scheduler):
+    scheduler.set_backlog(TASK_ANALYSIS, 42)
+    assert class_stats(scheduler, TASK_ANALYSIS)["queued"] == 42
+    scheduler.set_backlog(TASK_ANALYSIS, -1)
+    assert class_stats(scheduler, TASK_ANALYSIS)["queued"] == 0
+
+
+# ============================================================================
+# CANCELLATION
+# ============================================================================
+
+def test_cancelled_task_is_dropped(scheduler, blocker):
+    ran = []
+    token = scheduler.submit(lambda: ran.append("cancelled"), TASK_PREFETCH)
+    scheduler.submit(lambda: ran.append("kept"), TASK_PREFETCH)
+    token.cancel()
+    assert class_stats(scheduler, TASK_PREFETCH)["queued"] == 1
+    blocker.set()
+    wait_until(lambda: class_stats(scheduler, TASK_PREFETCH)["done"] == 1)
+    assert ran == ["kept"]
+    assert class_stats(scheduler, TASK_PREFETCH)["cancelled"] == 1
+
+
+def test_shutdown_cancels_queue(scheduler, blocker):
+    token = scheduler.submit(lambda: None, TASK_INDEXING)
+    blocker.set()
+    scheduler.shutdown()
+    assert scheduler.submit(lambda: None, TASK_INTERACTIVE).is_cancelled()
+    assert not scheduler.try_acquire(TASK_INTERACTIVE, "disk")
+    # Task di antrian dibuang, atau sudah sempat jalan sebelum shutdown
+    stats = class_stats(scheduler, TASK_INDEXING)
+    assert stats["done"] + stats["cancelled"] == 2
+    assert token.is_cancelled() or stats["done"] == 2